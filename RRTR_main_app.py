@@ -1,28 +1,63 @@
+import startup_timing  # Первым: отсчёт времени запуска
+import multiprocessing
+import os
 import random
 import sys
+import time
 from functools import partial
 
 import numpy as np
-from scipy.fft import fft, fftfreq
-import matplotlib.pyplot as plt
-from PyQt5.QtCore import Qt, QTimer, QSize, QPoint
+from PyQt5.QtCore import Qt, QTimer, QSize, QPoint, QRect, QRectF, QStandardPaths
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QWidget, QPushButton, QTabWidget, QComboBox,
                              QSlider, QLabel, QDoubleSpinBox, QProgressBar, QLineEdit, QTextEdit,
                              QHBoxLayout, QSizePolicy, QRadioButton, QButtonGroup)
-from PyQt5.QtGui import QPainter, QPen, QFont, QPixmap, QImage
-from matplotlib.animation import FuncAnimation
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from PyQt5.QtGui import QPainter, QPen, QFont, QPixmap, QImage, QImageReader, QPolygonF, QRegion
+
+import signal_engine
+import display_decimation
+from waveform_cache import WaveformCache, CARRIER, MODULATING
+from compute_worker import ComputeWorker
+from dataflow import DataflowGraph
+from emitter_registry import EmitterRegistry
+from frame_bank import FrameBank
+from frequency_sweep import FrequencySweep
+from scope_animation import ScopeAnimator
+from scope_widget import PhosphorScopeWidget, ScopeWidget, polygon_view
+from update_scheduler import UpdateScheduler
+from figure_tracker import FigureTracker
+
+# matplotlib, scipy (spectrum) и атлас импортируются при первом использовании: startup_timing.timer.load
+startup_timing.timer.mark('импорт модулей приложения')
 
 
 class CircularScale(QWidget):
+    # Карта рисуется один раз на размер виджета и DPR в кэш-пиксмап; на каждом кадре поверх него
+    # рисуются точки, затем, как и раньше, поверх точек - риски шкалы, линии пеленга и текст.
+    # Излучатели хранятся массивами; их точки копятся в прозрачном слое на каждую принадлежность,
+    # add_emitters дорисовывает в него только новые.
+    # С set_map фон рисуется из пирамиды тайлов (map_tiles.MapView): колесо - масштаб, перетаскивание - сдвиг
     def __init__(self, parent=None):
         super(CircularScale, self).__init__(parent)
         self.angle_dict: [dict, None] = None
         self.rl_color = Qt.red
         self.peleng_value = None
-        self.background_image = QPixmap("./img/map.jpg")  # Change to your image path
-        self.setMinimumSize(self.background_image.size())
+        self.map_path = "./img/map.jpg"  # Change to your image path
+        self.background_image = None  # Декодируется при первой отрисовке, если нет пирамиды тайлов
+        self.setMinimumSize(QImageReader(self.map_path).size())
+        self.map_view = None
+        self.drag_position = None
         self.distance_between = None
+        self.affiliation_colors = {False: Qt.red, True: Qt.blue}  # is_enemy -> цвет
+        self.emitter_angles = np.empty(0)
+        self.emitter_ranges = np.empty(0)
+        self.emitter_affiliations = np.empty(0, dtype=bool)
+        self.emitter_groups = {}  # is_enemy -> точки и пеленги для слоёв отрисовки
+        self.point_layers = {}  # is_enemy -> прозрачный пиксмап с точками
+        self.emitter_layers = None
+        self.emitter_layers_key = None
+        self.static_layer = None
+        self.static_layer_key = None
+        self.static_layer_renders = 0
 
         # Initialize QTimer for blinking points
         self.blink_timer = QTimer(self)
@@ -30,64 +65,260 @@ class CircularScale(QWidget):
         self.blink_state = True  # Initial state of blinking
         self.blink_timer.start(500)  # Adjust the interval as needed
 
+    def set_map(self, map_view):
+        self.map_view = map_view
+        self.static_layer = None
+        self.update()
+
     def toggle_points(self):
         # Toggle the state of blinking points
         self.blink_state = not self.blink_state
-        self.update()
+        self.update(self.points_region())  # Мигают только точки - перерисовываем их окрестность
 
     def set_angle(self, angle):
+        # {is_enemy: угол} - не больше двух излучателей; оставлено для совместимости
         self.angle_dict = angle
-        self.update()  # Call update to trigger repaint
+        angle = angle or {}
+        self.set_emitters(list(angle.values()), affiliations=list(angle.keys()))
+
+    def emitter_arrays(self, angles, ranges, affiliations):
+        # angles - градусы от востока против часовой стрелки, ranges - расстояние от центра в пикселях
+        angles = np.asarray(angles, dtype=float).ravel()
+        if ranges is None:
+            if angles.size and self.distance_between is None:
+                self.distance_between = random.randint(150, 300)
+            ranges = self.distance_between or 0
+        return (angles, np.broadcast_to(np.asarray(ranges, dtype=float), angles.shape),
+                np.broadcast_to(np.asarray(affiliations, dtype=bool), angles.shape))
+
+    def set_emitters(self, angles, ranges=None, affiliations=False):
+        dirty = self.points_region() | self.dial_region()
+        self.emitter_angles, self.emitter_ranges, self.emitter_affiliations = self.emitter_arrays(
+            angles, ranges, affiliations)
+        self.emitter_layers = None
+        self.update(dirty | self.points_region())
+
+    def add_emitters(self, angles, ranges=None, affiliations=False):
+        # К уже показанным: новые точки дорисовываются в кэш слоёв, прежние не пересчитываются
+        angles, ranges, affiliations = self.emitter_arrays(angles, ranges, affiliations)
+        cached = self.emitter_layers is not None and self.emitter_layers_key == self.layers_key()
+        self.emitter_angles = np.concatenate([self.emitter_angles, angles])
+        self.emitter_ranges = np.concatenate([self.emitter_ranges, ranges])
+        self.emitter_affiliations = np.concatenate([self.emitter_affiliations, affiliations])
+        if not cached:
+            self.emitter_layers = None
+            self.update(self.points_region() | self.dial_region())
+            return
+        x, y, radians = self.screen_points(angles, ranges)
+        for affiliation in (False, True):
+            mask = affiliations == affiliation
+            if mask.any():
+                group = self.merge_group(self.emitter_groups.get(affiliation), x[mask], y[mask], radians[mask])
+                self.emitter_groups[affiliation] = group
+                self.draw_points(affiliation, x[mask], y[mask])
+        self.emitter_layers = self.build_layers()
+        self.update(self.region_of(x, y) | self.dial_region())
+
+    def screen_points(self, angles, ranges):
+        # Полярные координаты -> экранные одним векторным проходом
+        center = self.rect().center()
+        radians = np.deg2rad(angles)
+        x = np.trunc(center.x() + ranges * np.cos(radians))
+        y = np.trunc(center.y() - ranges * np.sin(radians))
+        return x, y, radians
+
+    @staticmethod
+    def merge_group(group, x, y, bearing):
+        # Группа одной принадлежности: (число излучателей, x, y, пеленги). Шкала мала, поэтому
+        # при большом числе излучателей пеленги округляются до 0.5° без повторов
+        count = x.size
+        if group is not None:
+            count += group[0]
+            x, y, bearing = (np.concatenate(pair) for pair in zip(group[1:], (x, y, bearing)))
+        if count > 720:
+            bearing = np.deg2rad(np.unique(np.round(np.rad2deg(bearing) * 2) % 720) / 2)
+        return count, x, y, bearing
+
+    def draw_points(self, affiliation, x, y):
+        # Точки каждой принадлежности копятся в своём прозрачном слое: синие остаются поверх красных,
+        # как при отрисовке всех точек подряд, а добавление рисует только новые
+        layer = self.point_layers.get(affiliation)
+        if layer is None:
+            dpr = self.devicePixelRatioF()
+            layer = QPixmap(self.size() * dpr)
+            layer.setDevicePixelRatio(dpr)
+            layer.fill(Qt.transparent)
+            self.point_layers[affiliation] = layer
+        points = QPolygonF(x.size)
+        view = polygon_view(points, x.size)
+        view[:, 0] = x
+        view[:, 1] = y
+        painter = QPainter(layer)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(QPen(self.affiliation_colors.get(affiliation, Qt.gray), 8))
+        painter.drawPoints(points)
+        painter.end()
+
+    def build_layers(self):
+        # Слои точек и пары (центр, конец) линий пеленга для drawLines; QPolygonF заполняются через общую память
+        layers = []
+        for affiliation in (False, True):
+            group = self.emitter_groups.get(affiliation)
+            if group is None:
+                continue
+            bearing = group[3]
+            bearings = QPolygonF(2 * bearing.size)
+            view = polygon_view(bearings, 2 * bearing.size)
+            view[0::2] = 0
+            view[1::2, 0] = 25 * np.cos(bearing)
+            view[1::2, 1] = -25 * np.sin(bearing)
+            layers.append((self.affiliation_colors.get(affiliation, Qt.gray), self.point_layers[affiliation], bearings))
+        x = np.concatenate([group[1] for group in self.emitter_groups.values()] or [np.empty(0)])
+        y = np.concatenate([group[2] for group in self.emitter_groups.values()] or [np.empty(0)])
+        return layers, x, y
+
+    def layers_key(self):
+        return self.size(), self.devicePixelRatioF()
+
+    def screen_layers(self):
+        key = self.layers_key()
+        if self.emitter_layers is not None and self.emitter_layers_key == key:
+            return self.emitter_layers
+        x, y, radians = self.screen_points(self.emitter_angles, self.emitter_ranges)
+        self.emitter_groups = {}
+        self.point_layers = {}
+        for affiliation in (False, True):  # is_enemy; np.unique по bool заметно медленнее
+            mask = self.emitter_affiliations == affiliation
+            if mask.any():
+                self.emitter_groups[affiliation] = self.merge_group(None, x[mask], y[mask], radians[mask])
+                self.draw_points(affiliation, x[mask], y[mask])
+        self.emitter_layers = self.build_layers()
+        self.emitter_layers_key = key
+        return self.emitter_layers
+
+    @staticmethod
+    def region_of(x, y):
+        # Точка пером 8 со сглаживанием занимает около 12x12 пикселей
+        if x.size > 32:
+            return QRegion(int(x.min()) - 6, int(y.min()) - 6, int(x.max() - x.min()) + 12, int(y.max() - y.min()) + 12)
+        region = QRegion()
+        for px, py in zip(x, y):
+            region |= QRegion(int(px) - 6, int(py) - 6, 12, 12)
+        return region
+
+    def points_region(self):
+        center = self.rect().center()
+        _, x, y = self.screen_layers()
+        return QRegion(center.x() - 6, center.y() - 6, 12, 12) | self.region_of(x, y)
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
+    def dial_rect(self):
+        side = min(self.width() // 5, self.height() // 5)
+        return QRect(self.width() - side, self.height() - side, side, side)
+
+    def dial_region(self):
+        # Текст пеленга выходит за окно шкалы сверху, поэтому берём запас
+        margin = self.dial_rect().width() // 5
+        return QRegion(self.dial_rect().adjusted(-margin, -margin, margin, margin))
+
+    def apply_dial_transform(self, painter):
+        # То же, что setViewport(dial_rect) + setWindow(-50, -50, 100, 100), но работает и на пиксмапе с DPR
+        rect = self.dial_rect()
+        painter.translate(rect.x() + rect.width() / 2, rect.y() + rect.height() / 2)
+        painter.scale(rect.width() / 100, rect.height() / 100)
+
+    def render_static_layer(self):
+        dpr = self.devicePixelRatioF()
+        layer = QPixmap(self.size() * dpr)
+        layer.setDevicePixelRatio(dpr)
+        painter = QPainter(layer)
         painter.setRenderHint(QPainter.Antialiasing)
 
         # Draw the background image
-        painter.drawPixmap(self.rect(), self.background_image)
-
-        center = self.rect().center()
-        if self.blink_state:
-            painter.setPen(QPen(self.rl_color, 8))
-            painter.drawPoint(center)
-            if self.angle_dict:
-                for is_enemy, angle in self.angle_dict.items():
-                    if self.distance_between is None:
-                        self.distance_between = random.randint(150, 300)
-                    point = QPoint(
-                        int(center.x() + self.distance_between * np.cos(angle * np.pi / 180)),
-                        int(center.y() - self.distance_between * np.sin(angle * np.pi / 180))
-                    )
-                    color = Qt.blue if is_enemy else Qt.red
-                    painter.setPen(QPen(color, 8))
-                    painter.drawPoint(point)
-
+        if self.map_view is not None:
+            self.map_view.draw(painter, QRectF(self.rect()))
         else:
-            painter.setPen(Qt.transparent)  # Make the point transparent
+            if self.background_image is None:
+                self.background_image = QPixmap(self.map_path)
+            painter.drawPixmap(self.rect(), self.background_image)
+        painter.end()
 
-        # # Set viewport and window to encompass the background image and drawn items
-        side = min(self.width() // 5, self.height() // 5)
-        painter.setViewport((self.width() - side), (self.height() - side), side, side)
-        painter.setWindow(-50, -50, 100, 100)
+        self.static_layer_renders += 1
+        return layer
 
+    def draw_scale(self, painter):
         # Draw circular scale
-        scale = 360 / 23  # 360 degrees divided into 24 segments (15 degrees each)
-        step = 15
+        step = 15  # 360 degrees divided into 24 segments (15 degrees each)
+        painter.save()
         painter.setPen(QPen(Qt.black, 2))
-        font = QFont('Serif', 8)
-        painter.setFont(font)
         for i in range(0, 360, step):
             painter.drawLine(40, 0, 45, 0)
             painter.rotate(step)
+        painter.restore()
+
+    def resizeEvent(self, event):
+        self.static_layer = None
+        super(CircularScale, self).resizeEvent(event)
+
+    def map_changed(self):
+        self.static_layer = None
+        self.update()
+
+    def wheelEvent(self, event):
+        if self.map_view is None:
+            return super(CircularScale, self).wheelEvent(event)
+        self.map_view.zoom(1.25 ** (event.angleDelta().y() / 120))
+        self.map_changed()
+
+    def mousePressEvent(self, event):
+        if self.map_view is not None and event.button() == Qt.LeftButton:
+            self.drag_position = event.pos()
+        super(CircularScale, self).mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if self.map_view is not None and self.drag_position is not None:
+            delta = event.pos() - self.drag_position
+            self.drag_position = event.pos()
+            self.map_view.pan(delta.x(), delta.y())
+            self.map_changed()
+        super(CircularScale, self).mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        self.drag_position = None
+        super(CircularScale, self).mouseReleaseEvent(event)
+
+    def mouseDoubleClickEvent(self, event):
+        # Вернуть карту к позиции станции
+        if self.map_view is not None:
+            self.map_view.recenter()
+            self.map_changed()
+        super(CircularScale, self).mouseDoubleClickEvent(event)
+
+    def static_layer_state(self):
+        return self.size(), self.devicePixelRatioF(), self.map_view and self.map_view.state()
+
+    def paintEvent(self, event):
+        if self.static_layer is None or self.static_layer_key != self.static_layer_state():
+            self.static_layer = self.render_static_layer()
+            self.static_layer_key = self.static_layer_state()  # Масштаб карты задаётся при первой отрисовке
 
-        if self.angle_dict:
-            for is_enemy, angle in self.angle_dict.items():
-                color = Qt.blue if is_enemy else Qt.red
-                painter.save()
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.drawPixmap(0, 0, self.static_layer)  # Обрезается по грязной области события
+
+        layers, _, _ = self.screen_layers()
+        if self.blink_state:
+            painter.setPen(QPen(self.rl_color, 8))
+            painter.drawPoint(self.rect().center())
+            for _, points, _ in layers:
+                painter.drawPixmap(0, 0, points)
+
+        self.apply_dial_transform(painter)
+        self.draw_scale(painter)  # Риски поверх точек, как до кэширования фона
+        painter.setFont(QFont('Serif', 8))
+        if layers:
+            for color, _, bearings in layers:
                 painter.setPen(QPen(color, 4))
-                painter.rotate(360 - angle)
-                painter.drawLine(0, 0, 25, 0)
-                painter.restore()
+                painter.drawLines(bearings)
         else:
             painter.setPen(QPen(Qt.black, 4))
             painter.drawLine(0, 0, 0, -30)
@@ -98,8 +329,6 @@ class CircularScale(QWidget):
             painter.drawText(QRectF(-15, -30, 60, 20), Qt.AlignCenter, "Пеленг")
 
 
-
-
 class SinGraphAnimation(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -111,9 +340,35 @@ class SinGraphAnimation(QMainWindow):
         self.N = self.Fs * self.T  # Количество отсчётов
         self.harmonic_count = 1
         self.t = np.linspace(1, self.T, self.N, endpoint=False)
+        # Контроль гармоник выше частоты Найквиста: частота дискретизации берётся из самой сетки t
+        signal_engine.synthesizer.fs = signal_engine.grid_rate(self.t)
+        self.waveform_cache = WaveformCache()  # Общий кэш для анимации, спектра и теста
+        self.figure_tracker = FigureTracker()  # Учёт живых фигур и холстов
+        self.analytic_spectrum_enabled = True  # Линейчатый спектр АМ/ЧМ/ФМ без БПФ
+        self.display_decimation = display_decimation.MINMAX  # Прореживание линий до ширины осей в пикселях
+        # 'qpainter' - лёгкие осциллографы на QPainter (до 60 кадров/с), 'phosphor' - с послесвечением луча
+        self.scope_backend = 'matplotlib'
+        # Атлас: осциллограммы и спектры всей сетки слайдеров считаются заранее и хранятся в файле (~90 МБ)
+        # в кэше пользователя - каталог программы в установленной сборке может быть только для чтения
+        self.atlas_enabled = False
+        self.atlas_path = os.path.join(QStandardPaths.writableLocation(QStandardPaths.CacheLocation), 'rrtr_atlas.bin')
+        # Карта на круговой шкале из пирамиды тайлов с масштабом и сдвигом; строится из map.jpg при первом запуске,
+        # как и атлас - в кэше пользователя
+        self.map_tiles_enabled = False
+        self.map_tiles_path = os.path.join(QStandardPaths.writableLocation(QStandardPaths.CacheLocation), 'rrtr_tiles')
+        self.map_tiles_memory = 64 * 2 ** 20  # Предел кэша тайлов в байтах
+        # Сценарии, перехваты и результаты подавления в SQLite; излучатели подгружаются по диапазонам.
+        # Это данные пользователя, а не кэш: база лежит в его каталоге данных приложения
+        self.scenario_store_enabled = False
+        self.scenario_store_path = os.path.join(QStandardPaths.writableLocation(QStandardPaths.AppDataLocation),
+                                                'rrtr_scenarios.db')
+        self.scenario_name = 'Учебный'
+        self.scenario_catalog_path = None  # Каталог emitter_catalog вместо встроенного сценария
+        self.modulation_kinds = {'Амплитудная': signal_engine.AM, 'Частотная': signal_engine.FM,
+                                 'Фазовая': signal_engine.PM}
 
         self.modulating_signal = self.modulating_signal_func
-        self.carrier_signal = lambda t, freq_carrier: np.sin(np.pi * freq_carrier * t)
+        self.carrier_signal = self.carrier_signal_func
         self.am_modulated_signal = self.amplitude_modulation
         self.fm_modulated_signal = self.frequency_modulation
         self.pm_modulated_signal = self.phase_modulation
@@ -124,7 +379,13 @@ class SinGraphAnimation(QMainWindow):
         self.rl_angle = None  # Угол для отрисовки радиолинии
         self.rl_color = Qt.red  # Цвет для отрисовки радиолинии
         self.peleng_value = None  # Значение пеленга
-        self.data_list = [
+        self.receiver_bandwidth = 0.1  # Полоса приёмника, МГц: "Поиск" находит излучатели, пересекающие f ± B/2
+        self.search_band = (20, 2000)  # Диапазон циклического поиска, МГц
+        self.sweep_step = 1.0  # Шаг перестройки приёмника, МГц
+        self.sweep_dwell = 0.002  # Время на одной частоте, с
+        self.sweep = None
+        # Учебный сценарий; с хранилищем импортируется в базу при первом запуске
+        self.default_scenario = [
             {"Частота": 540, "Модуляция": "ЧМ", "Текст": "Ель, прием, я Ольха: сто двенадцать-двести двадцать четыре", "Пеленг": 120, "is_enemy": False},
             {"Частота": 60, "Модуляция": "АМ", "Текст": "Ольха, прием, я Ель: сто пятьдесят один-сто тридцать два", "Пеленг": 90, "is_enemy": False},
             {"Частота": 1200, "Модуляция": "ФМ", "Текст": "Олег, прием, я Молот: начинаю движение", "Пеленг": 225, "is_enemy": False},
@@ -132,27 +393,60 @@ class SinGraphAnimation(QMainWindow):
             {"Частота": 450, "Модуляция": "ФМ", "Текст": "Enemy spotted, prepare fire postions!", "Пеленг": 40, "is_enemy": True}
             # Add other dictionaries as needed
         ]
+        # Перехваченные излучатели: столбцы с индексами по частоте, полосе и модуляции
+        self.scenario_store = None
+        self.emitter_loader = None
+        if self.scenario_store_enabled:
+            self.open_scenario_store()
+        else:
+            self.emitters = self.load_scenario(self.scenario_catalog_path or self.default_scenario)
         self.setup_ui()
 
-    def modulating_signal_func(self, t, freq_modulator, harm_count=1):
-        main_wave = np.cos(np.pi * t * freq_modulator)
+    def load_scenario(self, source):
+        # Список словарей, как default_scenario, или путь к файлу каталога emitter_catalog.
+        # Индексы реестра строятся при первом поиске, а не при загрузке
+        if isinstance(source, (str, os.PathLike)):
+            emitter_catalog = startup_timing.timer.load('emitter_catalog')
+            return emitter_catalog.EmitterCatalog(source).registry()
+        return EmitterRegistry.from_records(source)
+
+    def open_scenario_store(self):
+        scenario_store = startup_timing.timer.load('scenario_store')
+        os.makedirs(os.path.dirname(self.scenario_store_path), exist_ok=True)
+        self.scenario_store = scenario_store.ScenarioStore(self.scenario_store_path)
+        QApplication.instance().aboutToQuit.connect(self.scenario_store.close)
+        self.scenario_id = self.scenario_store.scenario(self.scenario_name)
+        if self.scenario_id is None:
+            self.scenario_id = self.scenario_store.create_scenario(self.scenario_name, self.default_scenario)
+        self.emitters = EmitterRegistry()
+        self.emitter_loader = scenario_store.LazyEmitters(self.scenario_store, self.scenario_id, self.emitters)
+
+    def load_emitters(self, low, high):
+        # Без хранилища все излучатели уже в памяти
+        if self.emitter_loader is not None:
+            self.emitter_loader.ensure(low, high)
+
+    def record_intercepts(self, rows, modulation):
+        if self.scenario_store is None:
+            return
+        for row in rows:
+            self.scenario_store.record_intercept(self.scenario_id, self.emitters.ids[row],
+                                                 self.emitters.frequency[row], modulation)
+
+    def carrier_signal_func(self, t, freq_carrier):
+        return self.waveform_cache.get(CARRIER, t, freq_carrier)
 
-        return main_wave + sum(0.75 ** k * np.cos(3 ** k * np.pi * t * freq_modulator) for k in range(1, harm_count))
+    def modulating_signal_func(self, t, freq_modulator, harm_count=1):
+        return self.waveform_cache.get(MODULATING, t, freq_modulator, harm_count)
 
     def amplitude_modulation(self, t, freq_carrier, freq_modulator, harm_count=1):
-        return (1 + 0.5 * self.modulating_signal_func(t, freq_modulator, harm_count)) * self.carrier_signal(t, freq_carrier)
+        return self.waveform_cache.get(signal_engine.AM, t, freq_carrier, freq_modulator, harm_count)
 
     def frequency_modulation(self, t, freq_carrier, freq_modulator, harm_count=1):
-        modulator = self.modulating_signal_func(t, freq_modulator, harm_count)
-        product = np.zeros_like(modulator)
-
-        for i, t in enumerate(t):
-            product[i] = np.sin(2. * np.pi * (freq_carrier * t + modulator[i]))
-
-        return product
+        return self.waveform_cache.get(signal_engine.FM, t, freq_carrier, freq_modulator, harm_count)
 
     def phase_modulation(self, t, freq_carrier, freq_modulator, harm_count=1):
-        return np.cos(freq_carrier * np.pi * t + self.modulating_signal(t, freq_modulator, harm_count))
+        return self.waveform_cache.get(signal_engine.PM, t, freq_carrier, freq_modulator, harm_count)
 
     def setup_tab1(self):
 
@@ -162,15 +456,6 @@ class SinGraphAnimation(QMainWindow):
         self.start_button.clicked.connect(self.start_animation)
         self.layout.addWidget(self.start_button)
 
-        self.figure1, self.ax1 = plt.subplots(figsize=(8, 3))
-        self.canvas1 = FigureCanvas(self.figure1)
-
-        self.figure2, self.ax2 = plt.subplots(figsize=(8, 3))
-        self.canvas2 = FigureCanvas(self.figure2)
-
-        self.figure3, self.ax3 = plt.subplots(figsize=(8, 3))
-        self.canvas3 = FigureCanvas(self.figure3)
-
         self.main_tab_widget = QTabWidget()
         self.main_tab_widget.hide()
         self.layout.addWidget(self.main_tab_widget)
@@ -193,18 +478,69 @@ class SinGraphAnimation(QMainWindow):
         self.animation_started = False
         self.random_parameter = random.randint(1, 5)
 
+        # Банки кадров: 200 сдвинутых во времени осциллограмм считаются один раз
+        self.frame_bank_enabled = True
+        self.frame_bank1 = FrameBank(self.t)
+        self.frame_bank2 = FrameBank(self.t)
+        self.frame_bank3 = FrameBank(self.t)
+
+        # Один таймер на три осциллографа, перерисовываются только линии
+        self.scope_animator = ScopeAnimator(interval=16 if self.scope_backend != 'matplotlib' else 50, frames=200,
+                                            parent=self)
+        self.fps_label = QLabel()
+        self.scope_animator.fps_updated.connect(self.update_fps_label)
+
+        # Изменения слайдеров за один кадр сливаются в один пересчёт
+        self.update_scheduler = UpdateScheduler(self.apply_parameter_changes, interval=16, parent=self)
+
+        # Синтез, банки кадров и спектры считаются в фоновых потоках, пока анимация показывает прежний результат
+        self.background_compute_enabled = True
+        self.compute_worker = ComputeWorker(threads=2, parent=self)
+        self.compute_worker.finished.connect(self.apply_result)
+        self.compute_worker.failed.connect(self.report_compute_failure)
+        self.result_handlers = {}
+
+        self.atlas = None
+        if self.atlas_enabled:
+            parameter_atlas = startup_timing.timer.load('parameter_atlas')
+            os.makedirs(os.path.dirname(self.atlas_path), exist_ok=True)
+            self.atlas = parameter_atlas.ParameterAtlas(self.atlas_path, self.t,
+                                                        analytic=self.analytic_spectrum_enabled)
+            self.atlas_builder = parameter_atlas.AtlasBuilder(self.atlas, parent=self)
+            QApplication.instance().aboutToQuit.connect(self.atlas_builder.stop)
+            self.atlas_builder.start()
+
+        self.setup_dataflow()
+
+    def setup_scopes(self):
+        # Фигуры matplotlib создаются только для своего бэкенда
+        if self.scope_backend == 'matplotlib':
+            self.figure1, self.ax1, self.canvas1 = self.create_figure(figsize=(8, 3))
+
+            self.figure2, self.ax2, self.canvas2 = self.create_figure(figsize=(8, 3))
+
+            self.figure3, self.ax3, self.canvas3 = self.create_figure(figsize=(8, 3))
+        else:
+            scope_class = PhosphorScopeWidget if self.scope_backend == 'phosphor' else ScopeWidget
+            self.scope1 = scope_class('Несущий сигнал')
+            self.scope2 = scope_class('Модулирующий сигнал')
+            self.scope3 = scope_class('Модулированный сигнал')
+            for scope in (self.scope1, self.scope2, self.scope3):
+                scope.set_x_range(self.t[0], self.t[-1])
+            self.scope2.set_y_range(-3, 3)
+            self.scope3.set_y_range(-3, 3)
+
+    def setup_static_tab(self):
         self.static_layout = QVBoxLayout(self.static_tab)
-        self.plot_static_graphs()
+        self.setup_static_graphs()
+        self.dataflow_outputs += ['signal_figure', 'spectrum_figure']
+        self.dataflow.update('signal_figure', 'spectrum_figure')
 
     def setup_tab2(self):
-        self.tab2 = QWidget()
-        self.main_tab_widget.addTab(self.tab2, "Радиоконтроль")
-
         self.control_tab = QWidget()
 
         self.tab2_layout = QVBoxLayout(self.tab2)
         self.tab2_sub_tab_widget = QTabWidget()
-        self.tab2_sub_tab_widget.hide()
         self.tab2_layout.addWidget(self.tab2_sub_tab_widget)
 
         self.tab2_sub_tab_widget.addTab(self.control_tab, "Контроль")
@@ -241,6 +577,15 @@ class SinGraphAnimation(QMainWindow):
         self.circular_scale = CircularScale()
         self.control_layer.addWidget(self.circular_scale)
         self.circular_scale.hide()
+        if self.map_tiles_enabled:
+            map_tiles = startup_timing.timer.load('map_tiles')
+            if map_tiles.pyramid_current(self.circular_scale.map_path, self.map_tiles_path):
+                self.open_map_tiles()
+            else:
+                # Пирамида строится в фоне; до готовности шкала рисует карту целиком, как без тайлов
+                self.dispatch('map_tiles',
+                              partial(map_tiles.build_pyramid, self.circular_scale.map_path, self.map_tiles_path),
+                              lambda manifest: self.open_map_tiles())
 
         # Create sliders for selecting frequency
         freq_slider_layout = QHBoxLayout()
@@ -277,6 +622,20 @@ class SinGraphAnimation(QMainWindow):
         self.search_2_button.clicked.connect(self.start_search_2)
         self.control_layer.addWidget(self.search_2_button)
 
+        # Управление циклическим поиском
+        sweep_layout = QHBoxLayout()
+        self.control_layer.addLayout(sweep_layout)
+        self.sweep_label = QLabel()
+        sweep_layout.addWidget(self.sweep_label)
+        self.sweep_pause_button = QPushButton("Пауза")
+        self.sweep_pause_button.setEnabled(False)
+        self.sweep_pause_button.clicked.connect(self.toggle_sweep_pause)
+        sweep_layout.addWidget(self.sweep_pause_button)
+        self.sweep_cancel_button = QPushButton("Стоп")
+        self.sweep_cancel_button.setEnabled(False)
+        self.sweep_cancel_button.clicked.connect(self.cancel_sweep)
+        sweep_layout.addWidget(self.sweep_cancel_button)
+
         # Create button for substituting 80% of characters
         self.supr_button = QPushButton("Подавление")
         self.supr_button.setEnabled(False)
@@ -288,11 +647,12 @@ class SinGraphAnimation(QMainWindow):
         self.message_edit.setReadOnly(True)
         self.control_layer.addWidget(self.message_edit)
 
-    def setup_test_tab(self):
-        self.test_tab = QWidget()
-
-        self.main_tab_widget.addTab(self.test_tab, "Тестирование")
+    def open_map_tiles(self):
+        map_tiles = startup_timing.timer.load('map_tiles')
+        self.map_tiles = map_tiles.TilePyramid(self.map_tiles_path, memory_limit=self.map_tiles_memory)
+        self.circular_scale.set_map(map_tiles.MapView(self.map_tiles))
 
+    def setup_test_tab(self):
         # Create start testing button
         self.start_testing_button = QPushButton("Начать тестирование")
         self.start_testing_button.clicked.connect(self.start_testing)
@@ -324,12 +684,11 @@ class SinGraphAnimation(QMainWindow):
 
         if self.current_question == 1:
             # Create a figure for the plot
-            fig_test_modulation, self.test_ax1 = plt.subplots(figsize=(5, 3))
+            fig_test_modulation, self.test_ax1, canvas_test = self.create_figure(figsize=(5, 3))
             self.test_ax1.plot(self.t, self.am_modulated_signal(self.t, 20, 25, 3))
             self.test_ax1.set_xlabel(f'Время, с')
             self.test_ax1.set_ylabel(f'Амплитуда, дБ')
             # Add the figure to a canvas
-            canvas_test = FigureCanvas(fig_test_modulation)
             self.test_tab_layout.addWidget(canvas_test)
             self.question_label = QLabel(
                 f"Вопрос {self.current_question}: Получен сигнал, содержащий переговоры, перехваченный с \nпомощью SDRSharp. Определите используемый тип модуляции")
@@ -338,17 +697,11 @@ class SinGraphAnimation(QMainWindow):
             self.radio_answers = True
 
         elif self.current_question in [2, 3]:
-            am_freq_spectrum = np.abs(
-                fft(self.am_modulated_signal(self.t, 20, 25, 3))
-            )
-            frequencies = fftfreq(self.N, 1 / self.Fs)
-            fig_test_spectr, self.test_ax2 = plt.subplots()
-            self.test_ax2.plot(frequencies * 3, am_freq_spectrum)
+            fig_test_spectr, self.test_ax2, canvas_test = self.create_figure()
+            self.plot_spectrum(self.test_ax2, signal_engine.AM, 20, 25, 3, window=(-100, 100))
             self.test_ax2.set_title(f'Спектр сигнала')
             self.test_ax2.set_xlabel(f'Частота, МГц')
             self.test_ax2.set_ylabel(f'Амплитуда, дБ')
-            plt.setp(self.test_ax2, xlim=[-100, 100])
-            canvas_test = FigureCanvas(fig_test_spectr)
             self.test_tab_layout.addWidget(canvas_test)
 
             if self.current_question == 2:
@@ -377,11 +730,10 @@ class SinGraphAnimation(QMainWindow):
             self.radio_answers = True
 
         elif self.current_question == 5:
-            fig_test_modulation, self.test_ax3 = plt.subplots(figsize=(5, 3))
+            fig_test_modulation, self.test_ax3, canvas_test = self.create_figure(figsize=(5, 3))
             self.test_ax3.plot(self.t, self.frequency_modulation(self.t, 15, 4, 1))
             self.test_ax3.set_xlabel(f'Время, с')
             self.test_ax3.set_ylabel(f'Амплитуда, дБ')
-            canvas_test = FigureCanvas(fig_test_modulation)
             self.test_tab_layout.addWidget(canvas_test)
             self.question_label = QLabel(
                 f"Вопрос {self.current_question}: Укажите тип модуляции")
@@ -422,13 +774,12 @@ class SinGraphAnimation(QMainWindow):
             self.radio_answers = True
 
         elif self.current_question == 9:
-            harm_count, self.test_ax4 = plt.subplots()
+            harm_count, self.test_ax4, canvas_test = self.create_figure()
             self.test_ax4.plot(self.t, self.modulating_signal(self.t, 2, 4))
             self.test_ax4.set_title(f'Модулирующий сигнал')
             self.test_ax4.set_xlabel(f'Время, с')
             self.test_ax4.set_ylabel(f'Амплитуда, дБ')
 
-            canvas_test = FigureCanvas(harm_count)
             self.test_tab_layout.addWidget(canvas_test)
 
             self.question_label = QLabel(
@@ -438,13 +789,12 @@ class SinGraphAnimation(QMainWindow):
             self.correct_answer.append("4")
 
         elif self.current_question == 10:
-            harm_count, self.test_ax4 = plt.subplots()
+            harm_count, self.test_ax4, canvas_test = self.create_figure()
             self.test_ax4.plot(self.t, self.frequency_modulation(self.t, 20, 10, 1) + self.am_modulated_signal(self.t, 15, 4, 1))
             self.test_ax4.set_title(f'Модулированный сигнал')
             self.test_ax4.set_xlabel(f'Время, с')
             self.test_ax4.set_ylabel(f'Амплитуда, дБ')
 
-            canvas_test = FigureCanvas(harm_count)
             self.test_tab_layout.addWidget(canvas_test)
 
             self.question_label = QLabel(
@@ -555,42 +905,216 @@ class SinGraphAnimation(QMainWindow):
         self.layout.setAlignment(Qt.AlignCenter)  # Center align the layout
 
         self.setup_tab1()
-        self.setup_tab2()
-        self.setup_test_tab()
-
-    def plot_static_graphs(self, modulation_type=None, modulated_signal=None):
-        if not modulation_type:
-            current_modulation_type = 'Амплитудная'
-            current_modulated_signal = self.am_modulated_signal
-        else:
-            current_modulation_type = modulation_type
-            current_modulated_signal = modulated_signal
-
-        am_freq_spectrum = np.abs(fft(current_modulated_signal(self.t, self.freq_carrier, self.freq_modulator, self.harmonic_count)))
-        frequencies = fftfreq(self.N, 1 / self.Fs)
 
-        fig1, self.static_ax1 = plt.subplots()
-        self.static_ax1.plot(self.t, current_modulated_signal(self.t, self.freq_carrier, self.freq_modulator, self.harmonic_count))
-        self.static_ax1.set_title(f'{current_modulation_type} модуляция')
+        # Остальные вкладки и вкладка "Спектр" строятся при первом показе
+        self.tab2 = QWidget()
+        self.main_tab_widget.addTab(self.tab2, "Радиоконтроль")
+        self.test_tab = QWidget()
+        self.main_tab_widget.addTab(self.test_tab, "Тестирование")
+        self.lazy_tabs = {self.tab2: self.setup_tab2, self.test_tab: self.setup_test_tab,
+                          self.static_tab: self.setup_static_tab}
+        self.main_tab_widget.currentChanged.connect(partial(self.build_lazy_tab, self.main_tab_widget))
+        self.tab1_sub_tab_widget.currentChanged.connect(partial(self.build_lazy_tab, self.tab1_sub_tab_widget))
+
+    def build_lazy_tab(self, tab_widget, index):
+        builder = self.lazy_tabs.pop(tab_widget.widget(index), None)
+        if builder is not None:
+            with startup_timing.timer.measure(f'вкладка "{tab_widget.tabText(index)}"'):
+                builder()
+
+    def create_figure(self, figsize=None):
+        # Без pyplot: он заводит на каждую фигуру скрытое окно Qt, которое не освобождается
+        figure = startup_timing.timer.load('matplotlib.figure').Figure(figsize=figsize)
+        ax = figure.add_subplot()
+        backend = startup_timing.timer.load('matplotlib.backends.backend_qt5agg')
+        canvas = self.figure_tracker.track(backend.FigureCanvasQTAgg(figure))
+        return figure, ax, canvas
+
+    def setup_static_graphs(self):
+        fig1, self.static_ax1, self.static_canvas1 = self.create_figure()
+        self.static_line, = self.static_ax1.plot(self.t, np.zeros_like(self.t))
         self.static_ax1.set_xlabel(f'Время, с')
         self.static_ax1.set_ylabel(f'Амплитуда, дБ')
 
-        fig2, self.static_ax2 = plt.subplots()
-        self.static_ax2.plot(frequencies * 3, am_freq_spectrum)
+        fig2, self.static_ax2, self.static_canvas2 = self.create_figure()
+        self.static_spectrum_lines = self.static_ax2.vlines([], 0, [])
+        self.static_spectrum_curve, = self.static_ax2.plot([], [])
         self.static_ax2.set_title(f'Спектр сигнала')
         self.static_ax2.set_xlabel(f'Частота, МГц')
         self.static_ax2.set_ylabel(f'Амплитуда, дБ')
-        plt.setp(self.static_ax2, xlim=[-50, 50])
 
-        canvas1 = FigureCanvas(fig1)
-        canvas2 = FigureCanvas(fig2)
+        self.static_layout.addWidget(self.static_canvas1)
+        self.static_layout.addWidget(self.static_canvas2)
+
+    def setup_dataflow(self):
+        # Граф производных величин: при смене параметра пересчитывается только то, что от него зависит
+        self.dataflow = DataflowGraph()
+        self.dataflow.add_source('freq_carrier', self.freq_carrier)
+        self.dataflow.add_source('freq_modulator', self.freq_modulator)
+        self.dataflow.add_source('harmonic_count', self.harmonic_count)
+        self.dataflow.add_source('carrier_signal', self.carrier_signal)
+        self.dataflow.add_source('modulating_signal', self.modulating_signal)
+        self.dataflow.add_source('modulated_signal', self.am_modulated_signal)
+        self.dataflow.add_source('modulation_type', 'Амплитудная')
+
+        self.dataflow.add_node('carrier', lambda signal, fc: partial(signal, freq_carrier=fc),
+                               ['carrier_signal', 'freq_carrier'])
+        self.dataflow.add_node('modulator',
+                               lambda signal, fm, h: partial(signal, freq_modulator=fm, harm_count=h),
+                               ['modulating_signal', 'freq_modulator', 'harmonic_count'])
+        self.dataflow.add_node('modulated',
+                               lambda signal, fc, fm, h: partial(signal, freq_carrier=fc, freq_modulator=fm,
+                                                                 harm_count=h),
+                               ['modulated_signal', 'freq_carrier', 'freq_modulator', 'harmonic_count'])
+        self.dataflow.add_node('spectrum',
+                               lambda modulation_type, fc, fm, h: partial(
+                                   self.compute_spectrum, self.modulation_kinds[modulation_type], fc, fm, h),
+                               ['modulation_type', 'freq_carrier', 'freq_modulator', 'harmonic_count'])
+
+        # Узлы выше лишь описывают вычисление; считают (в фоне) и рисуют узлы осциллографов и фигур
+        self.dataflow.add_node('carrier_scope', partial(self.schedule_frame_bank, 1), ['carrier'])
+        self.dataflow.add_node('modulator_scope', partial(self.schedule_frame_bank, 2), ['modulator'])
+        self.dataflow.add_node('modulated_scope', partial(self.schedule_frame_bank, 3), ['modulated'])
+        self.dataflow.add_node('signal_figure',
+                               lambda modulation_type, modulated: self.dispatch(
+                                   'signal_figure', partial(modulated, self.t),
+                                   partial(self.draw_static_signal, modulation_type),
+                                   lookup=partial(self.atlas_lookup, 'waveform')),
+                               ['modulation_type', 'modulated'])
+        # Фигуры вкладки "Спектр" добавляются в обновление, когда вкладка построена
+        self.dataflow_outputs = ['carrier_scope', 'modulator_scope', 'modulated_scope']
+        self.dataflow.add_node('spectrum_figure',
+                               lambda compute, modulated: self.dispatch(
+                                   'spectrum_figure', lambda: compute(modulated(self.t)),
+                                   lambda result: self.draw_static_spectrum(*result),
+                                   lookup=partial(self.atlas_lookup, 'spectrum')),
+                               ['spectrum', 'modulated'])
+
+    def dispatch(self, key, compute, apply, cancellable=False, lookup=None):
+        # compute выполняется в фоне, apply - в потоке GUI, когда придёт результат последней задачи
+        result = lookup() if lookup is not None else None
+        if result is not None:
+            # Готовый результат (атлас): прежняя задача больше не нужна
+            self.compute_worker.cancel(key)
+            self.result_handlers.pop(key, None)
+            return apply(result)
+        if not self.background_compute_enabled:
+            return apply(compute())
+        self.result_handlers[key] = apply
+        return self.compute_worker.submit(key, compute, cancellable=cancellable)
+
+    def apply_result(self, key, result):
+        handler = self.result_handlers.pop(key, None)
+        if handler is not None:
+            handler(result)
+
+    def report_compute_failure(self, key, message):
+        self.result_handlers.pop(key, None)
+        self.fps_label.setText(f"Ошибка фонового вычисления {key}: {message}")
+
+    def schedule_frame_bank(self, number, signal):
+        bank = getattr(self, f'frame_bank{number}')
+        frames = self.atlas_lookup(('carrier', 'modulator', 'modulated')[number - 1])
+        if frames is not None:
+            return self.dispatch(f'scope{number}', None, partial(bank.load, signal=signal), lookup=lambda: frames)
+        if bank.signal is None or not self.background_compute_enabled:
+            bank.reset(signal)  # Прежнего результата нет - банк заполняется лениво по ходу анимации
+            return None
+        # Новый банк заполняется целиком в фоне и подменяет старый, который пока продолжает крутиться
+        return self.dispatch(f'scope{number}', partial(self.prepare_frame_bank, signal),
+                             partial(setattr, self, f'frame_bank{number}'), cancellable=True)
+
+    def atlas_lookup(self, name):
+        # Готовая точка атласа для текущих значений слайдеров или None
+        if self.atlas is None:
+            return None
+        kind = self.modulation_kinds[self.dataflow.get('modulation_type')]
+        freq_carrier = self.dataflow.get('freq_carrier')
+        freq_modulator = self.dataflow.get('freq_modulator')
+        harm_count = self.dataflow.get('harmonic_count')
+        if name == 'carrier':
+            return self.atlas.carrier_frames(freq_carrier)
+        if name == 'modulator':
+            return self.atlas.modulating_frames(freq_modulator, harm_count)
+        if name == 'modulated':
+            return self.atlas.modulated_frames(kind, freq_carrier, freq_modulator, harm_count)
+        if name == 'waveform':
+            return self.atlas.waveform(kind, freq_carrier, freq_modulator, harm_count)
+        if self.atlas.analytic != self.analytic_spectrum_enabled:
+            return None
+        return self.atlas.spectrum(kind, freq_carrier, freq_modulator, harm_count)
+
+    def prioritize_atlas(self):
+        if self.atlas is not None:
+            self.atlas_builder.prioritize(self.modulation_kinds[self.dataflow.get('modulation_type')],
+                                          self.dataflow.get('freq_carrier'), self.dataflow.get('freq_modulator'))
+
+    def prepare_frame_bank(self, signal, cancelled=None):
+        bank = FrameBank(self.t)
+        bank.reset(signal)
+        bank.fill(cancelled)
+        return bank
+
+    def set_dataflow_sources(self):
+        self.dataflow.set('freq_carrier', self.freq_carrier)
+        self.dataflow.set('freq_modulator', self.freq_modulator)
+        self.dataflow.set('harmonic_count', self.harmonic_count)
+        self.dataflow.set('carrier_signal', self.current_carrier_signal)
+        self.dataflow.set('modulating_signal', self.current_modulating_signal)
+        self.dataflow.set('modulated_signal', self.current_modulated_signal)
+        self.dataflow.set('modulation_type', self.current_modulation_type)
 
-        self.static_layout.addWidget(canvas1)
-        self.static_layout.addWidget(canvas2)
+    def plot_static_graphs(self, modulation_type=None, modulated_signal=None):
+        # Фигуры вкладки "Спектр" создаются один раз, здесь обновляются только данные
+        if not modulation_type:
+            current_modulation_type = 'Амплитудная'
+            current_modulated_signal = self.am_modulated_signal
+        else:
+            current_modulation_type = modulation_type
+            current_modulated_signal = modulated_signal
 
-        # Close the figures to avoid runtime warning
-        plt.close(fig1)
-        plt.close(fig2)
+        modulated = current_modulated_signal(self.t, self.freq_carrier, self.freq_modulator, self.harmonic_count)
+        self.draw_static_signal(current_modulation_type, modulated)
+        self.draw_static_spectrum(*self.compute_spectrum(self.modulation_kinds[current_modulation_type],
+                                                         self.freq_carrier, self.freq_modulator,
+                                                         self.harmonic_count, modulated))
+
+    def draw_static_signal(self, modulation_type, modulated):
+        self.static_line.set_data(*self.decimate_for_display(self.static_ax1, self.t, modulated))
+        self.static_ax1.set_title(f'{modulation_type} модуляция')
+        self.static_ax1.relim()
+        self.static_ax1.autoscale_view()
+        self.static_canvas1.draw_idle()
+
+    def draw_static_spectrum(self, frequencies, amplitudes):
+        if self.analytic_spectrum_enabled:
+            bottoms = np.column_stack([frequencies, np.zeros_like(frequencies)])
+            tops = np.column_stack([frequencies, amplitudes])
+            self.static_spectrum_lines.set_segments(np.stack([bottoms, tops], axis=1))
+        else:
+            self.static_spectrum_curve.set_data(frequencies, amplitudes)
+        self.static_spectrum_lines.set_visible(self.analytic_spectrum_enabled)
+        self.static_spectrum_curve.set_visible(not self.analytic_spectrum_enabled)
+        top = amplitudes.max() if amplitudes.size else 1
+        self.static_ax2.set(xlim=[-50, 50], ylim=[0, 1.05 * top])
+        self.static_canvas2.draw_idle()
+
+    def compute_spectrum(self, kind, freq_carrier, freq_modulator, harm_count, modulated=None, window=(-50, 50)):
+        # Считаем только видимое окно; амплитуды умножаем на N, чтобы масштаб совпадал с np.abs(fft(...))
+        spectrum = startup_timing.timer.load('spectrum')
+        if modulated is None and not self.analytic_spectrum_enabled:
+            modulated = self.waveform_cache.get(kind, self.t, freq_carrier, freq_modulator, harm_count)
+        frequencies, amplitudes = spectrum.line_spectrum([(kind, freq_carrier, freq_modulator, harm_count)], self.t,
+                                                         self.analytic_spectrum_enabled, window, modulated)
+        return frequencies, amplitudes * self.N
+
+    def plot_spectrum(self, ax, kind, freq_carrier, freq_modulator, harm_count, modulated=None, window=(-50, 50)):
+        frequencies, amplitudes = self.compute_spectrum(kind, freq_carrier, freq_modulator, harm_count, modulated, window)
+        if self.analytic_spectrum_enabled:
+            ax.vlines(frequencies, 0, amplitudes)
+        else:
+            ax.plot(frequencies, amplitudes)
+        ax.set(xlim=list(window))
 
     def start_animation(self, carrier_signal=None, modulating_signal=None, modulated=None, modulation_type=None):
 
@@ -602,6 +1126,9 @@ class SinGraphAnimation(QMainWindow):
                 self.start_button.deleteLater()
                 self.start_button = None
 
+                with startup_timing.timer.measure('осциллографы "Модуляция"'):
+                    self.setup_scopes()
+
                 self.freq_carrier_slider = QSlider(Qt.Horizontal)
                 self.freq_carrier_slider.setMinimum(0)
                 self.freq_carrier_slider.setMaximum(30)
@@ -639,7 +1166,7 @@ class SinGraphAnimation(QMainWindow):
                 self.harmonic_count_slider.valueChanged.connect(self.update_harmonic_count)
 
                 # Create a QLabel to display the current value of the modulator frequency slider
-                self.harmonic_count_label = QLabel(str(self.harmonic_count_slider.value()))
+                self.harmonic_count_label = QLabel(self.harmonic_count_text(self.harmonic_count_slider.value()))
                 self.harmonic_count_slider.valueChanged.connect(self.update_harmonic_count_label)
 
                 self.dynamic_layout.addWidget(QLabel("Количество гармоник"))
@@ -655,13 +1182,18 @@ class SinGraphAnimation(QMainWindow):
                 # self.dynamic_layout.insertWidget(0, self.refresh_button)
                 self.dynamic_layout.insertWidget(0, self.graph_type_combo)
                 self.tab1_layout.addWidget(self.tab1_sub_tab_widget)
-                self.dynamic_layout.addWidget(self.canvas1)
-                self.dynamic_layout.addWidget(self.canvas2)
-                self.dynamic_layout.addWidget(self.canvas3)
+                if self.scope_backend != 'matplotlib':
+                    self.dynamic_layout.addWidget(self.scope1)
+                    self.dynamic_layout.addWidget(self.scope2)
+                    self.dynamic_layout.addWidget(self.scope3)
+                else:
+                    self.dynamic_layout.addWidget(self.canvas1)
+                    self.dynamic_layout.addWidget(self.canvas2)
+                    self.dynamic_layout.addWidget(self.canvas3)
+                self.dynamic_layout.addWidget(self.fps_label)
 
             self.main_tab_widget.show()
             self.tab1_sub_tab_widget.show()
-            self.tab2_sub_tab_widget.show()
 
             if not carrier_signal:
                 self.current_carrier_signal = self.carrier_signal
@@ -675,52 +1207,56 @@ class SinGraphAnimation(QMainWindow):
                 self.current_modulation_type = modulation_type
 
             self.random_parameter = np.random.randint(1, 9)  # Random parameter from 1 to 5
-            self.line1, = self.ax1.plot(self.t, self.current_carrier_signal(self.t, self.freq_carrier), '-')
-            self.line2, = self.ax2.plot(self.t, self.current_modulating_signal(self.t, self.freq_modulator, self.harmonic_count), '-')
-            self.line3, = self.ax3.plot(self.t, self.current_modulated_signal(self.t, self.freq_carrier, self.freq_modulator, self.harmonic_count), '-')
-            self.ax1.autoscale(enable=True, axis='both', tight=None)
-            self.ax2.autoscale(enable=True, axis='both', tight=None)
-            self.ax3.autoscale(enable=True, axis='both', tight=None)
-            plt.setp(self.ax2, ylim=[-3, 3])
-            plt.setp(self.ax3, ylim=[-3, 3])
-            self.ax1.set_title(f'Несущий сигнал')
-            self.ax2.set_title(f'Модулирующий сигнал')
-            self.ax3.set_title(f'Модулированный сигнал')
-
-            self.ax1.set_xlabel('Время')
-            self.ax2.set_xlabel('Время')
-            self.ax3.set_xlabel('Время')
-
-            # Add y-labels
-            self.ax1.set_ylabel('Амплитуда, дБ')
-            self.ax2.set_ylabel('Амплитуда, дБ')
-            self.ax3.set_ylabel('Амплитуда, дБ')
-
-            self.animation1 = FuncAnimation(self.figure1, self.update_plot1, frames=200, interval=50)
-            self.animation2 = FuncAnimation(self.figure2, self.update_plot2, frames=200, interval=50)
-            self.animation3 = FuncAnimation(self.figure3, self.update_plot3, frames=200, interval=50)
-
-            self.animation1._start()
-            self.animation2._start()
-            self.animation3._start()
+            if self.scope_backend == 'matplotlib':
+                self.line1, = self.ax1.plot(self.t, self.current_carrier_signal(self.t, self.freq_carrier), '-')
+                self.line2, = self.ax2.plot(self.t, self.current_modulating_signal(self.t, self.freq_modulator, self.harmonic_count), '-')
+                self.line3, = self.ax3.plot(self.t, self.current_modulated_signal(self.t, self.freq_carrier, self.freq_modulator, self.harmonic_count), '-')
+                self.ax1.autoscale(enable=True, axis='both', tight=None)
+                self.ax2.autoscale(enable=True, axis='both', tight=None)
+                self.ax3.autoscale(enable=True, axis='both', tight=None)
+                self.ax2.set(ylim=[-3, 3])
+                self.ax3.set(ylim=[-3, 3])
+                self.ax1.set_title(f'Несущий сигнал')
+                self.ax2.set_title(f'Модулирующий сигнал')
+                self.ax3.set_title(f'Модулированный сигнал')
+
+                self.ax1.set_xlabel('Время')
+                self.ax2.set_xlabel('Время')
+                self.ax3.set_xlabel('Время')
+
+                # Add y-labels
+                self.ax1.set_ylabel('Амплитуда, дБ')
+                self.ax2.set_ylabel('Амплитуда, дБ')
+                self.ax3.set_ylabel('Амплитуда, дБ')
+
+            self.set_dataflow_sources()
+            self.prioritize_atlas()
+            self.dataflow.update(*self.dataflow_outputs)
+
+            self.scope_animator.clear()
+            if self.scope_backend != 'matplotlib':
+                self.scope_animator.add_widget_scope(self.scope1, self.update_plot1)
+                self.scope_animator.add_widget_scope(self.scope2, self.update_plot2)
+                self.scope_animator.add_widget_scope(self.scope3, self.update_plot3)
+            else:
+                self.scope_animator.add_scope(self.canvas1, self.ax1, self.line1, self.update_plot1)
+                self.scope_animator.add_scope(self.canvas2, self.ax2, self.line2, self.update_plot2)
+                self.scope_animator.add_scope(self.canvas3, self.ax3, self.line3, self.update_plot3)
+                self.canvas1.draw_idle()
+                self.canvas2.draw_idle()
+                self.canvas3.draw_idle()
+            self.scope_animator.start()
 
     def refresh_parameter(self):
-        self.static_layout.removeWidget(self.static_layout.itemAt(0).widget())
-        self.static_layout.removeWidget(self.static_layout.itemAt(0).widget())
         self.plot_static_graphs()
 
     def refresh_graphs(self):
-        self.ax1.clear()
-        self.ax2.clear()
-        self.ax3.clear()
-        self.animation1.event_source.stop()
-        self.animation2.event_source.stop()
-        self.animation3.event_source.stop()
-
-        self.static_layout.removeWidget(self.static_layout.itemAt(0).widget())
-        self.static_layout.removeWidget(self.static_layout.itemAt(0).widget())
-        self.static_ax1.clear()
-        self.static_ax2.clear()
+        self.update_scheduler.cancel()  # Полная перестройка ниже учитывает последние значения
+        if self.scope_backend == 'matplotlib':
+            self.ax1.clear()
+            self.ax2.clear()
+            self.ax3.clear()
+        self.scope_animator.stop()
 
         self.animation_started = False
         graph_type = self.graph_type_combo.currentText()
@@ -728,69 +1264,87 @@ class SinGraphAnimation(QMainWindow):
         if graph_type == "Амплитудная модуляция":
             modulation_type = 'Амплитудная'
             self.start_animation(self.carrier_signal, self.modulating_signal, self.am_modulated_signal, modulation_type)  # Start a new animation
-            self.plot_static_graphs(modulation_type, self.am_modulated_signal)
         elif graph_type == "Фазовая модуляция":
             modulation_type = 'Фазовая'
             self.start_animation(self.carrier_signal, self.modulating_signal, self.pm_modulated_signal, modulation_type)  # Start a new animation
-            self.plot_static_graphs(modulation_type, self.pm_modulated_signal)
         elif graph_type == "Частотная модуляция":
             modulation_type = 'Частотная'
             self.start_animation(self.carrier_signal, self.modulating_signal, self.fm_modulated_signal, modulation_type)  # Start a new animation
-            self.plot_static_graphs(modulation_type, self.fm_modulated_signal)
+
+    def decimate_for_display(self, ax, x, y):
+        return display_decimation.decimate_for_display(x, y, ax.bbox.width, self.display_decimation)
 
     def update_plot1(self, frame):
-        new_y_data = self.current_carrier_signal(self.t + 0.01 * frame, self.freq_carrier)
-        self.line1.set_ydata(new_y_data)
-        self.canvas1.draw_idle()
+        if self.frame_bank_enabled:
+            new_y_data = self.frame_bank1.frame(frame)
+        else:
+            new_y_data = self.current_carrier_signal(self.t + 0.01 * frame, self.freq_carrier)
+        if self.scope_backend != 'matplotlib':
+            self.scope1.set_data(self.t, new_y_data)
+        else:
+            self.line1.set_data(*self.decimate_for_display(self.ax1, self.t, new_y_data))
 
     def update_plot2(self, frame):
-        new_y_data = self.current_modulating_signal(self.t + 0.01 * frame, self.freq_modulator, self.harmonic_count)
-        self.line2.set_ydata(new_y_data)
-        self.canvas2.draw_idle()
+        if self.frame_bank_enabled:
+            new_y_data = self.frame_bank2.frame(frame)
+        else:
+            new_y_data = self.current_modulating_signal(self.t + 0.01 * frame, self.freq_modulator, self.harmonic_count)
+        if self.scope_backend != 'matplotlib':
+            self.scope2.set_data(self.t, new_y_data)
+        else:
+            self.line2.set_data(*self.decimate_for_display(self.ax2, self.t, new_y_data))
 
     def update_plot3(self, frame):
-        new_y_data = self.current_modulated_signal(self.t + 0.01 * frame, self.freq_carrier, self.freq_modulator, self.harmonic_count)
-        self.line3.set_ydata(new_y_data)
-        self.canvas3.draw_idle()
+        if self.frame_bank_enabled:
+            new_y_data = self.frame_bank3.frame(frame)
+        else:
+            new_y_data = self.current_modulated_signal(self.t + 0.01 * frame, self.freq_carrier, self.freq_modulator, self.harmonic_count)
+        if self.scope_backend != 'matplotlib':
+            self.scope3.set_data(self.t, new_y_data)
+        else:
+            self.line3.set_data(*self.decimate_for_display(self.ax3, self.t, new_y_data))
 
     def update_freq_carrier(self, value):
         self.freq_carrier = value
-        if self.animation_started:
-            self.start_animation(self.carrier_signal, self.modulating_signal, self.current_modulated_signal)
-            self.static_layout.removeWidget(self.static_layout.itemAt(0).widget())
-            self.static_layout.removeWidget(self.static_layout.itemAt(0).widget())
-            self.static_ax1.clear()
-            self.static_ax2.clear()
-            self.plot_static_graphs(self.current_modulation_type, self.current_modulated_signal)
+        self.update_scheduler.request('freq_carrier')
 
     def update_freq_modulator(self, value):
         self.freq_modulator = value
-        if self.animation_started:
-            self.start_animation(self.carrier_signal, self.modulating_signal, self.current_modulated_signal)
-            self.static_layout.removeWidget(self.static_layout.itemAt(0).widget())
-            self.static_layout.removeWidget(self.static_layout.itemAt(0).widget())
-            self.static_ax1.clear()
-            self.static_ax2.clear()
-            self.plot_static_graphs(self.current_modulation_type, self.current_modulated_signal)
+        self.update_scheduler.request('freq_modulator')
 
     def update_harmonic_count(self, value):
         self.harmonic_count = value
+        self.update_scheduler.request('harmonic_count')
+
+    def apply_parameter_changes(self, changed):
+        for name in changed:
+            self.dataflow.set(name, getattr(self, name))
+        self.prioritize_atlas()
         if self.animation_started:
-            self.start_animation(self.carrier_signal, self.modulating_signal, self.current_modulated_signal)
-            self.static_layout.removeWidget(self.static_layout.itemAt(0).widget())
-            self.static_layout.removeWidget(self.static_layout.itemAt(0).widget())
-            self.static_ax1.clear()
-            self.static_ax2.clear()
-            self.plot_static_graphs(self.current_modulation_type, self.current_modulated_signal)
+            self.dataflow.update(*self.dataflow_outputs)
+
+    def update_fps_label(self, fps):
+        text = (f"Кадров в секунду: {fps:.1f} | {self.figure_tracker.report()} | {self.dataflow.report()} | "
+                f"{self.compute_worker.report()}")
+        if self.atlas is not None:
+            text += f" | {self.atlas.report()}"
+        self.fps_label.setText(text)
 
     def update_carrier_frequency_label(self, value):
         self.carrier_frequency_label.setText(str(value))
 
     def update_modulator_frequency_label(self, value):
         self.modulator_frequency_label.setText(str(value))
+        self.harmonic_count_label.setText(self.harmonic_count_text(self.harmonic_count))
 
     def update_harmonic_count_label(self, value):
-        self.harmonic_count_label.setText(str(value))
+        self.harmonic_count_label.setText(self.harmonic_count_text(value))
+
+    def harmonic_count_text(self, value):
+        aliased = signal_engine.synthesizer.aliased_harmonics(self.freq_modulator, value)
+        if aliased:
+            return f"{value} (выше частоты Найквиста: {len(aliased)})"
+        return str(value)
 
     def update_freq_label(self, value):
         self.freq_label.setText(f"Выбранная частота: {value} МГц")
@@ -839,66 +1393,134 @@ class SinGraphAnimation(QMainWindow):
         self.message_edit.clear()
 
         message = "Информативного сигнала не обнаружено.\n"
-        for data in self.data_list:
-            if data["Частота"] == frequency and data["Модуляция"] == modulation:
-                message = f"Частота: {data['Частота']} МГц\nТекст: {data['Текст']}\nПеленг: {data['Пеленг']} градусов\n"
-                angles_for_points[data["is_enemy"]] = 90 - data['Пеленг']
-                break
+        row = self.tuned_emitter(frequency, modulation)
+        if row is not None:
+            data = self.emitters.record(row)
+            message = f"Частота: {data['Частота']} МГц\nТекст: {data['Текст']}\nПеленг: {data['Пеленг']} градусов\n"
+            angles_for_points[data["is_enemy"]] = 90 - data['Пеленг']
+            self.record_intercepts([row], modulation)
         self.circular_scale.set_angle(angles_for_points)
 
         self.message_edit.append(message)
 
     def start_search_2(self):
         modulation = self.modulation_combo.currentText()
+        if self.sweep is not None:
+            # Прежний поиск останавливается и удаляется, иначе каждое нажатие оставляет у окна ещё один объект
+            self.sweep.cancel()
+            self.sweep.deleteLater()
         self.message_edit.clear()
 
         self.message_edit.append(f"Начинаю циклический поиск по заданному диапазону частот, по заданной модуляции.")
-        messages = []
-        angles_for_points = {}
-        found_frequency = None  # Переменная для хранения пойманной частоты
-        for data in self.data_list:
-            if data["Модуляция"] == modulation:
-                message = f"Частота: {data['Частота']} МГц\nТекст: {data['Текст']}\nПеленг: {data['Пеленг']} градусов"
-                angles_for_points[data["is_enemy"]] = 90 - data['Пеленг']
-                messages.append(message)
-                found_frequency = data['Частота']  # Сохраняем пойманную частоту
-        self.circular_scale.set_angle(angles_for_points)
-
-        if messages:
+        self.sweep_rows = []
+        self.sweep_pending = []  # Найдены, но ещё не показаны на шкале
+        self.sweep_scale_dirty = False
+        self.sweep_scale_time = time.perf_counter()
+        self.circular_scale.set_emitters([])
+        # Приёмник проходит диапазон шагами; находки выводятся по мере обнаружения
+        self.sweep = FrequencySweep(partial(self.sweep_detect, modulation), *self.search_band, step=self.sweep_step,
+                                    dwell=self.sweep_dwell, parent=self)
+        self.sweep.detected.connect(partial(self.show_sweep_detections, modulation))
+        self.sweep.progress.connect(self.show_sweep_progress)
+        self.sweep.finished.connect(partial(self.finish_sweep, modulation))
+        self.sweep_pause_button.setText("Пауза")
+        self.sweep_pause_button.setEnabled(True)
+        self.sweep_cancel_button.setEnabled(True)
+        self.sweep.start()
+
+    def sweep_detect(self, modulation, low, high):
+        self.load_emitters(low, high)
+        return self.emitters.overlapping(low, high, modulation)
+
+    def show_sweep_detections(self, modulation, frequency, rows):
+        rows = rows[np.lexsort((self.emitters.ids[rows], self.emitters.frequency[rows]))]
+        if not self.sweep_rows:
             self.message_edit.append(f"Найдена ценная информация для модуляции {modulation}:\n")
-            for msg in messages:
-                QTimer.singleShot(1000, partial(self.message_edit.append, msg))
+        self.record_intercepts(rows, modulation)
+        self.message_edit.append("\n".join(
+            f"Частота: {data['Частота']} МГц\nТекст: {data['Текст']}\nПеленг: {data['Пеленг']} градусов"
+            for data in self.emitters.records(rows)))
+        self.sweep_rows.append(rows)
+        self.sweep_pending.append(rows)
+        self.sweep_scale_dirty = True
+
+    def show_sweep_progress(self, frequency, rate):
+        self.sweep_label.setText(f"Поиск: {frequency:.0f} МГц, скорость {rate:.0f} МГц/с")
+        # Шкала и слайдер обновляются не чаще раза в 100 мс: с тысячами находок это дороже самого поиска
+        if self.sweep_scale_dirty and time.perf_counter() - self.sweep_scale_time >= 0.1:
+            self.update_sweep_scale()
+
+    def update_sweep_scale(self):
+        self.sweep_scale_dirty = False
+        self.sweep_scale_time = time.perf_counter()
+        if not self.sweep_pending:
+            return
+        found = np.concatenate(self.sweep_pending)
+        self.sweep_pending = []
+        # На шкалу добавляются только новые находки: стоимость не растёт с числом уже показанных
+        self.circular_scale.add_emitters(90 - self.emitters.bearing[found], affiliations=self.emitters.is_enemy[found])
+        self.freq_slider.setValue(int(round(self.emitters.frequency[found[-1]])))  # Слайдер - на пойманную частоту
+
+    def finish_sweep(self, modulation, completed):
+        self.sweep_pause_button.setEnabled(False)
+        self.sweep_cancel_button.setEnabled(False)
+        self.show_sweep_progress(self.sweep.frequency, self.sweep.rate())
+        self.update_sweep_scale()
+        if not completed:
+            self.message_edit.append("Поиск остановлен.")
+        elif not self.sweep_rows:
+            self.message_edit.append(f"Шифрованные данные для {modulation} модуляции не найдены.\n")
+
+    def toggle_sweep_pause(self):
+        if self.sweep is None:
+            return
+        if self.sweep.is_running():
+            self.sweep.pause()
+            self.sweep_pause_button.setText("Продолжить")
         else:
-            self.message_edit.append(
-                f"Шифрованные данные для {modulation} модуляции и частоты {found_frequency} не найдены.\n")
+            self.sweep.resume()
+            self.sweep_pause_button.setText("Пауза")
+
+    def cancel_sweep(self):
+        if self.sweep is not None:
+            self.sweep.cancel()
 
-        if found_frequency is not None:
-            QTimer.singleShot(1000, partial(self.freq_slider.setValue,
-                                            found_frequency))  # Устанавливаем значение слайдера частоты на пойманную частоту
+    def tuned_emitter(self, frequency, modulation):
+        # Излучатель в полосе приёмника, ближайший к частоте настройки
+        self.load_emitters(frequency - self.receiver_bandwidth / 2, frequency + self.receiver_bandwidth / 2)
+        rows = self.emitters.in_passband(frequency, self.receiver_bandwidth, modulation)
+        return rows[0] if rows.size else None
 
     def substitute_chars(self):
         frequency = self.freq_slider.value()
         modulation = self.modulation_combo.currentText()
 
-        for data in self.data_list:
-            if data["Частота"] == frequency and data["Модуляция"] == modulation:
-                text = data["Текст"]
-                length = len(text)
-                num_chars_to_replace = int(length * 0.8)
-                indices_to_replace = random.sample(range(length), num_chars_to_replace)
-                new_text = ''.join(c if i not in indices_to_replace else '*' for i, c in enumerate(text))
-                data["Текст"] = new_text
-                self.message_edit.append(f" Подавление частоты {frequency} МГц и модуляции '{modulation}'")
-                break
+        row = self.tuned_emitter(frequency, modulation)
+        if row is not None:
+            text = self.emitters.texts[row]
+            length = len(text)
+            num_chars_to_replace = int(length * 0.8)
+            indices_to_replace = set(random.sample(range(length), num_chars_to_replace))
+            new_text = ''.join(c if i not in indices_to_replace else '*' for i, c in enumerate(text))
+            self.emitters.set_text(row, new_text)
+            if self.scenario_store is not None:
+                self.scenario_store.record_jamming(self.scenario_id, self.emitters.ids[row], frequency, modulation,
+                                                   new_text)
+            self.message_edit.append(f" Подавление частоты {frequency} МГц и модуляции '{modulation}'")
 
        
         
 if __name__ == '__main__':
+    multiprocessing.freeze_support()  # Первым: в замороженной сборке процессы пула атласа запускают этот же exe
     app = QApplication(sys.argv)
+    app.setApplicationName("RRTR")  # Имя каталога кэша пользователя
     window = SinGraphAnimation()
     window.setGeometry(600, 100, 800, 1200)  # Adjusted height to accommodate the tab widget
     window.setWindowTitle("РРТР")
 
     # window.showMaximized()
+    if '--startup-report' in sys.argv:
+        startup_timing.timer.first_painted.connect(lambda: print(startup_timing.timer.report(), file=sys.stderr))
+    startup_timing.timer.watch_first_paint(window)
     window.show()
     sys.exit(app.exec_())
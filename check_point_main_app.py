@@ -10,6 +10,8 @@ from PyQt5.QtGui import QPainter, QPen, QFont
 from matplotlib.animation import FuncAnimation
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 
+import signal_engine
+
 
 class CircularScale(QWidget):
     def __init__(self, parent=None):
@@ -64,9 +66,9 @@ class SinGraphAnimation(QMainWindow):
         self.modulation_index = 1.0
         self.t = np.linspace(1, self.T, self.N, endpoint=False)
 
-        self.modulating_signal = lambda t: np.cos(np.pi * t * self.freq_modulator)
-        self.carrier_signal = lambda t: np.sin(np.pi * self.freq_carrier * t)
-        self.am_modulated_signal = lambda t: (1 + 0.5 * self.modulating_signal(t)) * self.carrier_signal(t)
+        self.modulating_signal = lambda t: signal_engine.modulating_signal(t, self.freq_modulator)
+        self.carrier_signal = lambda t: signal_engine.carrier_signal(t, self.freq_carrier)
+        self.am_modulated_signal = lambda t: signal_engine.am_kernel(self.carrier_signal(t), self.modulating_signal(t))
         self.fm_modulated_signal = self.frequency_modulation
         self.pm_modulated_signal = self.phase_modulation
 
@@ -81,15 +83,10 @@ class SinGraphAnimation(QMainWindow):
 
     def frequency_modulation(self, t):
         modulator = np.sin(np.pi * self.freq_modulator * t) * self.modulation_index
-        product = np.zeros_like(modulator)
-
-        for i, t in enumerate(t):
-            product[i] = np.sin(2. * np.pi * (self.freq_carrier * t + modulator[i]))
-
-        return product
+        return signal_engine.fm_kernel(t, self.freq_carrier, modulator)
 
     def phase_modulation(self, t):
-        return np.cos(self.freq_carrier * np.pi * t + self.modulation_index * self.modulating_signal(t))
+        return signal_engine.pm_kernel(t, self.freq_carrier, self.modulation_index * self.modulating_signal(t))
 
     def setup_tab1(self):
 
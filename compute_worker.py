@@ -0,0 +1,124 @@
+"""Background computation of waveforms, frame banks and spectra.
+
+Slots submit jobs under a key ("scope1", "spectrum", ...) and get the result
+back through the ``finished`` signal on the GUI thread. A new job for a key
+supersedes the previous one: a job still queued is taken off the pool, a
+running one is asked to stop through its ``cancelled`` flag, and its result
+is dropped if it arrives anyway. Until the new result arrives the GUI keeps
+showing (and animating) the old one. With ``threads=0`` jobs run inline,
+which keeps the same signal flow without any threads.
+"""
+import threading
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, Qt, pyqtSignal
+
+
+class _Job(QRunnable):
+    def __init__(self, worker, key, generation, function, args, kwargs, cancellable=False):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.worker = worker
+        self.key = key
+        self.generation = generation
+        self.function = function
+        self.args = args
+        self.kwargs = dict(kwargs, cancelled=self.cancelled) if cancellable else kwargs
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def run(self):
+        try:
+            if self.cancelled():
+                return
+            try:
+                result = self.function(*self.args, **self.kwargs)
+            except Exception as error:
+                self.worker._failed.emit(self.key, self.generation, repr(error))
+                return
+            if not self.cancelled():
+                self.worker._done.emit(self.key, self.generation, result)
+        except RuntimeError:
+            pass  # Окно закрыто раньше, чем задача досчитала: результат уже некому отдавать
+        finally:
+            self.worker._running.discard(self)
+
+
+class ComputeWorker(QObject):
+    finished = pyqtSignal(str, object)
+    failed = pyqtSignal(str, str)
+    _done = pyqtSignal(str, int, object)
+    _failed = pyqtSignal(str, int, str)
+
+    def __init__(self, threads=2, parent=None):
+        super().__init__(parent)
+        self.threads = threads
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max(threads, 1))
+        self.jobs = {}
+        self._running = set()  # Ссылки на задачи, пока пул их не выполнил
+        self.generation = 0
+        self.submitted = 0
+        self.completed = 0
+        self.cancelled = 0
+        self.dropped = 0
+        # Сигналы из потоков пула доставляются в поток GUI через очередь событий
+        self._done.connect(self._deliver, Qt.QueuedConnection)
+        self._failed.connect(self._report_failure, Qt.QueuedConnection)
+
+    def submit(self, key, function, *args, cancellable=False, **kwargs):
+        # cancellable=True передаёт функции cancelled(), чтобы она сама прервалась, когда задачу заменят
+        self.cancel(key)
+        self.generation += 1
+        job = _Job(self, key, self.generation, function, args, kwargs, cancellable)
+        self.jobs[key] = job
+        self.submitted += 1
+        self._running.add(job)
+        if self.threads:
+            self.pool.start(job)
+        else:
+            job.run()
+        return job
+
+    def cancel(self, key):
+        job = self.jobs.pop(key, None)
+        if job is None:
+            return
+        job.cancel()
+        self.cancelled += 1
+        if self.threads and self.pool.tryTake(job):
+            self._running.discard(job)
+
+    def cancel_all(self):
+        for key in list(self.jobs):
+            self.cancel(key)
+
+    def pending(self):
+        return len(self.jobs)
+
+    def wait(self, msecs=-1):
+        return self.pool.waitForDone(msecs)
+
+    def _current(self, key, generation):
+        job = self.jobs.get(key)
+        if job is None or job.generation != generation:
+            self.dropped += 1
+            return False
+        del self.jobs[key]
+        return True
+
+    def _deliver(self, key, generation, result):
+        if self._current(key, generation):
+            self.completed += 1
+            self.finished.emit(key, result)
+
+    def _report_failure(self, key, generation, message):
+        if self._current(key, generation):
+            self.failed.emit(key, message)
+
+    def report(self):
+        return f"в работе: {self.pending()}, отменено: {self.cancelled}, отброшено: {self.dropped}"
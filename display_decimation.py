@@ -0,0 +1,55 @@
+"""Reduction of waveforms to the pixel width of the axes they are drawn in.
+
+``minmax`` keeps the smallest and largest sample of every pixel column in
+their original order, so peaks and the modulation envelope survive exactly.
+``lttb`` (Largest-Triangle-Three-Buckets) keeps one visually most significant
+point per bucket and is better suited to smooth curves.
+"""
+import numpy as np
+
+MINMAX, LTTB = 'minmax', 'lttb'
+
+
+def minmax(x, y, width):
+    n = y.shape[-1]
+    width = max(int(width), 1)
+    if n <= 2 * width:
+        return x, y
+    bucket = -(-n // width)
+    padded = np.pad(y, (0, bucket * width - n), mode='edge').reshape(width, bucket)
+    start = np.arange(width) * bucket
+    lo = np.minimum(start + padded.argmin(axis=1), n - 1)
+    hi = np.minimum(start + padded.argmax(axis=1), n - 1)
+    # В каждом столбце сохраняем порядок минимума и максимума по времени
+    index = np.column_stack([np.minimum(lo, hi), np.maximum(lo, hi)]).ravel()
+    return x[index], y[index]
+
+
+def lttb(x, y, threshold):
+    n = y.shape[-1]
+    threshold = int(threshold)
+    if threshold >= n or threshold < 3:
+        return x, y
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    index = np.empty(threshold, dtype=int)
+    index[0], index[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, stop = edges[i], edges[i + 1]
+        if i + 2 < edges.size:
+            avg_x = x[stop:edges[i + 2]].mean()
+            avg_y = y[stop:edges[i + 2]].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+        area = np.abs((x[a] - avg_x) * (y[start:stop] - y[a]) - (x[a] - x[start:stop]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        index[i + 1] = a
+    return x[index], y[index]
+
+
+def decimate_for_display(x, y, width, method=MINMAX):
+    if method == MINMAX:
+        return minmax(x, y, width)
+    if method == LTTB:
+        return lttb(x, y, 2 * width)
+    return x, y
@@ -0,0 +1,151 @@
+"""Columnar emitter catalog opened with np.memmap.
+
+One file: a JSON header, then a structured array with one record per
+emitter (frequency, bandwidth, modulation code, bearing, affiliation and
+the offset and length of its text), then the UTF-8 texts as one blob.
+Opening the catalog maps the file and reads nothing else. ``registry``
+wraps it in an EmitterRegistry whose columns are the mapped fields
+themselves, so rows are read from disk as queries touch them and texts are
+decoded only for the rows that are shown. ``write_catalog`` converts the
+dict-list scenario form (the old ``data_list``) into this format.
+"""
+import json
+
+import numpy as np
+
+from emitter_registry import DEFAULT_BANDWIDTH, MODULATIONS, EmitterRegistry
+
+VERSION = 1
+HEADER_BYTES = 4096
+ALIGN = 64
+DTYPE = np.dtype([
+    ('frequency', '<f8'),
+    ('bandwidth', '<f8'),
+    ('text_offset', '<u8'),
+    ('text_length', '<u4'),
+    ('bearing', '<f4'),
+    ('modulation', 'u1'),
+    ('is_enemy', '?'),
+])
+
+
+def _aligned(offset):
+    return -(-offset // ALIGN) * ALIGN
+
+
+def write_catalog(path, records, modulations=MODULATIONS):
+    modulations = list(modulations)
+    for data in records:
+        if data["Модуляция"] not in modulations:
+            modulations.append(data["Модуляция"])
+    codes = {name: code for code, name in enumerate(modulations)}
+
+    texts = [data["Текст"].encode('utf-8') for data in records]
+    emitters = np.zeros(len(records), dtype=DTYPE)
+    emitters['frequency'] = [data["Частота"] for data in records]
+    emitters['bandwidth'] = [data.get("Полоса", DEFAULT_BANDWIDTH) for data in records]
+    emitters['bearing'] = [data["Пеленг"] for data in records]
+    emitters['modulation'] = [codes[data["Модуляция"]] for data in records]
+    emitters['is_enemy'] = [data.get("is_enemy", False) for data in records]
+    emitters['text_length'] = [len(text) for text in texts]
+    emitters['text_offset'][1:] = np.cumsum(emitters['text_length'], dtype=np.uint64)[:-1]
+
+    records_offset = HEADER_BYTES
+    text_offset = _aligned(records_offset + emitters.nbytes)
+    header = {
+        'version': VERSION, 'count': len(records), 'dtype': DTYPE.descr, 'modulations': modulations,
+        'records_offset': records_offset, 'text_offset': text_offset, 'text_bytes': sum(map(len, texts)),
+    }
+    with open(path, 'wb') as file:
+        file.write(json.dumps(header).encode('utf-8').ljust(HEADER_BYTES, b'\0'))
+        file.write(emitters.tobytes())
+        file.write(b'\0' * (text_offset - records_offset - emitters.nbytes))
+        for text in texts:
+            file.write(text)
+    return header
+
+
+class EmitterCatalog:
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            header = json.loads(file.read(HEADER_BYTES).rstrip(b'\0').decode('utf-8'))
+        if header.get('version') != VERSION or np.dtype([tuple(field) for field in header['dtype']]) != DTYPE:
+            raise ValueError(f"Каталог {path} другой версии")
+        self.path = path
+        self.header = header
+        self.modulations = header['modulations']
+        count = header['count']
+        # Пустой memmap создать нельзя - для пустого каталога обычные массивы нулевой длины
+        if count:
+            self.emitters = np.memmap(path, dtype=DTYPE, mode='r', offset=header['records_offset'], shape=(count,))
+        else:
+            self.emitters = np.zeros(0, dtype=DTYPE)
+        if header['text_bytes']:
+            self.blob = np.memmap(path, dtype=np.uint8, mode='r', offset=header['text_offset'],
+                                  shape=(header['text_bytes'],))
+        else:
+            self.blob = np.zeros(0, dtype=np.uint8)
+
+    def __len__(self):
+        return self.emitters.size
+
+    def text(self, row):
+        offset = int(self.emitters['text_offset'][row])
+        return self.blob[offset:offset + int(self.emitters['text_length'][row])].tobytes().decode('utf-8')
+
+    def record(self, row):
+        emitter = self.emitters[row]
+        return {"Частота": emitter['frequency'].item(), "Полоса": emitter['bandwidth'].item(),
+                "Модуляция": self.modulations[emitter['modulation']], "Текст": self.text(row),
+                "Пеленг": emitter['bearing'].item(), "is_enemy": bool(emitter['is_enemy'])}
+
+    def registry(self):
+        # Столбцы реестра - поля memmap без копирования; при добавлении строк реестр сам перенесёт их в память
+        count = len(self)
+        if not count:
+            registry = EmitterRegistry(modulations=self.modulations)
+            registry.texts = CatalogTexts(self)
+            return registry
+        registry = EmitterRegistry(capacity=1, modulations=self.modulations)
+        for name in ('frequency', 'bandwidth', 'modulation', 'bearing', 'is_enemy'):
+            setattr(registry, name, self.emitters[name])
+        registry.ids = np.arange(count, dtype=np.int64)
+        registry.texts = CatalogTexts(self)
+        registry.size = count
+        return registry
+
+
+class CatalogTexts:
+    # Тексты для EmitterRegistry: читаются из блоба по запросу, изменённые и добавленные хранятся в памяти
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.changed = {}
+        self.added = []
+
+    def __len__(self):
+        return len(self.catalog) + len(self.added)
+
+    def __getitem__(self, row):
+        count = len(self.catalog)
+        if row >= count:
+            return self.added[row - count]
+        text = self.changed.get(row)
+        return self.catalog.text(row) if text is None else text
+
+    def __setitem__(self, row, text):
+        count = len(self.catalog)
+        if row >= count:
+            self.added[row - count] = text
+        else:
+            self.changed[row] = text
+
+    def extend(self, texts):
+        self.added.extend(texts)
+
+
+if __name__ == '__main__':
+    # python emitter_catalog.py scenario.json scenario.rrtrcat - список словарей в формате data_list
+    import sys
+
+    with open(sys.argv[1], encoding='utf-8') as file:
+        print(write_catalog(sys.argv[2], json.load(file)))
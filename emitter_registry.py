@@ -0,0 +1,266 @@
+"""Intercepted emitters stored as columns with lookup indexes.
+
+Each emitter is a row: centre frequency and bandwidth (MHz), modulation
+code, bearing (degrees), affiliation (``is_enemy``) and the intercepted
+text, plus an id (the row number unless the emitter comes from a store).
+Numeric columns are NumPy arrays grown by doubling (for a memory-mapped
+catalog, read-only views of the file until the first append); texts stay a
+list of str, or CatalogTexts decoded on demand for a catalog. Four
+indexes replace the linear scans of the old ``data_list``:
+
+* a hash index (frequency, modulation) -> rows, built on the first exact
+  lookup and kept up to date on append;
+* the rows sorted by frequency, for range and tolerance queries with
+  ``searchsorted``;
+* an IntervalIndex over the occupied bands ``frequency ± bandwidth / 2``,
+  for "what overlaps this passband" queries;
+* the rows of each modulation, in insertion order.
+
+The sorted, interval and per-modulation indexes are built on first use;
+after that each appended batch is merged into them, so loading a scenario
+chunk by chunk costs as much as the chunks, not the rows already loaded.
+``record`` returns a row as the old dict with Russian keys.
+"""
+import numpy as np
+
+MODULATIONS = ('АМ', 'ЧМ', 'ФМ')
+DEFAULT_BANDWIDTH = 0.025  # МГц, канал речевой связи
+
+
+def _number(value):
+    # 540.0 -> 540, чтобы сообщения выглядели как раньше
+    value = value.item()
+    return int(value) if float(value).is_integer() else value
+
+
+class IntervalIndex:
+    # Интервалы делятся на классы ширины [2^k, 2^(k+1)); внутри класса они отсортированы по началу,
+    # и все пересекающие [low, high] лежат между началами low - max_width и high - два searchsorted на класс.
+    # Добавленные интервалы образуют новую отсортированную серию; серии сливаются, как разряды двоичного
+    # счётчика, поэтому в классе не больше log2(n) серий, а добавление не пересортировывает весь класс
+    def __init__(self, low, high, rows=None):
+        self.size = 0
+        self.groups = {}  # класс ширины -> серии (строки, начала, концы, наибольшая ширина)
+        self.extend(low, high, rows)
+
+    def __len__(self):
+        return self.size
+
+    def extend(self, low, high, rows=None):
+        low = np.asarray(low, dtype=np.float64)
+        high = np.asarray(high, dtype=np.float64)
+        rows = np.arange(self.size, self.size + low.size) if rows is None else np.asarray(rows, dtype=np.intp)
+        width = high - low
+        classes = np.full(width.shape, -1075, dtype=np.int64)  # Нулевая ширина - отдельный класс
+        positive = width > 0
+        classes[positive] = np.floor(np.log2(width[positive])).astype(np.int64)
+        order = np.lexsort((low, classes))
+        bounds = np.flatnonzero(np.diff(classes[order])) + 1
+        for part in np.split(order, bounds) if order.size else []:
+            runs = self.groups.setdefault(int(classes[part[0]]), [])
+            run = (rows[part], low[part], high[part], float(width[part].max()))
+            while runs and runs[-1][0].size <= 2 * run[0].size:
+                run = self._merge(runs.pop(), run)
+            runs.append(run)
+        self.size += low.size
+
+    @staticmethod
+    def _merge(first, second):
+        # Слияние двух отсортированных серий без сортировки: место каждого элемента второй серии - searchsorted
+        size = first[0].size + second[0].size
+        at = np.searchsorted(first[1], second[1], side='right') + np.arange(second[0].size)
+        taken = np.zeros(size, dtype=bool)
+        taken[at] = True
+        merged = []
+        for a, b in zip(first[:3], second[:3]):
+            column = np.empty(size, dtype=a.dtype)
+            column[at] = b
+            column[~taken] = a
+            merged.append(column)
+        return (*merged, max(first[3], second[3]))
+
+    def overlapping(self, low, high):
+        # Строки интервалов, пересекающих [low, high], по возрастанию номера
+        found = []
+        for runs in self.groups.values():
+            for rows, starts, ends, max_width in runs:
+                start = np.searchsorted(starts, low - max_width, side='left')
+                stop = np.searchsorted(starts, high, side='right')
+                found.append(rows[start:stop][ends[start:stop] >= low])
+        return np.sort(np.concatenate(found)) if found else np.empty(0, dtype=np.intp)
+
+
+class EmitterRegistry:
+    def __init__(self, capacity=16, modulations=MODULATIONS):
+        self.modulations = list(modulations)
+        self.codes = {name: code for code, name in enumerate(self.modulations)}
+        self.size = 0
+        self.frequency = np.empty(capacity, dtype=np.float64)
+        self.bandwidth = np.empty(capacity, dtype=np.float64)
+        self.modulation = np.empty(capacity, dtype=np.uint8)
+        self.bearing = np.empty(capacity, dtype=np.float32)
+        self.is_enemy = np.empty(capacity, dtype=bool)
+        self.ids = np.empty(capacity, dtype=np.int64)
+        self.texts = []
+        self.key_index = None  # (частота, код модуляции) -> строки
+        self._frequency_order = None
+        self._sorted_frequency = None
+        self._bands = None
+        self._modulation_rows = None
+
+    @classmethod
+    def from_records(cls, records):
+        registry = cls(capacity=max(16, len(records)))
+        registry.extend(records)
+        return registry
+
+    def __len__(self):
+        return self.size
+
+    def modulation_code(self, name, create=False):
+        code = self.codes.get(name)
+        if code is None and create:
+            code = len(self.modulations)
+            self.modulations.append(name)
+            self.codes[name] = code
+        return code
+
+    def _reserve(self, size):
+        capacity = self.frequency.size
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name in ('frequency', 'bandwidth', 'modulation', 'bearing', 'is_enemy', 'ids'):
+            column = getattr(self, name)
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            setattr(self, name, grown)
+
+    def append(self, frequency, modulation, text, bearing, is_enemy=False, bandwidth=DEFAULT_BANDWIDTH, ident=None):
+        self.extend_columns([frequency], [modulation], [text], [bearing], [is_enemy], [bandwidth],
+                            None if ident is None else [ident])
+        return self.size - 1
+
+    def extend_columns(self, frequency, modulation, texts, bearing, is_enemy, bandwidth, ids=None):
+        count = len(texts)
+        start, stop = self.size, self.size + count
+        self._reserve(stop)
+        codes = np.array([self.modulation_code(name, create=True) for name in modulation], dtype=np.uint8)
+        self.frequency[start:stop] = frequency
+        self.bandwidth[start:stop] = bandwidth
+        self.modulation[start:stop] = codes
+        self.bearing[start:stop] = bearing
+        self.is_enemy[start:stop] = is_enemy
+        self.ids[start:stop] = np.arange(start, stop) if ids is None else ids
+        self.texts.extend(texts)
+        self.size = stop
+        if self.key_index is not None:
+            self._index_keys(start, stop)
+        self._merge_indexes(start, stop)
+
+    def _merge_indexes(self, start, stop):
+        # Построенные индексы дополняются строками [start, stop) вместо перестроения
+        rows = np.arange(start, stop)
+        if self._frequency_order is not None:
+            frequency = self.frequency[start:stop]
+            order = np.argsort(frequency, kind='stable')
+            # side='right': при равной частоте прежние строки остаются раньше, как в устойчивой сортировке
+            at = np.searchsorted(self._sorted_frequency, frequency[order], side='right')
+            self._frequency_order = np.insert(self._frequency_order, at, rows[order])
+            self._sorted_frequency = np.insert(self._sorted_frequency, at, frequency[order])
+        if self._bands is not None:
+            half = self.bandwidth[start:stop] / 2
+            self._bands.extend(self.frequency[start:stop] - half, self.frequency[start:stop] + half, rows)
+        if self._modulation_rows is not None:
+            codes = self.modulation[start:stop]
+            self._modulation_rows += [rows[:0]] * (len(self.modulations) - len(self._modulation_rows))
+            for code in np.unique(codes).tolist():
+                self._modulation_rows[code] = np.concatenate([self._modulation_rows[code], rows[codes == code]])
+
+    def extend(self, records):
+        self.extend_columns([data["Частота"] for data in records], [data["Модуляция"] for data in records],
+                            [data["Текст"] for data in records], [data["Пеленг"] for data in records],
+                            [data.get("is_enemy", False) for data in records],
+                            [data.get("Полоса", DEFAULT_BANDWIDTH) for data in records])
+
+    def record(self, row):
+        return {"Частота": _number(self.frequency[row]), "Полоса": _number(self.bandwidth[row]),
+                "Модуляция": self.modulations[self.modulation[row]], "Текст": self.texts[row],
+                "Пеленг": _number(self.bearing[row]), "is_enemy": bool(self.is_enemy[row])}
+
+    def records(self, rows=None):
+        return [self.record(row) for row in (range(self.size) if rows is None else rows)]
+
+    def set_text(self, row, text):
+        self.texts[row] = text
+
+    def _index_keys(self, start, stop):
+        keys = zip(self.frequency[start:stop].tolist(), self.modulation[start:stop].tolist())
+        for key, row in zip(keys, range(start, stop)):
+            self.key_index.setdefault(key, []).append(row)
+
+    def find_all(self, frequency, modulation):
+        code = self.modulation_code(modulation)
+        if code is None:
+            return []
+        if self.key_index is None:
+            self.key_index = {}
+            self._index_keys(0, self.size)
+        return self.key_index.get((float(frequency), code), [])
+
+    def find(self, frequency, modulation):
+        # Первая запись с точным совпадением частоты и модуляции, как прежний цикл с break
+        rows = self.find_all(frequency, modulation)
+        return rows[0] if rows else None
+
+    def frequency_order(self):
+        if self._frequency_order is None:
+            self._frequency_order = np.argsort(self.frequency[:self.size], kind='stable')
+            self._sorted_frequency = self.frequency[self._frequency_order]
+        return self._frequency_order
+
+    def in_range(self, low, high, modulation=None):
+        # Строки с low <= частота <= high по возрастанию частоты
+        order = self.frequency_order()
+        start = np.searchsorted(self._sorted_frequency, low, side='left')
+        stop = np.searchsorted(self._sorted_frequency, high, side='right')
+        rows = order[start:stop]
+        if modulation is not None:
+            code = self.modulation_code(modulation)
+            rows = rows[:0] if code is None else rows[self.modulation[rows] == code]
+        return rows
+
+    def near(self, frequency, tolerance, modulation=None):
+        return self.in_range(frequency - tolerance, frequency + tolerance, modulation)
+
+    def bands(self):
+        if self._bands is None:
+            half = self.bandwidth[:self.size] / 2
+            self._bands = IntervalIndex(self.frequency[:self.size] - half, self.frequency[:self.size] + half)
+        return self._bands
+
+    def overlapping(self, low, high, modulation=None):
+        # Излучатели, чья полоса пересекает [low, high], в порядке добавления
+        rows = self.bands().overlapping(low, high)
+        if modulation is not None:
+            code = self.modulation_code(modulation)
+            rows = rows[:0] if code is None else rows[self.modulation[rows] == code]
+        return rows
+
+    def in_passband(self, frequency, bandwidth, modulation=None):
+        # Полоса приёмника frequency ± bandwidth / 2; ближайшие по центру - первыми
+        rows = self.overlapping(frequency - bandwidth / 2, frequency + bandwidth / 2, modulation)
+        return rows[np.argsort(np.abs(self.frequency[rows] - frequency), kind='stable')]
+
+    def by_modulation(self, modulation):
+        # Строки одной модуляции в порядке добавления
+        code = self.modulation_code(modulation)
+        if self._modulation_rows is None:
+            codes = self.modulation[:self.size]
+            order = np.argsort(codes, kind='stable')
+            bounds = np.searchsorted(codes[order], np.arange(len(self.modulations) + 1))
+            self._modulation_rows = [order[bounds[i]:bounds[i + 1]] for i in range(len(self.modulations))]
+        if code is None:
+            return np.empty(0, dtype=np.intp)
+        return self._modulation_rows[code]
@@ -0,0 +1,46 @@
+"""Counts of live matplotlib figures and Qt canvases.
+
+Canvases are counted through their ``destroyed`` signal, figures through
+weak references, so the numbers drop as soon as Qt deletes a widget or
+Python frees a figure. ``pyplot`` is the number of figures still registered
+with pyplot, which keeps them alive until ``plt.close``; pyplot itself is not
+imported here, so the count is zero until something else imports it.
+"""
+import sys
+import weakref
+
+
+class FigureTracker:
+    def __init__(self):
+        self.created_canvases = 0
+        self.destroyed_canvases = 0
+        self._figures = weakref.WeakSet()
+
+    def track(self, canvas):
+        self._figures.add(canvas.figure)
+        self.created_canvases += 1
+        canvas.destroyed.connect(self._canvas_destroyed)
+        return canvas
+
+    def _canvas_destroyed(self, *args):
+        self.destroyed_canvases += 1
+
+    @property
+    def live_canvases(self):
+        return self.created_canvases - self.destroyed_canvases
+
+    @property
+    def live_figures(self):
+        return len(self._figures)
+
+    def counts(self):
+        pyplot = sys.modules.get('matplotlib.pyplot')
+        return {
+            'canvases': self.live_canvases,
+            'figures': self.live_figures,
+            'pyplot': len(pyplot.get_fignums()) if pyplot is not None else 0,
+        }
+
+    def report(self):
+        counts = self.counts()
+        return f"холстов: {counts['canvases']}, фигур: {counts['figures']}, в pyplot: {counts['pyplot']}"
@@ -0,0 +1,61 @@
+"""Precomputed animation frames for the modulation scopes.
+
+The scopes loop over ``frames`` waveforms, each one the same signal shifted by
+``step * frame`` in time. A FrameBank keeps them in one contiguous
+(frames, N) array and fills it lazily in chunks the first time a frame is
+requested, so after the first loop every frame is a plain row lookup. ``load`` attaches
+frames computed elsewhere, e.g. read-only views into the parameter atlas.
+"""
+import numpy as np
+
+
+class FrameBank:
+    def __init__(self, t, frames=200, step=0.01, chunk=25):
+        self.t = np.asarray(t, dtype=float)
+        self.frames = frames
+        self.step = step
+        self.chunk = chunk
+        self.data = np.empty((frames, self.t.size))
+        self.filled = np.zeros(frames, dtype=bool)
+        self.signal = None
+
+    def reset(self, signal):
+        # signal(t) must accept a 2-D time grid and return an array of the same shape
+        self.signal = signal
+        self.filled[:] = False
+        if not self.data.flags.writeable:
+            self.data = np.empty((self.frames, self.t.size))  # Раньше банк смотрел в готовые кадры (load)
+
+    def load(self, data, signal=None):
+        # Готовые кадры (например, окна осциллограммы из атласа) подключаются без копирования
+        self.data = data
+        self.signal = signal
+        self.filled[:] = True
+
+    def invalidate(self):
+        self.filled[:] = False
+
+    @property
+    def complete(self):
+        return bool(self.filled.all())
+
+    def frame(self, index):
+        index %= self.frames
+        if not self.filled[index]:
+            start = index - index % self.chunk
+            self._fill(start, min(start + self.chunk, self.frames))
+        return self.data[index]
+
+    def fill(self, cancelled=None):
+        # cancelled() проверяется между блоками: фоновое заполнение можно прервать
+        for start in range(0, self.frames, self.chunk):
+            if cancelled is not None and cancelled():
+                return False
+            if not self.filled[start:start + self.chunk].all():
+                self._fill(start, min(start + self.chunk, self.frames))
+        return True
+
+    def _fill(self, start, stop):
+        shifts = self.step * np.arange(start, stop)
+        self.data[start:stop] = self.signal(self.t + shifts[:, None])
+        self.filled[start:stop] = True
@@ -0,0 +1,120 @@
+"""Stepped receiver sweep for "Поиск 2".
+
+FrequencySweep tunes across [low, high] in ``step`` MHz, staying ``dwell``
+seconds on each frequency; the passband of a step is ``f ± step / 2``, so the
+steps tile the range; when ``step`` does not divide it, the last step is
+tuned to ``high`` itself so the top of the range is still covered. Each
+QTimer tick performs the steps that are due but only starts one when, by the
+average step time, it ends within ``slice_ms``, leaving the rest of the event
+loop free.
+Every emitter is reported once, through ``detected``, on the first step whose
+passband it overlaps. ``progress`` carries the tuned frequency and the sweep
+rate in MHz/s measured over the running (not paused) time.
+"""
+import time
+
+import numpy as np
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+
+class FrequencySweep(QObject):
+    detected = pyqtSignal(float, object)  # частота настройки, строки излучателей
+    progress = pyqtSignal(float, float)  # частота настройки, МГц/с
+    finished = pyqtSignal(bool)  # False - поиск остановлен
+
+    def __init__(self, detect, low=20.0, high=2000.0, step=1.0, dwell=0.002, slice_ms=8.0, parent=None):
+        super().__init__(parent)
+        if step <= 0:
+            raise ValueError(f"Шаг поиска должен быть положительным: {step}")
+        self.detect = detect  # detect(low, high) -> строки излучателей в полосе
+        self.low = low
+        self.high = high
+        self.step = step
+        self.dwell = dwell
+        self.slice_ms = slice_ms
+        self.step_cost = 0.0  # Скользящее среднее длительности шага, с
+        self.steps = int(np.ceil((high - low) / step - 1e-9)) + 1
+        self.index = 0
+        self.seen = set()
+        self.detections = 0
+        self.active = 0.0  # Время работы без пауз, с
+        self.started = None
+        self.next_step = None
+        self.timer = QTimer(self)
+        self.timer.setInterval(min(int(dwell * 1000), 16))
+        self.timer.timeout.connect(self.tick)
+
+    def step_frequency(self, index):
+        # Последний шаг не выходит за high, даже если шаг не делит диапазон
+        return min(self.low + index * self.step, self.high)
+
+    @property
+    def frequency(self):
+        return self.step_frequency(min(self.index, self.steps - 1))
+
+    def is_running(self):
+        return self.timer.isActive()
+
+    def is_paused(self):
+        return self.started is None and 0 < self.index < self.steps
+
+    def start(self):
+        self.resume()
+
+    def resume(self):
+        if self.is_running() or self.index >= self.steps:
+            return
+        self.started = time.perf_counter()
+        self.next_step = self.started
+        self.timer.start()
+
+    def pause(self):
+        if not self.is_running():
+            return
+        self.timer.stop()
+        self.active += time.perf_counter() - self.started
+        self.started = None
+
+    def cancel(self):
+        running = self.is_running()
+        self.pause()
+        if running or 0 < self.index < self.steps:
+            self.index = self.steps
+            self.finished.emit(False)
+
+    def elapsed(self):
+        return self.active + (time.perf_counter() - self.started if self.started is not None else 0.0)
+
+    def rate(self):
+        elapsed = self.elapsed()
+        return (self.step_frequency(self.index) - self.low) / elapsed if elapsed > 0 else 0.0
+
+    def tick(self):
+        start = time.perf_counter()
+        deadline = start + self.slice_ms / 1000
+        # После задержки цикла событий догоняем не больше одного шага, а не всё пропущенное время пачкой
+        self.next_step = max(self.next_step, start - self.dwell)
+        # Шаги, время которых подошло; следующий начинается, только если по средней длительности успеет
+        # закончиться до конца такта, но один шаг за такт выполняется всегда
+        now = start
+        while self.index < self.steps and self.next_step <= now and (now == start or now + self.step_cost < deadline):
+            frequency = self.step_frequency(self.index)
+            rows = self.detect(frequency - self.step / 2, frequency + self.step / 2)
+            fresh = [row for row in np.asarray(rows).tolist() if row not in self.seen]
+            self.index += 1
+            self.next_step += self.dwell
+            if fresh:
+                self.seen.update(fresh)
+                self.detections += len(fresh)
+                self.detected.emit(frequency, np.asarray(fresh))
+            finished = time.perf_counter()
+            self.step_cost += 0.2 * (finished - now - self.step_cost)
+            now = finished
+
+        self.progress.emit(self.frequency, self.rate())
+        if self.index >= self.steps:
+            self.pause()
+            self.finished.emit(True)
+
+    def report(self):
+        return f"поиск: {self.frequency:.0f} МГц, {self.rate():.0f} МГц/с, обнаружено: {self.detections}"
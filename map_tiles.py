@@ -0,0 +1,218 @@
+"""Tiled multi-resolution map for the CircularScale background.
+
+``build_pyramid`` cuts the map image into ``tile_size`` squares at level 0
+(full resolution) and halves it level by level until the whole map fits in
+one tile. The source is decoded once for level 0 (a clip rect per strip
+would make a JPEG decoder restart from the top for every strip), and each
+higher level is built from 2x2 tiles of the level below. Tiles are PNG
+files ``<level>/<x>_<y>.png`` next to ``pyramid.json``.
+
+TilePyramid loads tiles from disk on demand and keeps them in an LRU cache
+bounded in bytes. MapView holds the pan/zoom state: the map point under the
+station (the centre of the widget) and the screen scale. It draws only the
+tiles covering the widget, from the level closest to that scale, so a
+repaint costs the same for any map size.
+"""
+import json
+import math
+import os
+from collections import OrderedDict
+
+from PyQt5.QtCore import QPointF, QRectF, Qt
+from PyQt5.QtGui import QImage, QImageReader, QPainter, QPixmap
+
+MANIFEST = 'pyramid.json'
+
+
+def _tile_path(directory, level, x, y):
+    return os.path.join(directory, str(level), f'{x}_{y}.png')
+
+
+def _source_stamp(source):
+    stat = os.stat(source)
+    return {'source': os.path.abspath(source), 'mtime': stat.st_mtime, 'bytes': stat.st_size}
+
+
+def pyramid_current(source, directory, tile_size=256):
+    try:
+        with open(os.path.join(directory, MANIFEST), encoding='utf-8') as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return False
+    return manifest.get('stamp') == _source_stamp(source) and manifest.get('tile_size') == tile_size
+
+
+def build_pyramid(source, directory, tile_size=256):
+    reader = QImageReader(source)
+    size = reader.size()
+    if not size.isValid():
+        raise ValueError(f"Не удалось прочитать размер карты {source}: {reader.errorString()}")
+    width, height = size.width(), size.height()
+
+    # Уровень 0: исходник декодируется один раз и режется на тайлы
+    image = reader.read()
+    if image.isNull():
+        raise ValueError(f"Не удалось прочитать карту {source}: {reader.errorString()}")
+    level_width, level_height = width, height
+    os.makedirs(os.path.join(directory, '0'), exist_ok=True)
+    for y in range(math.ceil(height / tile_size)):
+        for x in range(math.ceil(width / tile_size)):
+            image.copy(x * tile_size, y * tile_size, min(tile_size, width - x * tile_size),
+                       min(tile_size, height - y * tile_size)).save(_tile_path(directory, 0, x, y))
+    del image
+
+    # Следующий уровень - из четвёрок тайлов предыдущего, уменьшенных вдвое
+    level = 0
+    while level_width > tile_size or level_height > tile_size:
+        level += 1
+        level_width, level_height = math.ceil(level_width / 2), math.ceil(level_height / 2)
+        os.makedirs(os.path.join(directory, str(level)), exist_ok=True)
+        for y in range(math.ceil(level_height / tile_size)):
+            for x in range(math.ceil(level_width / tile_size)):
+                tile_width = min(tile_size, level_width - x * tile_size)
+                tile_height = min(tile_size, level_height - y * tile_size)
+                quad = QImage(2 * tile_width, 2 * tile_height, QImage.Format_ARGB32_Premultiplied)
+                quad.fill(Qt.transparent)
+                painter = QPainter(quad)
+                for dy in (0, 1):
+                    for dx in (0, 1):
+                        path = _tile_path(directory, level - 1, 2 * x + dx, 2 * y + dy)
+                        if os.path.exists(path):
+                            painter.drawImage(dx * tile_size, dy * tile_size, QImage(path))
+                painter.end()
+                quad.scaled(tile_width, tile_height, Qt.IgnoreAspectRatio, Qt.SmoothTransformation).save(
+                    _tile_path(directory, level, x, y))
+
+    manifest = {'width': width, 'height': height, 'tile_size': tile_size, 'levels': level + 1,
+                'stamp': _source_stamp(source)}
+    with open(os.path.join(directory, MANIFEST), 'w', encoding='utf-8') as file:
+        json.dump(manifest, file)
+    return manifest
+
+
+class TilePyramid:
+    def __init__(self, directory, memory_limit=64 * 2 ** 20):
+        with open(os.path.join(directory, MANIFEST), encoding='utf-8') as file:
+            manifest = json.load(file)
+        self.directory = directory
+        self.width = manifest['width']
+        self.height = manifest['height']
+        self.tile_size = manifest['tile_size']
+        self.levels = manifest['levels']
+        self.memory_limit = memory_limit
+        self.tiles = OrderedDict()  # (уровень, x, y) -> QPixmap, в порядке последнего обращения
+        self.cached_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def level_size(self, level):
+        scale = 2 ** level
+        return math.ceil(self.width / scale), math.ceil(self.height / scale)
+
+    def tile(self, level, x, y):
+        key = (level, x, y)
+        pixmap = self.tiles.get(key)
+        if pixmap is not None:
+            self.tiles.move_to_end(key)
+            self.hits += 1
+            return pixmap
+
+        self.misses += 1
+        pixmap = QPixmap(_tile_path(self.directory, level, x, y))
+        if pixmap.isNull():
+            return None
+        self.tiles[key] = pixmap
+        self.cached_bytes += self._bytes(pixmap)
+        while self.cached_bytes > self.memory_limit and len(self.tiles) > 1:
+            _, evicted = self.tiles.popitem(last=False)
+            self.cached_bytes -= self._bytes(evicted)
+            self.evictions += 1
+        return pixmap
+
+    @staticmethod
+    def _bytes(pixmap):
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+    def clear(self):
+        self.tiles.clear()
+        self.cached_bytes = 0
+
+    def report(self):
+        return (f"тайлы: {len(self.tiles)} в кэше, {self.cached_bytes / 2 ** 20:.1f} МБ, "
+                f"промахов: {self.misses}, вытеснено: {self.evictions}")
+
+
+class MapView:
+    def __init__(self, pyramid, station=None, scale=None, min_scale=None, max_scale=4.0):
+        self.pyramid = pyramid
+        # Позиция станции в пикселях уровня 0; по умолчанию - центр карты
+        self.station = QPointF(*station) if station is not None else QPointF(pyramid.width / 2, pyramid.height / 2)
+        self.center = QPointF(self.station)  # Точка карты в центре виджета
+        self.scale = scale  # Пикселей экрана на пиксель уровня 0; None - вписать карту при первой отрисовке
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+
+    def fit(self, size):
+        # Карта закрывает виджет целиком, как прежний растянутый фон
+        self.scale = max(size.width() / self.pyramid.width, size.height() / self.pyramid.height)
+        if self.min_scale is None:
+            self.min_scale = min(self.scale, 1 / 2 ** (self.pyramid.levels - 1))
+
+    def state(self):
+        return self.center.x(), self.center.y(), self.scale
+
+    def pan(self, dx, dy):
+        # Сдвиг в пикселях экрана
+        if self.scale is not None:
+            self.center -= QPointF(dx, dy) / self.scale
+
+    def zoom(self, factor):
+        # Точка станции остаётся на месте на экране
+        if self.scale is None:
+            return
+        scale = min(max(self.scale * factor, self.min_scale), self.max_scale)
+        self.center = self.station - (self.station - self.center) * (self.scale / scale)
+        self.scale = scale
+
+    def recenter(self):
+        self.center = QPointF(self.station)
+
+    def level(self):
+        # Самый грубый уровень, который ещё не приходится растягивать
+        if self.scale >= 1:
+            return 0
+        return min(int(math.floor(math.log2(1 / self.scale))), self.pyramid.levels - 1)
+
+    def draw(self, painter, rect):
+        if self.scale is None:
+            self.fit(rect.size())
+        level = self.level()
+        factor = 2 ** level
+        tile_size = self.pyramid.tile_size
+        level_width, level_height = self.pyramid.level_size(level)
+
+        # Видимая область в пикселях выбранного уровня
+        half_width, half_height = rect.width() / 2 / self.scale, rect.height() / 2 / self.scale
+        left = (self.center.x() - half_width) / factor
+        top = (self.center.y() - half_height) / factor
+        right = (self.center.x() + half_width) / factor
+        bottom = (self.center.y() + half_height) / factor
+        columns = range(max(0, int(left // tile_size)), min(math.ceil(level_width / tile_size),
+                                                            int(right // tile_size) + 1))
+        rows = range(max(0, int(top // tile_size)), min(math.ceil(level_height / tile_size),
+                                                        int(bottom // tile_size) + 1))
+
+        screen_scale = self.scale * factor
+        painter.save()
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        for y in rows:
+            for x in columns:
+                pixmap = self.pyramid.tile(level, x, y)
+                if pixmap is None:
+                    continue
+                target = QRectF(rect.x() + (x * tile_size - left) * screen_scale,
+                                rect.y() + (y * tile_size - top) * screen_scale,
+                                pixmap.width() * screen_scale, pixmap.height() * screen_scale)
+                painter.drawPixmap(target, pixmap, QRectF(pixmap.rect()))
+        painter.restore()
@@ -0,0 +1,298 @@
+"""Precomputed waveforms and spectra for every slider position.
+
+The "Радиоанализ" sliders span a small integer grid (carrier 0-30,
+modulator 0-15, 1-5 harmonics, three modulation types). ParameterAtlas keeps
+the whole grid in one file laid out as consecutive np.memmap sections behind
+a JSON header:
+
+* carrier and modulating waveforms, and the modulated waveform of every
+  grid point, each ``n + shift * (frames - 1)`` samples long, so the animation
+  frame ``k`` (the signal shifted by ``step * k``) is the window starting at
+  ``shift * k``. A FrameBank is therefore a strided view into the file;
+  Waveforms are stored as float16 (about 1e-3 of the amplitude, well below
+  a screen pixel), which keeps the default grid near 90 MB;
+* the spectrum of every grid point on the FFT bin grid of the visible window;
+* ready flags, so a partly built atlas is usable and the build resumes on
+  the next launch. A file whose header does not match is rebuilt.
+
+AtlasBuilder fills the file with a process pool, a few blocks at a time,
+always picking the pending blocks closest to the current slider position.
+"""
+import json
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+import signal_engine
+import spectrum
+
+VERSION = 2
+HEADER_BYTES = 4096
+KINDS = (signal_engine.AM, signal_engine.FM, signal_engine.PM)
+
+
+class ParameterAtlas:
+    def __init__(self, path, t, carriers=range(31), modulators=range(16), harmonics=range(1, 6), frames=200,
+                 step=0.01, window=(-50, 50), analytic=True):
+        t = np.asarray(t, dtype=float)
+        dt = (t[-1] - t[0]) / (t.size - 1)
+        shift = step / dt
+        if abs(shift - round(shift)) > 1e-6:
+            raise ValueError(f"Сдвиг кадра {step} не кратен шагу сетки {dt}")
+        self.path = path
+        self.t = t
+        self.carriers = list(carriers)
+        self.modulators = list(modulators)
+        self.harmonics = list(harmonics)
+        self.frames = frames
+        self.shift = int(round(shift))
+        self.length = t.size + self.shift * (frames - 1)
+        rate = spectrum.sample_rate(t)
+        self.bin = rate / t.size
+        self.frequencies = window[0] + self.bin * np.arange(int(np.floor((window[1] - window[0]) / self.bin)) + 1)
+        self.analytic = analytic
+        self.header = {
+            'version': VERSION,
+            'n': int(t.size), 't0': float(t[0]), 'dt': float(dt),
+            'frames': frames, 'shift': self.shift,
+            'carriers': self.carriers, 'modulators': self.modulators, 'harmonics': self.harmonics,
+            'kinds': list(KINDS), 'window': list(window), 'bin': self.bin, 'analytic': analytic,
+        }
+        self._open()
+
+    def _layout(self):
+        grid = (len(self.carriers), len(self.modulators), len(self.harmonics))
+        return [
+            ('carrier_ready', np.uint8, grid[:1]),
+            ('modulating_ready', np.uint8, grid[1:]),
+            ('ready', np.uint8, (len(KINDS),) + grid),
+            ('carrier', np.float16, grid[:1] + (self.length,)),
+            ('modulating', np.float16, grid[1:] + (self.length,)),
+            ('modulated', np.float16, (len(KINDS),) + grid + (self.length,)),
+            ('spectra', np.float32, (len(KINDS),) + grid + (self.frequencies.size,)),
+        ]
+
+    def _read_header(self):
+        try:
+            with open(self.path, 'rb') as file:
+                return json.loads(file.read(HEADER_BYTES).rstrip(b'\0').decode('utf-8'))
+        except (OSError, ValueError):
+            return None
+
+    def _open(self):
+        layout = self._layout()
+        size = HEADER_BYTES + sum(int(np.prod(shape)) * np.dtype(dtype).itemsize for _, dtype, shape in layout)
+        if self._read_header() != self.header or os.path.getsize(self.path) != size:
+            # Нет файла или сетка другая - создаём заново, нулевые флаги готовности
+            with open(self.path, 'wb') as file:
+                file.write(json.dumps(self.header).encode('utf-8').ljust(HEADER_BYTES, b'\0'))
+                file.truncate(size)
+        offset = HEADER_BYTES
+        for name, dtype, shape in layout:
+            section = np.memmap(self.path, dtype=dtype, mode='r+', offset=offset, shape=shape)
+            setattr(self, name, section)
+            offset += section.nbytes
+
+    def index(self, kind=None, freq_carrier=None, freq_modulator=None, harm_count=None):
+        # Индексы узла сетки или None, если значение вне сетки
+        axes = ((KINDS, kind), (self.carriers, freq_carrier), (self.modulators, freq_modulator),
+                (self.harmonics, harm_count))
+        index = []
+        for values, value in axes:
+            if value is None:
+                continue
+            try:
+                index.append(values.index(value))
+            except ValueError:
+                return None
+        return tuple(index)
+
+    def frame_view(self, waveform):
+        # (frames, n) окна длинной осциллограммы без копирования
+        windows = np.lib.stride_tricks.sliding_window_view(waveform, self.t.size)
+        return windows[::self.shift][:self.frames]
+
+    def carrier_frames(self, freq_carrier):
+        index = self.index(freq_carrier=freq_carrier)
+        if index is None or not self.carrier_ready[index]:
+            return None
+        return self.frame_view(self.carrier[index])
+
+    def modulating_frames(self, freq_modulator, harm_count):
+        index = self.index(freq_modulator=freq_modulator, harm_count=harm_count)
+        if index is None or not self.modulating_ready[index]:
+            return None
+        return self.frame_view(self.modulating[index])
+
+    def modulated_frames(self, kind, freq_carrier, freq_modulator, harm_count):
+        index = self.index(kind, freq_carrier, freq_modulator, harm_count)
+        if index is None or not self.ready[index]:
+            return None
+        return self.frame_view(self.modulated[index])
+
+    def waveform(self, kind, freq_carrier, freq_modulator, harm_count):
+        frames = self.modulated_frames(kind, freq_carrier, freq_modulator, harm_count)
+        return None if frames is None else frames[0]
+
+    def spectrum(self, kind, freq_carrier, freq_modulator, harm_count):
+        index = self.index(kind, freq_carrier, freq_modulator, harm_count)
+        if index is None or not self.ready[index]:
+            return None
+        amplitudes = self.spectra[index]
+        if self.analytic:
+            lines = amplitudes > 0
+            return self.frequencies[lines], amplitudes[lines]
+        return self.frequencies, amplitudes
+
+    def blocks(self):
+        # Блок - все гармоники одной тройки (вид, несущая, модулирующая)
+        pending = ~self.ready.all(axis=-1)
+        return [(KINDS[k], self.carriers[c], self.modulators[m]) for k, c, m in zip(*np.nonzero(pending))]
+
+    def store_base(self, carrier, modulating):
+        self.carrier[:] = carrier
+        self.modulating[:] = modulating
+        self.carrier_ready[:] = 1
+        self.modulating_ready[:] = 1
+
+    def store_block(self, kind, freq_carrier, freq_modulator, waveforms, spectra):
+        index = self.index(kind, freq_carrier, freq_modulator)
+        self.modulated[index] = waveforms
+        self.spectra[index] = spectra
+        self.ready[index] = 1
+
+    @property
+    def complete(self):
+        return bool(self.ready.all())
+
+    def progress(self):
+        return int(self.ready.sum()), self.ready.size
+
+    def report(self):
+        done, total = self.progress()
+        return f"атлас: {done}/{total}"
+
+    def flush(self):
+        for name, _, _ in self._layout():
+            getattr(self, name).flush()
+
+
+def _time_grid(header):
+    return header['t0'] + header['dt'] * np.arange(header['n'] + header['shift'] * (header['frames'] - 1))
+
+
+def compute_base(header):
+    t = _time_grid(header)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', signal_engine.AliasingWarning)
+        carrier = signal_engine.carrier_signal(t, np.asarray(header['carriers'], dtype=float))
+        modulating = [[signal_engine.modulating_signal(t, fm, h) for h in header['harmonics']]
+                      for fm in header['modulators']]
+    return carrier.astype(np.float16), np.asarray(modulating, dtype=np.float16)
+
+
+def compute_block(header, kind, freq_carrier, freq_modulator):
+    # Выполняется в процессе пула: все гармоники одной точки сетки одним пакетом
+    t = _time_grid(header)
+    n = header['n']
+    harmonics = np.asarray(header['harmonics'], dtype=float)
+    params = np.column_stack([np.full_like(harmonics, freq_carrier), np.full_like(harmonics, freq_modulator),
+                              harmonics])
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', signal_engine.AliasingWarning)
+        waveforms = signal_engine.modulate_batch(kind, t, params)
+
+    window = header['window']
+    size = int(np.floor((window[1] - window[0]) / header['bin'])) + 1
+    spectra = np.zeros((harmonics.size, size), dtype=np.float32)
+    if header['analytic']:
+        rate = spectrum.sample_rate(t[:n])
+        for row, harm_count in enumerate(header['harmonics']):
+            frequencies, amplitudes = spectrum.analytic_spectrum(kind, freq_carrier, freq_modulator, harm_count,
+                                                                 rate=rate)
+            bins = np.rint((frequencies - window[0]) / header['bin']).astype(int)
+            visible = (bins >= 0) & (bins < size)
+            spectra[row, bins[visible]] = amplitudes[visible] * n
+    else:
+        # Все гармоники точки сетки - одним пакетом
+        frequencies, amplitudes = spectrum.service.batch(waveforms[:, :n], t[:n], window)
+        bins = np.rint((frequencies - window[0]) / header['bin']).astype(int)
+        visible = (bins >= 0) & (bins < size)
+        spectra[:, bins[visible]] = amplitudes[:, visible] * n
+    return kind, freq_carrier, freq_modulator, waveforms.astype(np.float16), spectra
+
+
+class AtlasBuilder(QObject):
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal()
+    failed = pyqtSignal(str)
+
+    def __init__(self, atlas, workers=None, in_flight=None, interval=50, parent=None):
+        super().__init__(parent)
+        self.atlas = atlas
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.in_flight = in_flight or 2 * self.workers
+        self.pending = []
+        self.futures = []
+        self.position = (KINDS[0], 0, 0)
+        self.executor = None
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.poll)
+
+    def start(self):
+        if not self.atlas.carrier_ready.all() or not self.atlas.modulating_ready.all():
+            self.atlas.store_base(*compute_base(self.atlas.header))
+        self.pending = self.atlas.blocks()
+        if not self.pending:
+            self.finished.emit()
+            return
+        # spawn: дочерние процессы не наследуют состояние Qt родителя
+        self.executor = ProcessPoolExecutor(self.workers, mp_context=get_context('spawn'))
+        self.timer.start()
+        self.poll()
+
+    def prioritize(self, kind, freq_carrier, freq_modulator):
+        self.position = (kind, freq_carrier, freq_modulator)
+
+    def _distance(self, block):
+        kind, freq_carrier, freq_modulator = block
+        return (kind != self.position[0], abs(freq_carrier - self.position[1]) + abs(freq_modulator - self.position[2]))
+
+    def poll(self):
+        done = [future for future in self.futures if future.done()]
+        for future in done:
+            self.futures.remove(future)
+            if future.exception() is not None:
+                self.stop()
+                self.failed.emit(repr(future.exception()))
+                return
+            self.atlas.store_block(*future.result())
+        if done:
+            self.progress.emit(*self.atlas.progress())
+
+        if self.pending and len(self.futures) < self.in_flight:
+            # Ближайшие к текущему положению слайдеров блоки - первыми
+            self.pending.sort(key=self._distance)
+            header = self.atlas.header
+            while self.pending and len(self.futures) < self.in_flight:
+                self.futures.append(self.executor.submit(compute_block, header, *self.pending.pop(0)))
+
+        if not self.pending and not self.futures:
+            self.stop()
+            self.finished.emit()
+
+    def stop(self):
+        self.timer.stop()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+        self.futures = []
+        self.atlas.flush()
+
+    def is_running(self):
+        return self.timer.isActive()
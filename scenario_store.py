@@ -0,0 +1,212 @@
+"""Scenarios, intercepts and jamming results in SQLite.
+
+The database runs in WAL mode, so the GUI thread keeps reading while the
+writer thread commits. Emitters are indexed by (scenario, frequency) and are
+never loaded whole: LazyEmitters pulls fixed-width frequency chunks into an
+EmitterRegistry the first time a search touches them. Intercepts, jamming
+results and the jammed texts are queued to StoreWriter, which commits them
+in batches on its own connection.
+"""
+import queue
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from emitter_registry import DEFAULT_BANDWIDTH
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scenarios (
+    id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL,
+    created REAL NOT NULL,
+    emitters INTEGER NOT NULL DEFAULT 0,
+    max_bandwidth REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS emitters (
+    id INTEGER PRIMARY KEY,
+    scenario INTEGER NOT NULL REFERENCES scenarios (id),
+    frequency REAL NOT NULL,
+    bandwidth REAL NOT NULL,
+    modulation TEXT NOT NULL,
+    bearing REAL NOT NULL,
+    is_enemy INTEGER NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS emitters_band ON emitters (scenario, frequency);
+CREATE TABLE IF NOT EXISTS intercepts (
+    id INTEGER PRIMARY KEY,
+    scenario INTEGER NOT NULL REFERENCES scenarios (id),
+    emitter INTEGER NOT NULL REFERENCES emitters (id),
+    time REAL NOT NULL,
+    frequency REAL NOT NULL,
+    modulation TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jamming (
+    id INTEGER PRIMARY KEY,
+    scenario INTEGER NOT NULL REFERENCES scenarios (id),
+    emitter INTEGER NOT NULL REFERENCES emitters (id),
+    time REAL NOT NULL,
+    frequency REAL NOT NULL,
+    modulation TEXT NOT NULL,
+    text TEXT NOT NULL
+);
+"""
+
+
+def connect(path):
+    connection = sqlite3.connect(path)
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute('PRAGMA synchronous=NORMAL')  # В WAL достаточно: после сбоя теряется лишь последний пакет
+    return connection
+
+
+class StoreWriter(threading.Thread):
+    def __init__(self, path, batch=500, interval=0.5):
+        super().__init__(name='scenario-store-writer', daemon=True)
+        self.path = path
+        self.batch = batch
+        self.interval = interval
+        self.queue = queue.Queue()
+        self.written = 0
+        self.batches = 0
+        self.error = None
+
+    def put(self, sql, params):
+        self.queue.put((sql, params))
+
+    def flush(self):
+        # Ждёт, пока всё поставленное раньше окажется в базе
+        done = threading.Event()
+        self.queue.put(done)
+        done.wait()
+
+    def stop(self):
+        self.queue.put(None)
+        self.join()
+
+    def run(self):
+        connection = connect(self.path)
+        running = True
+        while running:
+            items = [self.queue.get()]
+            # Пакет: до batch операций или interval секунд после первой; flush и stop закрывают его сразу
+            deadline = time.monotonic() + self.interval
+            while len(items) < self.batch and isinstance(items[-1], tuple):
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(self.queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            writes = [item for item in items if isinstance(item, tuple)]
+            if writes:
+                try:
+                    with connection:
+                        for sql, params in writes:
+                            connection.execute(sql, params)
+                    self.written += len(writes)
+                    self.batches += 1
+                except sqlite3.Error as error:
+                    self.error = repr(error)
+            for item in items:
+                if isinstance(item, threading.Event):
+                    item.set()
+                elif item is None:
+                    running = False
+        connection.close()
+
+
+class ScenarioStore:
+    def __init__(self, path, batch=500, interval=0.5):
+        self.path = path
+        self.connection = connect(path)
+        self.connection.executescript(SCHEMA)
+        self.writer = StoreWriter(path, batch, interval)
+        self.writer.start()
+
+    def scenario(self, name):
+        row = self.connection.execute('SELECT id FROM scenarios WHERE name = ?', (name,)).fetchone()
+        return None if row is None else row[0]
+
+    def create_scenario(self, name, records):
+        # Записи в прежнем виде data_list; импорт одной транзакцией в потоке вызова
+        with self.connection:
+            scenario = self.connection.execute('INSERT INTO scenarios (name, created) VALUES (?, ?)',
+                                               (name, time.time())).lastrowid
+            self.connection.executemany(
+                'INSERT INTO emitters (scenario, frequency, bandwidth, modulation, bearing, is_enemy, text) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                ((scenario, data["Частота"], data.get("Полоса", DEFAULT_BANDWIDTH), data["Модуляция"], data["Пеленг"],
+                  int(data.get("is_enemy", False)), data["Текст"]) for data in records))
+            # Размер и наибольшая полоса хранятся при сценарии, чтобы открытие не сканировало таблицу
+            self.connection.execute(
+                'UPDATE scenarios SET (emitters, max_bandwidth) = '
+                '(SELECT COUNT(*), COALESCE(MAX(bandwidth), 0) FROM emitters WHERE scenario = ?) WHERE id = ?',
+                (scenario, scenario))
+        return scenario
+
+    def count(self, scenario):
+        return self.connection.execute('SELECT emitters FROM scenarios WHERE id = ?', (scenario,)).fetchone()[0]
+
+    def max_bandwidth(self, scenario):
+        return self.connection.execute('SELECT max_bandwidth FROM scenarios WHERE id = ?', (scenario,)).fetchone()[0]
+
+    def load_band(self, scenario, low, high):
+        # Излучатели с low <= частота < high в порядке сценария
+        return self.connection.execute(
+            'SELECT id, frequency, bandwidth, modulation, bearing, is_enemy, text FROM emitters '
+            'WHERE scenario = ? AND frequency >= ? AND frequency < ? ORDER BY id', (scenario, low, high)).fetchall()
+
+    def record_intercept(self, scenario, emitter, frequency, modulation):
+        self.writer.put('INSERT INTO intercepts (scenario, emitter, time, frequency, modulation) VALUES (?, ?, ?, ?, ?)',
+                        (scenario, int(emitter), time.time(), float(frequency), modulation))
+
+    def record_jamming(self, scenario, emitter, frequency, modulation, text):
+        # Результат подавления и искажённый текст переживают перезапуск
+        self.writer.put('INSERT INTO jamming (scenario, emitter, time, frequency, modulation, text) '
+                        'VALUES (?, ?, ?, ?, ?, ?)', (scenario, int(emitter), time.time(), float(frequency),
+                                                      modulation, text))
+        self.writer.put('UPDATE emitters SET text = ? WHERE id = ?', (text, int(emitter)))
+
+    def flush(self):
+        self.writer.flush()
+
+    def close(self):
+        if self.writer.is_alive():
+            self.writer.stop()
+        self.connection.close()
+
+    def report(self):
+        report = f"БД: записано {self.writer.written} за {self.writer.batches} пакетов"
+        return report + (f", ошибка: {self.writer.error}" if self.writer.error else "")
+
+
+class LazyEmitters:
+    def __init__(self, store, scenario, registry, chunk=1.0):
+        self.store = store
+        self.scenario = scenario
+        self.registry = registry
+        self.chunk = chunk
+        self.total = store.count(scenario)
+        # Полоса излучателя может выходить за границу куска, в котором лежит его центр
+        self.margin = store.max_bandwidth(scenario) / 2
+        self.loaded = set()
+
+    def ensure(self, low, high):
+        first = int(np.floor((low - self.margin) / self.chunk))
+        last = int(np.floor((high + self.margin) / self.chunk))
+        for index in range(first, last + 1):
+            if index in self.loaded:
+                continue
+            rows = self.store.load_band(self.scenario, index * self.chunk, (index + 1) * self.chunk)
+            if rows:
+                ids, frequency, bandwidth, modulation, bearing, is_enemy, texts = zip(*rows)
+                self.registry.extend_columns(frequency, modulation, list(texts), bearing, is_enemy, bandwidth, ids)
+            self.loaded.add(index)
+
+    def report(self):
+        return f"загружено излучателей: {len(self.registry)} из {self.total}"
@@ -0,0 +1,104 @@
+"""One animation clock for all modulation scopes.
+
+ScopeAnimator replaces a FuncAnimation per figure: a single QTimer advances
+the frame counter, every scope updates its line and only the line artists are
+blitted over a cached background. The background is re-captured on every full
+draw of a canvas (resize, title change), and hidden canvases are skipped.
+Widgets that paint themselves (ScopeWidget) are driven by the same clock.
+"""
+import time
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+
+class _Scope:
+    def __init__(self, canvas, ax, line, update):
+        self.canvas = canvas
+        self.ax = ax
+        self.line = line
+        self.update = update
+        self.background = None
+        self.cid = canvas.mpl_connect('draw_event', self.capture)
+        line.set_animated(True)
+
+    def capture(self, event=None):
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.ax.draw_artist(self.line)
+
+    def blit(self):
+        if self.background is None:
+            self.canvas.draw()  # Первая полная отрисовка вызовет capture
+        self.canvas.restore_region(self.background)
+        self.ax.draw_artist(self.line)
+        self.canvas.blit(self.ax.bbox)
+
+    def disconnect(self):
+        self.canvas.mpl_disconnect(self.cid)
+        self.line.set_animated(False)
+
+
+class _WidgetScope:
+    # Виджет с собственной отрисовкой (ScopeWidget): достаточно запросить перерисовку
+    def __init__(self, widget, update):
+        self.canvas = widget
+        self.update = update
+
+    def blit(self):
+        self.canvas.update()
+
+    def disconnect(self):
+        pass
+
+
+class ScopeAnimator(QObject):
+    fps_updated = pyqtSignal(float)
+
+    def __init__(self, interval=50, frames=200, parent=None):
+        super().__init__(parent)
+        self.frames = frames
+        self.frame = 0
+        self.fps = 0.0
+        self.scopes = []
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self._tick)
+        self._ticks = 0
+        self._since = time.perf_counter()
+
+    def add_scope(self, canvas, ax, line, update):
+        self.scopes.append(_Scope(canvas, ax, line, update))
+
+    def add_widget_scope(self, widget, update):
+        self.scopes.append(_WidgetScope(widget, update))
+
+    def clear(self):
+        for scope in self.scopes:
+            scope.disconnect()
+        self.scopes = []
+
+    def start(self):
+        self._ticks = 0
+        self._since = time.perf_counter()
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+    def is_running(self):
+        return self.timer.isActive()
+
+    def _tick(self):
+        for scope in self.scopes:
+            if not scope.canvas.isVisible():
+                continue
+            scope.update(self.frame)
+            scope.blit()
+        self.frame = (self.frame + 1) % self.frames
+
+        self._ticks += 1
+        elapsed = time.perf_counter() - self._since
+        if elapsed >= 1.0:
+            self.fps = self._ticks / elapsed
+            self._ticks = 0
+            self._since = time.perf_counter()
+            self.fps_updated.emit(self.fps)
@@ -0,0 +1,238 @@
+"""Lightweight QPainter oscilloscope for the "Модуляция" sub-tab.
+
+ScopeWidget draws one waveform as a polyline. The polyline is a QPolygonF
+whose point storage is wrapped as a (n, 2) float64 NumPy array, so screen
+coordinates are written straight into Qt's memory by vectorized NumPy
+operations; no Python list of points is ever built. Samples are first reduced
+to the widget width with the min/max decimation used by the matplotlib scopes.
+
+PhosphorScopeWidget imitates the persistence of an analog scope. Each trace is
+rasterized into a float32 intensity buffer (one vertical span per pixel column,
+added through a cumulative-sum difference array), the buffer decays
+geometrically, and the result is written into a uint8 array that a QImage
+wraps without copying. A batch of traces costs about as much as one.
+"""
+import numpy as np
+from PyQt5 import sip
+from PyQt5.QtCore import QPointF, QRectF, Qt
+from PyQt5.QtGui import QColor, QFont, QImage, QPainter, QPen, QPolygonF
+from PyQt5.QtWidgets import QSizePolicy, QWidget
+
+import display_decimation
+
+
+def polygon_view(polygon, size):
+    # Массив (size, 2), разделяющий память с точками QPolygonF
+    pointer = polygon.data()
+    pointer.setsize(size * 2 * np.dtype(np.float64).itemsize)
+    return np.frombuffer(pointer, dtype=np.float64).reshape(size, 2)
+
+
+class ScopeWidget(QWidget):
+    def __init__(self, title='', parent=None):
+        super().__init__(parent)
+        self.title = title
+        self.x_range = None
+        self.y_range = None
+        self.autoscale = True
+        self.grid = True
+        self.grid_divisions = (10, 8)
+        self.margins = (40, 24, 10, 20)  # слева, сверху, справа, снизу
+        self.line_pen = QPen(QColor('#1f77b4'), 1.5)
+        self.grid_pen = QPen(QColor(220, 220, 220), 1, Qt.DotLine)
+        self.background = QColor(Qt.white)
+        self.foreground = QColor(Qt.black)
+        self.x = None
+        self.y = None
+        self._polygon = QPolygonF()
+        self._points = None
+        self.setMinimumHeight(150)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+
+    def set_x_range(self, x_min, x_max):
+        self.x_range = (x_min, x_max)
+
+    def set_y_range(self, y_min, y_max):
+        self.y_range = (y_min, y_max)
+        self.autoscale = False
+
+    def set_data(self, x, y):
+        self.x = x
+        self.y = y
+        self.update()
+
+    def plot_rect(self):
+        left, top, right, bottom = self.margins
+        return QRectF(left, top, self.width() - left - right, self.height() - top - bottom)
+
+    def _ranges(self, x, y):
+        x_range = self.x_range or (float(x[0]), float(x[-1]))
+        if self.autoscale or self.y_range is None:
+            y_min, y_max = float(y.min()), float(y.max())
+            pad = 0.05 * (y_max - y_min) or 1.0
+            y_range = (y_min - pad, y_max + pad)
+        else:
+            y_range = self.y_range
+        return x_range, y_range
+
+    def _fill_polygon(self, x, y, rect, x_range, y_range):
+        n = y.size
+        if self._points is None or self._points.shape[0] != n:
+            self._polygon = QPolygonF(n)
+            self._points = polygon_view(self._polygon, n)
+        sx = rect.width() / ((x_range[1] - x_range[0]) or 1.0)
+        sy = rect.height() / ((y_range[1] - y_range[0]) or 1.0)
+        points = self._points
+        np.subtract(x, x_range[0], out=points[:, 0])
+        points[:, 0] *= sx
+        points[:, 0] += rect.left()
+        np.subtract(y_range[1], y, out=points[:, 1])
+        points[:, 1] *= sy
+        points[:, 1] += rect.top()
+
+    def draw_grid(self, painter, rect):
+        if self.grid:
+            painter.setPen(self.grid_pen)
+            columns, rows = self.grid_divisions
+            for i in range(1, columns):
+                x = rect.left() + rect.width() * i / columns
+                painter.drawLine(QPointF(x, rect.top()), QPointF(x, rect.bottom()))
+            for i in range(1, rows):
+                y = rect.top() + rect.height() * i / rows
+                painter.drawLine(QPointF(rect.left(), y), QPointF(rect.right(), y))
+
+        painter.setPen(QPen(self.foreground, 1))
+        painter.drawRect(rect)
+        painter.setFont(QFont('Serif', 9))
+        painter.drawText(QRectF(0, 0, self.width(), self.margins[1]), Qt.AlignCenter, self.title)
+
+    def draw_labels(self, painter, rect, x_range, y_range):
+        painter.setPen(QPen(self.foreground, 1))
+        painter.setFont(QFont('Serif', 7))
+        painter.drawText(QRectF(0, rect.top() - 6, self.margins[0] - 4, 12), Qt.AlignRight | Qt.AlignVCenter,
+                         f'{y_range[1]:.3g}')
+        painter.drawText(QRectF(0, rect.bottom() - 6, self.margins[0] - 4, 12), Qt.AlignRight | Qt.AlignVCenter,
+                         f'{y_range[0]:.3g}')
+        painter.drawText(QRectF(rect.left(), rect.bottom() + 2, 60, 14), Qt.AlignLeft, f'{x_range[0]:.3g}')
+        painter.drawText(QRectF(rect.right() - 60, rect.bottom() + 2, 60, 14), Qt.AlignRight, f'{x_range[1]:.3g}')
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), self.background)
+        rect = self.plot_rect()
+        self.draw_grid(painter, rect)
+
+        if self.y is not None and self.y.size > 1:
+            x, y = display_decimation.minmax(self.x, self.y, rect.width())
+            x_range, y_range = self._ranges(x, y)
+            self._fill_polygon(x, y, rect, x_range, y_range)
+            self.draw_labels(painter, rect, x_range, y_range)
+
+            painter.setClipRect(rect)
+            painter.setPen(self.line_pen)
+            painter.drawPolyline(self._polygon)
+
+
+class PhosphorScopeWidget(ScopeWidget):
+    # Режим послесвечения аналогового осциллографа: кадры накапливаются в затухающем буфере яркости
+    def __init__(self, title='', parent=None, decay=0.85, gain=0.35):
+        super().__init__(title, parent)
+        self.decay = decay  # Доля яркости, остающаяся после каждого кадра
+        self.gain = gain  # Яркость, добавляемая одним проходом луча
+        self.background = QColor(Qt.black)
+        self.foreground = QColor(140, 200, 140)
+        self.grid_pen = QPen(QColor(0, 70, 0), 1, Qt.DotLine)
+        self.traces = 0
+        self.intensity = None
+        self.pixels = None
+        self.image = None
+        self._ranges_used = None
+        self._levels = None
+        self._color_table = [QColor(int(40 * v), int(255 * v ** 0.5), int(60 * v)).rgb()
+                             for v in np.linspace(0.0, 1.0, 256)]
+
+    def _allocate(self, width, height):
+        # Ширина строки QImage выравнивается на 4 байта, поэтому буфер шире видимой области
+        stride = -(-width // 4) * 4
+        self.intensity = np.zeros((height, width), dtype=np.float32)
+        self._levels = np.empty((height, width), dtype=np.float32)
+        self.pixels = np.zeros((height, stride), dtype=np.uint8)
+        # QImage поверх указателя не копирует данные (в отличие от bytes/memoryview): массив хранится в self.pixels
+        self.image = QImage(sip.voidptr(self.pixels.ctypes.data), width, height, stride, QImage.Format_Indexed8)
+        self.image.setColorTable(self._color_table)
+
+    def clear(self):
+        if self.intensity is not None:
+            self.intensity.fill(0)
+            self.pixels.fill(0)
+        self.traces = 0
+        self.update()
+
+    def set_data(self, x, y):
+        self.add_traces(x, y)
+
+    def add_traces(self, x, y):
+        # y - один след (n,) или пачка следов (T, n), общая ось x
+        self.x = x
+        self.y = y
+        rect = self.plot_rect()
+        width, height = int(rect.width()), int(rect.height())
+        if width < 2 or height < 2:
+            return
+        if self.intensity is None or self.intensity.shape != (height, width):
+            self._allocate(width, height)
+
+        traces = np.atleast_2d(y)
+        x_range, y_range = self._ranges(x, traces)
+        if self.autoscale and self._ranges_used is not None:
+            # Накопленное изображение привязано к масштабу: диапазон только расширяется
+            old = self._ranges_used[1]
+            y_range = (min(old[0], y_range[0]), max(old[1], y_range[1]))
+        if self._ranges_used is None or not np.allclose((x_range, y_range), self._ranges_used, rtol=1e-3):
+            self.intensity.fill(0)
+            self._ranges_used = (x_range, y_range)
+        x_range, y_range = self._ranges_used
+
+        columns = np.clip((x - x_range[0]) * ((width - 1) / ((x_range[1] - x_range[0]) or 1.0)), 0, width - 1)
+        columns = columns.astype(np.intp)
+        rows = (y_range[1] - traces) * ((height - 1) / ((y_range[1] - y_range[0]) or 1.0))
+        np.clip(rows, 0, height - 1, out=rows)
+        rows = rows.astype(np.intp)
+
+        # Вертикальный отрезок луча в каждом столбце пикселей; x возрастает, поэтому хватает reduceat
+        starts = np.flatnonzero(np.r_[True, columns[1:] != columns[:-1]])
+        used = columns[starts]
+        low = np.minimum.reduceat(rows, starts, axis=1)
+        high = np.maximum.reduceat(rows, starts, axis=1)
+        # Соединяем соседние столбцы, чтобы крутые фронты не рвались
+        low[:, 1:] = np.minimum(low[:, 1:], high[:, :-1] + 1)
+        high[:, 1:] = np.maximum(high[:, 1:], low[:, :-1] - 1)
+
+        # Разностный массив по строкам: +яркость в начале отрезка, -яркость после конца, затем накопленная сумма.
+        # Более ранние следы пачки успевают затухнуть, поэтому их вес меньше
+        count = traces.shape[0]
+        weights = np.repeat(self.gain * self.decay ** np.arange(count - 1, -1, -1), used.size)
+        size = (height + 1) * width
+        delta = np.bincount((low * width + used).ravel(), weights, minlength=size)
+        delta -= np.bincount(((high + 1) * width + used).ravel(), weights, minlength=size)
+        hits = np.cumsum(delta.reshape(height + 1, width)[:height], axis=0)
+
+        self.intensity *= self.decay ** count
+        self.intensity += hits
+        self.traces += count
+
+        np.minimum(self.intensity, 1.0, out=self._levels)
+        self._levels *= 255
+        self.pixels[:, :width] = self._levels
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), self.background)
+        rect = self.plot_rect()
+        if self.image is not None:
+            painter.drawImage(rect.topLeft(), self.image)
+        self.draw_grid(painter, rect)
+        if self._ranges_used is not None:
+            self.draw_labels(painter, rect, *self._ranges_used)
@@ -0,0 +1,189 @@
+"""Vectorized AM/FM/PM kernels used by the РРТР apps.
+
+Every function works on the whole time grid ``t`` at once. Parameters may be
+scalars (the result has the shape of ``t``) or 1-D arrays of equal length
+(the result is a 2-D batch with one row per parameter set).
+"""
+import threading
+import warnings
+from collections import OrderedDict
+
+import numpy as np
+
+AM, FM, PM = 'am', 'fm', 'pm'
+
+
+def _broadcast_params(*params):
+    # Скаляры оставляем скалярами, массивы превращаем в столбцы (B, 1)
+    params = np.broadcast_arrays(*(np.asarray(p) for p in params))
+    if params[0].ndim == 0:
+        return params, False
+    return [p.reshape(-1, 1) for p in params], True
+
+
+def grid_rate(t):
+    # Отсчётов в секунду равномерной сетки: linspace(1, 3, 3000) даёт 1500, а не 3000 / 3
+    return (len(t) - 1) / (t[-1] - t[0])
+
+
+def carrier_signal(t, freq_carrier):
+    (freq_carrier,), _ = _broadcast_params(freq_carrier)
+    return np.sin(np.pi * freq_carrier * np.asarray(t, dtype=float))
+
+
+class AliasingWarning(UserWarning):
+    pass
+
+
+class HarmonicSynthesizer:
+    """Sum of 0.75**k * cos(3**k * pi * f * t) harmonics accumulated in place.
+
+    Per-harmonic cosine bases of small 1-D grids are kept in a byte-bounded
+    LRU, so calls that share ``t`` (slider moves, quiz questions) reuse them;
+    long grids are accumulated through one scratch buffer instead. Harmonics
+    whose weight drops below float64 resolution are skipped, which bounds the
+    work for any ``harm_count``. Harmonic k of cos(pi * f * t) lies at
+    3**k * f / 2; when ``fs`` is set, harmonics above ``fs / 2`` are reported
+    with an AliasingWarning.
+    """
+
+    def __init__(self, fs=None, max_bytes=16 * 2 ** 20):
+        self.fs = fs
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._bases = OrderedDict()
+        self._lock = threading.Lock()  # Синтез может идти из фоновых потоков
+
+    def harmonic_frequencies(self, freq, harm_count):
+        # cos(pi * 3**k * f * t) - частота 3**k * f / 2, а не 3**k * f
+        k = np.arange(min(int(harm_count), _MAX_HARMONICS))
+        return 3.0 ** k * freq / 2
+
+    def aliased_harmonics(self, freq, harm_count):
+        if self.fs is None:
+            return []
+        freqs = self.harmonic_frequencies(np.max(np.abs(freq)), np.max(harm_count))
+        return np.flatnonzero(freqs > self.fs / 2).tolist()
+
+    def _cached(self, key, compute):
+        with self._lock:
+            value = self._bases.get(key)
+            if value is not None:
+                self._bases.move_to_end(key)
+                return value
+        value = compute()
+        if value.nbytes <= self.max_bytes:
+            with self._lock:
+                if key not in self._bases:
+                    self._bases[key] = value
+                    self.nbytes += value.nbytes
+                while self.nbytes > self.max_bytes:
+                    _, evicted = self._bases.popitem(last=False)
+                    self.nbytes -= evicted.nbytes
+        return value
+
+    def _basis(self, t, freq):
+        # Косинусный базис одной гармоники; кэшируется только для небольших одномерных сеток
+        if t.ndim != 1 or not t.size or np.ndim(freq) != 0 or t.nbytes * 8 > self.max_bytes:
+            return None
+        key = (t.size, float(t[0]), float(t[-1]), float(freq))
+        return self._cached(key, lambda: np.cos(np.pi * freq * t))
+
+    def synthesize(self, t, freq, harm_count=1, out=None):
+        t = np.asarray(t, dtype=float)
+        shape = np.broadcast_shapes(t.shape, np.shape(freq))
+        if out is None:
+            out = np.empty(shape)
+
+        basis = self._basis(t, freq)
+        if basis is not None:
+            out[...] = basis
+        else:
+            np.multiply(t, np.pi * freq, out=out)
+            np.cos(out, out=out)
+
+        aliased = self.aliased_harmonics(freq, harm_count)
+        if aliased:
+            warnings.warn(f"Гармоники {aliased} выше частоты Найквиста {self.fs / 2}", AliasingWarning, stacklevel=3)
+
+        scratch = None
+        for k in range(1, min(int(np.max(harm_count)), _MAX_HARMONICS)):
+            # Строки с меньшим числом гармоник получают нулевой вес
+            weight = 0.75 ** k * (harm_count > k)
+            basis = self._basis(t, 3.0 ** k * freq)
+            if scratch is None:
+                scratch = np.empty(shape)
+            if basis is None:
+                np.multiply(t, np.pi * 3.0 ** k * freq, out=scratch)
+                np.cos(scratch, out=scratch)
+                scratch *= weight
+            else:
+                np.multiply(basis, weight, out=scratch)
+            out += scratch
+
+        return out
+
+    def clear(self):
+        with self._lock:
+            self._bases.clear()
+            self.nbytes = 0
+
+
+# Веса 0.75**k ниже разрешения float64 ничего не добавляют к сумме
+_MAX_HARMONICS = int(np.ceil(np.log(np.finfo(float).eps) / np.log(0.75))) + 1
+
+synthesizer = HarmonicSynthesizer()
+
+
+def modulating_signal(t, freq_modulator, harm_count=1, out=None):
+    (freq_modulator, harm_count), _ = _broadcast_params(freq_modulator, harm_count)
+    return synthesizer.synthesize(t, freq_modulator, harm_count, out=out)
+
+
+def am_kernel(carrier, modulator):
+    return (1 + 0.5 * modulator) * carrier
+
+
+def fm_kernel(t, freq_carrier, modulator):
+    product = freq_carrier * np.asarray(t, dtype=float) + modulator
+    product *= 2. * np.pi
+    return np.sin(product, out=product)
+
+
+def pm_kernel(t, freq_carrier, modulator):
+    product = freq_carrier * np.pi * np.asarray(t, dtype=float) + modulator
+    return np.cos(product, out=product)
+
+
+def amplitude_modulation(t, freq_carrier, freq_modulator, harm_count=1):
+    (freq_carrier, freq_modulator, harm_count), _ = _broadcast_params(freq_carrier, freq_modulator, harm_count)
+    return am_kernel(carrier_signal(t, freq_carrier), modulating_signal(t, freq_modulator, harm_count))
+
+
+def frequency_modulation(t, freq_carrier, freq_modulator, harm_count=1):
+    (freq_carrier, freq_modulator, harm_count), _ = _broadcast_params(freq_carrier, freq_modulator, harm_count)
+    return fm_kernel(t, freq_carrier, modulating_signal(t, freq_modulator, harm_count))
+
+
+def phase_modulation(t, freq_carrier, freq_modulator, harm_count=1):
+    (freq_carrier, freq_modulator, harm_count), _ = _broadcast_params(freq_carrier, freq_modulator, harm_count)
+    return pm_kernel(t, freq_carrier, modulating_signal(t, freq_modulator, harm_count))
+
+
+MODULATIONS = {
+    AM: amplitude_modulation,
+    FM: frequency_modulation,
+    PM: phase_modulation,
+}
+
+
+def modulate(kind, t, freq_carrier, freq_modulator, harm_count=1):
+    return MODULATIONS[kind](t, freq_carrier, freq_modulator, harm_count)
+
+
+def modulate_batch(kind, t, params):
+    """Evaluate a (B, 3) array of (carrier, modulator, harmonics) rows in one call."""
+    params = np.atleast_2d(np.asarray(params, dtype=float))
+    if params.shape[1] != 3:
+        raise ValueError(f"Ожидались строки (несущая, модулирующая, гармоники), получено {params.shape}")
+    return modulate(kind, t, params[:, 0], params[:, 1], params[:, 2].astype(int))
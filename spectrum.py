@@ -0,0 +1,226 @@
+"""Spectra of the РРТР test signals.
+
+Frequencies are in the units of the signal engine parameters: a component
+``cos(pi * f * t)`` shows up at ``f``, which is what the spectrum plots label
+as МГц. Amplitudes are two-sided and normalised, i.e. ``|fft(x)| / N``.
+
+For the single-component AM/FM/PM signals of ``signal_engine`` the line
+spectrum is computed in closed form (carrier and sidebands for AM, Bessel
+sidebands for FM/PM); anything else goes through the real FFT of
+``SpectrumService``.
+"""
+from functools import lru_cache
+
+import numpy as np
+from scipy.fft import fft, next_fast_len, rfft, rfftfreq
+from scipy.special import jv
+
+import signal_engine
+
+ANALYTIC_KINDS = (signal_engine.AM, signal_engine.FM, signal_engine.PM)
+
+
+def sample_rate(t):
+    # Частота дискретизации в единицах шкалы спектра (cos(pi * f * t) -> f)
+    return 2. * signal_engine.grid_rate(t)
+
+
+def _modulator_coefficients(harm_count):
+    # Амплитуды гармоник 0.75**k * cos(3**k * pi * f * t), k = 0 - основная волна
+    count = min(int(harm_count), signal_engine._MAX_HARMONICS)
+    return 0.75 ** np.arange(max(count, 1))
+
+
+def _am_lines(freq_carrier, freq_modulator, harm_count):
+    # (1 + 0.5 * m(t)) * sin(pi * fc * t): несущая и пары боковых fc +- 3**k * fm
+    weights = _modulator_coefficients(harm_count)
+    offsets = 3.0 ** np.arange(weights.size) * freq_modulator
+    shifts = np.concatenate([[0.], offsets, -offsets])
+    envelope = np.concatenate([[1.], 0.25 * weights, 0.25 * weights]).astype(complex)
+
+    freqs = np.concatenate([freq_carrier + shifts, -freq_carrier + shifts])
+    amps = np.concatenate([envelope / 2j, -envelope / 2j])
+    return freqs, amps
+
+
+def _angle_lines(carrier, freq_modulator, indices, phase0, tol):
+    # cos(pi * F * t + phase0 + sum(beta_k * cos(pi * 3**k * fm * t))), разложение Якоби-Ангера.
+    # Линии каждого тона свёртываются с уже накопленными; слабые отбрасываются сразу
+    shifts = np.zeros(1)
+    coefficients = np.ones(1, dtype=complex)
+    for k, beta in enumerate(indices):
+        n_max = int(np.ceil(abs(beta))) + 12
+        n = np.arange(-n_max, n_max + 1)
+        tone = jv(n, beta) * 1j ** n
+        strong = np.abs(tone) > tol
+        shifts, coefficients = _merge(
+            (shifts[:, None] + n[strong] * 3.0 ** k * freq_modulator).ravel(),
+            (coefficients[:, None] * tone[strong]).ravel(),
+            tol,
+        )
+
+    coefficients *= np.exp(1j * phase0) / 2
+    freqs = carrier + shifts
+    return np.concatenate([freqs, -freqs]), np.concatenate([coefficients, coefficients.conj()])
+
+
+def _merge(freqs, amps, tol):
+    keys, inverse = np.unique(np.round(freqs, 6), return_inverse=True)
+    merged = np.zeros(keys.size, dtype=complex)
+    np.add.at(merged, inverse.ravel(), amps)
+    keep = np.abs(merged) > tol
+    return keys[keep], merged[keep]
+
+
+def _merge_lines(freqs, amps, rate=None, tol=1e-6):
+    if rate is not None:
+        # Линии выше частоты Найквиста складываем так же, как это сделает БПФ
+        freqs = (freqs + rate / 2) % rate - rate / 2
+    freqs, amps = _merge(freqs, amps, tol)
+    return freqs, np.abs(amps)
+
+
+def analytic_spectrum(kind, freq_carrier, freq_modulator, harm_count=1, rate=None, tol=1e-6):
+    """Return sparse (frequencies, amplitudes) lines of one modulated signal.
+
+    ``rate`` is the sample rate in spectrum units (see ``sample_rate``); when
+    given, lines are aliased into the FFT band so the result matches the FFT
+    of the sampled signal bin for bin.
+    """
+    if kind == signal_engine.AM:
+        freqs, amps = _am_lines(freq_carrier, freq_modulator, harm_count)
+    elif kind == signal_engine.FM:
+        # sin(2 * pi * (fc * t + m(t))): несущая на 2 * fc, индексы 2 * pi * a_k
+        indices = 2 * np.pi * _modulator_coefficients(harm_count)
+        freqs, amps = _angle_lines(2 * freq_carrier, freq_modulator, indices, -np.pi / 2, tol / 10)
+    elif kind == signal_engine.PM:
+        freqs, amps = _angle_lines(freq_carrier, freq_modulator, _modulator_coefficients(harm_count), 0., tol / 10)
+    else:
+        raise ValueError(f"Нет аналитического спектра для модуляции {kind!r}")
+    return _merge_lines(freqs, amps, rate, tol)
+
+
+@lru_cache(maxsize=4)
+def _mixer(n, center_bin):
+    mixer = np.exp(-2j * np.pi * center_bin / n * np.arange(n))
+    mixer.flags.writeable = False
+    return mixer
+
+
+@lru_cache(maxsize=16)
+def _zoom_transform(n, f_min, f_max, points, rate):
+    # Предвычисления chirp-z зависят только от длины и окна, поэтому объект переиспользуется
+    from scipy.signal import ZoomFFT  # scipy.signal импортируется около секунды - только для zoom
+    return ZoomFFT(n, [f_min, f_max], points, fs=rate, endpoint=True)
+
+
+def _divisor_below(n, limit):
+    # Наибольший делитель n, не превосходящий limit
+    return next(d for d in range(min(limit, n), 0, -1) if n % d == 0)
+
+
+@lru_cache(maxsize=32)
+def rfft_axis(n, rate, two_sided=False):
+    axis = rfftfreq(n, 1 / rate)
+    if two_sided:
+        axis = np.concatenate([-axis[1:(n + 1) // 2][::-1], axis])
+    axis.flags.writeable = False
+    return axis
+
+
+class SpectrumService:
+    """Real-FFT magnitude spectra with cached frequency axes.
+
+    ``workers`` is passed to ``scipy.fft`` (-1 uses all cores for batches).
+    ``fast_length`` zero-pads the transform to the next 5-smooth length; it
+    is off by default because padding moves the bins off the rate / N grid
+    and spreads a line over neighbouring bins, so peak amplitudes drop.
+    """
+
+    def __init__(self, workers=-1, fast_length=False):
+        self.workers = workers
+        self.fast_length = fast_length
+
+    def length(self, n):
+        return next_fast_len(n, real=True) if self.fast_length else n
+
+    def spectrum(self, signal, t, two_sided=True):
+        signal = np.asarray(signal)
+        n = signal.shape[-1]
+        n_fft = self.length(n)
+        amplitudes = np.abs(rfft(signal, n=n_fft, axis=-1, workers=self.workers))
+        amplitudes /= n
+        if two_sided:
+            # Отрицательные частоты вещественного сигнала - зеркало положительных
+            amplitudes = np.concatenate([amplitudes[..., 1:(n_fft + 1) // 2][..., ::-1], amplitudes], axis=-1)
+        return rfft_axis(n_fft, sample_rate(t), two_sided), amplitudes
+
+    def batch(self, signals, t, window=None, two_sided=False):
+        # Строки одной длины (все гармоники точки атласа) - одним преобразованием по последней оси
+        signals = np.atleast_2d(signals)
+        if window is not None:
+            return self.zoom(signals, t, *window)
+        return self.spectrum(signals, t, two_sided)
+
+    def zoom(self, signal, t, f_min, f_max, points=None, method='czt'):
+        """Spectrum of the [f_min, f_max] window only.
+
+        ``points`` defaults to the native FFT resolution (rate / N). The
+        'czt' method evaluates the exact DFT on the window with a cached
+        chirp-z transform. 'decimate' mixes the window down to zero, low-pass
+        decimates it by a factor that divides N and transforms only the short
+        record, whose bins lie on the same rate / N grid; with ``points`` it
+        returns the nearest of those bins.
+        """
+        signal = np.asarray(signal)
+        n = signal.shape[-1]
+        rate = sample_rate(t)
+        if points is None:
+            # Бины обычного БПФ, попадающие в окно
+            freqs = np.arange(np.ceil(f_min * n / rate), np.floor(f_max * n / rate) + 1) * rate / n
+        else:
+            freqs = np.linspace(f_min, f_max, points)
+        f_min, f_max, points = freqs[0], freqs[-1], freqs.size
+
+        if method == 'czt':
+            transform = _zoom_transform(n, float(f_min), float(f_max), points, rate)
+            return freqs, np.abs(transform(signal, axis=-1)) / n
+        if method != 'decimate':
+            raise ValueError(f"Неизвестный метод {method!r}")
+
+        # Центр окна ставим на бин исходного БПФ, чтобы сетки частот совпадали
+        center_bin = int(round((f_min + f_max) / 2 * n / rate))
+        center = center_bin * rate / n
+        # Делитель N: тогда шаг децимированного БПФ без дополнения нулями ровно rate / N
+        factor = _divisor_below(n, max(1, int(rate / (2 * (f_max - f_min) or rate))))
+        mixed = signal * _mixer(n, center_bin) if center_bin else signal
+        if factor > 1:
+            from scipy.signal import decimate
+            mixed = decimate(mixed, factor, ftype='fir', axis=-1)
+        m = n // factor
+        amplitudes = np.abs(fft(mixed, axis=-1, workers=self.workers)) / m
+        bins = np.round((freqs - center) * n / rate).astype(int)
+        return center + bins * rate / n, amplitudes[..., bins % m]
+
+service = SpectrumService()
+
+
+def line_spectrum(components, t, analytic=True, window=None, signal=None):
+    """Spectrum of a sum of ``(kind, freq_carrier, freq_modulator, harm_count)`` components.
+
+    A single textbook component is computed analytically; composite signals
+    (e.g. FM + AM in quiz question 10) fall back to the FFT of their sum.
+    ``window`` limits the result to (f_min, f_max), ``signal`` is the sum if
+    it is already sampled on ``t``.
+    """
+    if analytic and len(components) == 1 and components[0][0] in ANALYTIC_KINDS:
+        frequencies, amplitudes = analytic_spectrum(*components[0], rate=sample_rate(t))
+        if window is not None:
+            visible = (frequencies >= window[0]) & (frequencies <= window[1])
+            frequencies, amplitudes = frequencies[visible], amplitudes[visible]
+        return frequencies, amplitudes
+    if signal is None:
+        signal = sum(signal_engine.modulate(kind, t, *params) for kind, *params in components)
+    if window is not None:
+        return service.zoom(signal, t, *window)
+    return service.spectrum(signal, t)
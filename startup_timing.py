@@ -0,0 +1,74 @@
+"""Startup timing: deferred imports, lazily built tabs and the first paint.
+
+The app imports this module first, so ``PROCESS_START`` is close to the
+start of the interpreter. ``load`` imports a heavy module on first use and
+times it, ``measure`` times any block (a tab built on first activation), and
+``watch_first_paint`` records when the main window is painted for the first
+time. ``report`` lists everything in milliseconds since start and marks the
+first paint against ``budget_ms``.
+"""
+import importlib
+import sys
+import time
+from contextlib import contextmanager
+
+from PyQt5.QtCore import QEvent, QObject, pyqtSignal
+
+PROCESS_START = time.perf_counter()
+
+
+class StartupTimer(QObject):
+    first_painted = pyqtSignal(float)
+
+    def __init__(self, budget_ms=1000, parent=None):
+        super().__init__(parent)
+        self.budget_ms = budget_ms
+        self.marks = []  # (название, мс от старта, длительность мс)
+        self.first_paint = None
+
+    def elapsed(self):
+        return (time.perf_counter() - PROCESS_START) * 1000
+
+    def mark(self, name):
+        self.marks.append((name, self.elapsed(), 0.0))
+
+    @contextmanager
+    def measure(self, name):
+        start = self.elapsed()
+        try:
+            yield
+        finally:
+            self.marks.append((name, start, self.elapsed() - start))
+
+    def load(self, module_name):
+        if module_name in sys.modules:
+            # import_module дождётся импорта, начатого в другом потоке (например, в пуле ComputeWorker)
+            return importlib.import_module(module_name)
+        with self.measure(f'import {module_name}'):
+            return importlib.import_module(module_name)
+
+    def watch_first_paint(self, widget):
+        widget.installEventFilter(self)
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Paint and self.first_paint is None:
+            self.first_paint = self.elapsed()
+            watched.removeEventFilter(self)
+            self.first_painted.emit(self.first_paint)
+        return False
+
+    @property
+    def over_budget(self):
+        return self.first_paint is not None and self.first_paint > self.budget_ms
+
+    def report(self):
+        lines = [f"{start:8.1f} мс  {name}" + (f" ({duration:.1f} мс)" if duration else "")
+                 for name, start, duration in sorted(self.marks, key=lambda mark: mark[1])]
+        if self.first_paint is not None:
+            verdict = "превышен" if self.over_budget else "в пределах"
+            lines.append(f"{self.first_paint:8.1f} мс  первая отрисовка окна "
+                         f"(бюджет {self.budget_ms} мс {verdict})")
+        return "\n".join(lines)
+
+
+timer = StartupTimer()
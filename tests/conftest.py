@@ -0,0 +1,16 @@
+import os
+import sys
+
+import pytest
+
+# Модули приложения лежат в корне репозитория
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Виджетам нужен QApplication; без дисплея - платформа offscreen
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+
+@pytest.fixture(scope='session')
+def app():
+    # Один QApplication на все тесты: после QCoreApplication его уже не создать
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
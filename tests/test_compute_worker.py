@@ -0,0 +1,86 @@
+import threading
+import time
+
+import pytest
+
+from compute_worker import ComputeWorker
+
+
+def collect(worker):
+    results, errors = [], []
+    worker.finished.connect(lambda key, result: results.append((key, result)))
+    worker.failed.connect(lambda key, message: errors.append((key, message)))
+    return results, errors
+
+
+def drain(app, worker, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while worker.pending() and time.monotonic() < deadline:
+        worker.wait(10)
+        app.processEvents()
+    app.processEvents()
+
+
+def test_inline_result_arrives_through_event_queue(app):
+    worker = ComputeWorker(threads=0)
+    results, _ = collect(worker)
+    worker.submit('spectrum', sum, [1, 2, 3])
+    assert results == []
+    app.processEvents()
+    assert results == [('spectrum', 6)]
+    assert (worker.submitted, worker.completed, worker.pending()) == (1, 1, 0)
+
+
+def test_newer_job_supersedes_older_one(app):
+    worker = ComputeWorker(threads=0)
+    results, _ = collect(worker)
+    worker.submit('scope1', lambda: 'old')
+    worker.submit('scope1', lambda: 'new')
+    worker.submit('scope2', lambda: 'other')
+    app.processEvents()
+    assert sorted(results) == [('scope1', 'new'), ('scope2', 'other')]
+    assert worker.cancelled == 1 and worker.dropped == 1
+
+
+def test_running_job_is_asked_to_stop(app):
+    worker = ComputeWorker(threads=2)
+    results, _ = collect(worker)
+    started = threading.Event()
+    stopped = []
+
+    def slow(cancelled):
+        started.set()
+        while not cancelled():
+            time.sleep(0.001)
+        stopped.append(True)
+        return 'stale'
+
+    worker.submit('bank', slow, cancellable=True)
+    assert started.wait(5)
+    worker.submit('bank', lambda: 'fresh')
+    drain(app, worker)
+    assert worker.wait(5000)
+    app.processEvents()
+    assert stopped == [True]
+    assert results == [('bank', 'fresh')]
+
+
+def test_failure_is_reported(app):
+    worker = ComputeWorker(threads=0)
+    results, errors = collect(worker)
+    worker.submit('atlas', lambda: 1 / 0)
+    app.processEvents()
+    assert results == []
+    assert errors and errors[0][0] == 'atlas' and 'ZeroDivisionError' in errors[0][1]
+
+
+@pytest.mark.parametrize('threads', [0, 2])
+def test_cancel_all_drops_pending_results(app, threads):
+    worker = ComputeWorker(threads=threads)
+    results, _ = collect(worker)
+    worker.submit('a', lambda: 1)
+    worker.submit('b', lambda: 2)
+    worker.cancel_all()
+    worker.wait(5000)
+    app.processEvents()
+    assert results == [] and worker.pending() == 0
@@ -0,0 +1,53 @@
+import pytest
+
+from dataflow import DataflowGraph
+
+
+@pytest.fixture
+def graph():
+    # Несущая и модулирующая -> модулированный сигнал -> спектр; несущая отдельно на график
+    graph = DataflowGraph()
+    graph.add_source('fc', 20)
+    graph.add_source('fm', 10)
+    graph.add_node('carrier', lambda fc: ('carrier', fc), ['fc'])
+    graph.add_node('modulated', lambda fc, fm: (fc, fm), ['fc', 'fm'])
+    graph.add_node('spectrum', lambda modulated: ('spectrum', modulated), ['modulated'])
+    return graph
+
+
+def test_first_update_computes_every_node(graph):
+    graph.update()
+    assert graph.get('spectrum') == ('spectrum', (20, 10))
+    assert graph.stats()['per_node'] == {'carrier': 1, 'modulated': 1, 'spectrum': 1}
+    assert graph.dirty_nodes() == []
+
+
+def test_setting_a_source_recomputes_only_downstream(graph):
+    graph.update()
+    assert graph.set('fm', 12)
+    assert sorted(graph.dirty_nodes()) == ['modulated', 'spectrum']
+    graph.update()
+    assert graph.stats()['per_node'] == {'carrier': 1, 'modulated': 2, 'spectrum': 2}
+    assert graph.avoided == 1
+    assert graph.get('modulated') == (20, 12)
+
+
+def test_unchanged_value_does_not_invalidate(graph):
+    graph.update()
+    assert not graph.set('fc', 20)
+    assert graph.dirty_nodes() == [] and graph.unchanged == 1
+
+
+def test_update_of_one_output_leaves_others_dirty(graph):
+    graph.update('carrier')
+    assert sorted(graph.dirty_nodes()) == ['modulated', 'spectrum']
+    graph.invalidate('carrier')
+    assert graph.get('carrier') == ('carrier', 20)
+    assert graph.computations == 2
+
+
+def test_graph_structure_errors(graph):
+    with pytest.raises(KeyError):
+        graph.add_node('figure', lambda x: x, ['missing'])
+    with pytest.raises(ValueError):
+        graph.add_source('fc')
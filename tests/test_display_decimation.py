@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from display_decimation import LTTB, MINMAX, decimate_for_display, lttb, minmax
+
+T = np.linspace(1, 3, 3000, endpoint=False)
+
+
+def am(t):
+    return (1 + 0.8 * np.cos(np.pi * 3 * t)) * np.cos(np.pi * 200 * t)
+
+
+@pytest.mark.parametrize('width', [100, 333, 700])
+def test_minmax_keeps_envelope_of_every_column(width):
+    y = am(T)
+    xd, yd = minmax(T, y, width)
+    bucket = -(-T.size // width)
+    assert yd.size == 2 * width
+    for column in range(width):
+        # Столбцы за концом сигнала дополнены последним отсчетом
+        chunk = y[column * bucket:(column + 1) * bucket] if column * bucket < y.size else y[-1:]
+        pair = yd[2 * column:2 * column + 2]
+        assert sorted(pair) == [chunk.min(), chunk.max()]
+    # Точки идут в исходном порядке по времени, глобальные экстремумы сохранены
+    assert np.all(np.diff(xd) >= 0)
+    assert yd.max() == y.max() and yd.min() == y.min()
+
+
+def test_minmax_returns_short_signals_unchanged():
+    x, y = T[:100], am(T[:100])
+    xd, yd = minmax(x, y, 50)
+    assert xd is x and yd is y
+
+
+def test_lttb_keeps_end_points_and_threshold():
+    y = am(T)
+    xd, yd = lttb(T, y, 200)
+    assert xd.size == 200
+    assert (xd[0], xd[-1]) == (T[0], T[-1])
+    assert np.all(np.diff(xd) > 0)
+
+
+def test_decimate_for_display_dispatch():
+    y = am(T)
+    assert decimate_for_display(T, y, 100, MINMAX)[1].size == 200
+    assert decimate_for_display(T, y, 100, LTTB)[1].size == 200
+    assert decimate_for_display(T, y, 100, None)[1] is y
@@ -0,0 +1,91 @@
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from emitter_catalog import HEADER_BYTES, EmitterCatalog, write_catalog
+from emitter_registry import EmitterRegistry
+
+RECORDS = [
+    {"Частота": 540, "Модуляция": "ЧМ", "Текст": "Ель, прием, я Ольха", "Пеленг": 120, "is_enemy": False},
+    {"Частота": 60, "Модуляция": "АМ", "Текст": "", "Пеленг": 90},
+    {"Частота": 450, "Модуляция": "ЧМ", "Текст": "Roger roger", "Пеленг": 40, "is_enemy": True},
+    {"Частота": 450.5, "Модуляция": "ОБП", "Текст": "Enemy spotted", "Пеленг": 40.5, "is_enemy": True,
+     "Полоса": 3.0},
+]
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    path = str(tmp_path / 'scenario.rrtrcat')
+    write_catalog(path, RECORDS)
+    return EmitterCatalog(path)
+
+
+def test_records_round_trip(catalog):
+    assert len(catalog) == 4
+    assert catalog.modulations == ['АМ', 'ЧМ', 'ФМ', 'ОБП']
+    registry = EmitterRegistry.from_records(RECORDS)
+    for row in range(4):
+        assert catalog.record(row) == registry.record(row)
+    assert catalog.text(1) == ''
+
+
+def test_registry_uses_mapped_columns_without_building_indexes(catalog):
+    registry = catalog.registry()
+    assert len(registry) == 4
+    for name in ('frequency', 'bandwidth', 'modulation', 'bearing', 'is_enemy'):
+        assert np.shares_memory(getattr(registry, name), catalog.emitters)
+    assert registry._bands is None and registry._frequency_order is None
+
+    expected = EmitterRegistry.from_records(RECORDS)
+    assert registry.overlapping(449, 451).tolist() == expected.overlapping(449, 451).tolist() == [2, 3]
+    assert registry._bands is not None
+    assert registry.in_passband(451.8, 0.1, 'ОБП').tolist() == [3]
+    assert registry.find(540, 'ЧМ') == 0
+
+
+def test_registry_moves_columns_to_memory_on_append(catalog):
+    registry = catalog.registry()
+    registry.overlapping(0, 3000)
+    row = registry.append(1200, 'ФМ', 'Молот', 225)
+    assert not np.shares_memory(registry.frequency, catalog.emitters)
+    assert registry.record(row)["Текст"] == 'Молот'
+    assert registry.record(0) == catalog.record(0)
+    assert registry.overlapping(1199, 1201).tolist() == [row]
+    registry.set_text(2, 'R#g%r')
+    assert registry.texts[2] == 'R#g%r' and catalog.text(2) == 'Roger roger'
+
+
+def test_empty_catalog(tmp_path):
+    path = str(tmp_path / 'empty.rrtrcat')
+    write_catalog(path, [])
+    registry = EmitterCatalog(path).registry()
+    assert len(registry) == 0 and registry.overlapping(0, 3000).size == 0
+    registry.append(100, 'АМ', 'text', 0)
+    assert registry.overlapping(99, 101).tolist() == [0]
+
+
+def test_other_version_is_rejected(catalog, tmp_path):
+    header = dict(catalog.header, version=catalog.header['version'] + 1)
+    path = str(tmp_path / 'future.rrtrcat')
+    with open(catalog.path, 'rb') as source, open(path, 'wb') as target:
+        source.seek(HEADER_BYTES)
+        target.write(json.dumps(header).encode('utf-8').ljust(HEADER_BYTES, b'\0') + source.read())
+    with pytest.raises(ValueError):
+        EmitterCatalog(path)
+
+
+def test_converter_command_line(tmp_path):
+    source = tmp_path / 'scenario.json'
+    source.write_text(json.dumps(RECORDS, ensure_ascii=False), encoding='utf-8')
+    target = tmp_path / 'scenario.rrtrcat'
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, os.path.join(root, 'emitter_catalog.py'), str(source), str(target)],
+                            capture_output=True, text=True, cwd=root, check=True)
+    assert "'count': 4" in result.stdout
+    catalog = EmitterCatalog(str(target))
+    assert [catalog.record(row)["Текст"] for row in range(4)] == [data["Текст"] for data in RECORDS]
@@ -0,0 +1,45 @@
+import numpy as np
+
+from emitter_registry import EmitterRegistry
+
+
+def random_columns(rng, count):
+    return (np.round(rng.uniform(20, 2000, count), 1), rng.choice(['АМ', 'ЧМ', 'ФМ', 'ОМ'], count).tolist(),
+            ['т'] * count, rng.uniform(0, 360, count), rng.random(count) < 0.5,
+            rng.choice([0.0, 0.025, 0.2, 5.0], count))
+
+
+def test_indexes_merged_on_extend_match_rebuilt():
+    rng = np.random.default_rng(1)
+    chunks = [random_columns(rng, count) for count in (500, 1, 0, 300, 700)]
+    merged = EmitterRegistry(modulations=('АМ', 'ЧМ'))
+    merged.extend_columns(*chunks[0])
+    # Индексы построены до добавлений - дальше они только дополняются
+    merged.frequency_order(), merged.bands(), merged.by_modulation('АМ')
+    for columns in chunks[1:]:
+        merged.extend_columns(*columns)
+
+    rebuilt = EmitterRegistry(modulations=('АМ', 'ЧМ'))
+    for columns in chunks:
+        rebuilt.extend_columns(*columns)
+
+    np.testing.assert_array_equal(merged.frequency_order(), rebuilt.frequency_order())
+    for low, high in [(20, 2000), (100, 100.5), (999.9, 1000.1), (1500, 1520), (0, 19)]:
+        np.testing.assert_array_equal(merged.overlapping(low, high), rebuilt.overlapping(low, high))
+        np.testing.assert_array_equal(merged.in_range(low, high, 'ЧМ'), rebuilt.in_range(low, high, 'ЧМ'))
+    for modulation in ('АМ', 'ЧМ', 'ФМ', 'ОМ'):
+        np.testing.assert_array_equal(merged.by_modulation(modulation), rebuilt.by_modulation(modulation))
+
+
+def test_overlapping_matches_scan():
+    rng = np.random.default_rng(2)
+    registry = EmitterRegistry()
+    registry.extend_columns(*random_columns(rng, 2000))
+    registry.bands()
+    for count in (1, 2000, 7, 300, 300, 0, 50):
+        registry.extend_columns(*random_columns(rng, count))
+    size = len(registry)
+    half = registry.bandwidth[:size] / 2
+    for low, high in [(300, 310), (1000, 1000), (20, 25)]:
+        expected = np.flatnonzero((registry.frequency[:size] - half <= high) & (registry.frequency[:size] + half >= low))
+        np.testing.assert_array_equal(registry.overlapping(low, high), expected)
@@ -0,0 +1,65 @@
+import numpy as np
+
+from frame_bank import FrameBank
+
+T = np.linspace(1, 3, 300, endpoint=False)
+
+
+def carrier(fc):
+    return lambda t: np.cos(np.pi * fc * t)
+
+
+def test_frames_are_shifted_copies_of_the_signal():
+    bank = FrameBank(T, frames=10, step=0.01, chunk=4)
+    bank.reset(carrier(5))
+    np.testing.assert_allclose(bank.frame(7), np.cos(np.pi * 5 * (T + 0.07)))
+    # Заполняется только блок запрошенного кадра
+    assert bank.filled.tolist() == [False] * 4 + [True] * 4 + [False] * 2
+    np.testing.assert_array_equal(bank.frame(17), bank.frame(7))
+
+
+def test_slider_change_invalidates_frames():
+    bank = FrameBank(T, frames=10, chunk=5)
+    bank.reset(carrier(5))
+    assert bank.fill()
+    assert bank.complete
+    # Сдвиг ползунка несущей: новый сигнал, старые кадры не должны использоваться
+    bank.reset(carrier(8))
+    assert not bank.filled.any()
+    np.testing.assert_allclose(bank.frame(3), np.cos(np.pi * 8 * (T + 0.03)))
+
+
+def test_invalidate_refills_with_current_signal():
+    calls = []
+
+    def signal(t):
+        calls.append(t.shape[0])
+        return np.sin(t)
+
+    bank = FrameBank(T, frames=6, chunk=3)
+    bank.reset(signal)
+    bank.fill()
+    bank.frame(0)
+    assert calls == [3, 3]
+    bank.invalidate()
+    bank.frame(0)
+    assert calls == [3, 3, 3]
+
+
+def test_fill_can_be_cancelled():
+    bank = FrameBank(T, frames=10, chunk=2)
+    bank.reset(carrier(5))
+    assert not bank.fill(cancelled=lambda: bank.filled.sum() >= 4)
+    assert bank.filled.sum() == 4
+
+
+def test_reset_after_load_does_not_write_into_loaded_frames():
+    frames = np.zeros((4, T.size))
+    frames.flags.writeable = False
+    bank = FrameBank(T, frames=4)
+    bank.load(frames)
+    assert bank.complete and bank.frame(2) is not None
+    bank.reset(carrier(5))
+    bank.fill()
+    assert not frames.any()
+    np.testing.assert_allclose(bank.frame(1), np.cos(np.pi * 5 * (T + 0.01)))
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from emitter_registry import EmitterRegistry
+from frequency_sweep import FrequencySweep
+
+
+def run(sweep):
+    sweep.start()
+    while sweep.is_running():
+        sweep.tick()
+
+
+@pytest.mark.parametrize('step', [1.0, 7.0, 1980.0, 3000.0])
+def test_steps_cover_range(app, step):
+    bands = []
+    sweep = FrequencySweep(lambda low, high: bands.append((low, high)) or [], 20, 2000, step=step, dwell=0)
+    run(sweep)
+    bands = np.array(bands)
+    assert len(bands) == sweep.steps
+    assert bands[0, 0] <= 20 and bands[-1, 1] >= 2000
+    assert (bands[1:, 0] <= bands[:-1, 1]).all()  # Полосы соседних шагов смыкаются
+
+
+def test_top_of_range_found_when_step_does_not_divide_it(app):
+    registry = EmitterRegistry()
+    frequencies = [20.0, 1994.0, 1998.0, 2000.0]
+    registry.extend_columns(frequencies, ['ЧМ'] * 4, ['т'] * 4, [0] * 4, [False] * 4, [0.025] * 4)
+    found = []
+    sweep = FrequencySweep(lambda low, high: registry.overlapping(low, high), 20, 2000, step=7, dwell=0)
+    sweep.detected.connect(lambda frequency, rows: found.extend(rows.tolist()))
+    finished = []
+    sweep.finished.connect(finished.append)
+    run(sweep)
+    assert sorted(found) == [0, 1, 2, 3]
+    assert finished == [True]
+    assert sweep.frequency == 2000
@@ -0,0 +1,107 @@
+import os
+
+import pytest
+from PyQt5.QtCore import QPointF, QSize
+from PyQt5.QtGui import QColor, QImage
+
+from map_tiles import MapView, TilePyramid, build_pyramid, pyramid_current
+
+
+@pytest.fixture
+def source(tmp_path, app):
+    # Горизонтальный градиент: цвет пикселя однозначно задаёт его столбец
+    image = QImage(600, 300, QImage.Format_RGB32)
+    for x in range(600):
+        for y in (0, 150, 299):
+            image.setPixelColor(x, y, QColor(x % 256, x // 256 * 100, y % 256))
+    path = str(tmp_path / 'map.png')
+    image.save(path)
+    return path
+
+
+@pytest.fixture
+def pyramid(source, tmp_path):
+    directory = str(tmp_path / 'tiles')
+    build_pyramid(source, directory, tile_size=128)
+    return directory
+
+
+def test_levels_halve_until_one_tile(source, tmp_path):
+    manifest = build_pyramid(source, str(tmp_path / 'tiles'), tile_size=128)
+    # 600x300 -> 300x150 -> 150x75 -> 75x38
+    assert (manifest['width'], manifest['height'], manifest['levels']) == (600, 300, 4)
+    tiles = TilePyramid(str(tmp_path / 'tiles'))
+    assert [tiles.level_size(level) for level in range(4)] == [(600, 300), (300, 150), (150, 75), (75, 38)]
+    assert sorted(os.listdir(tmp_path / 'tiles' / '0')) == sorted(
+        f'{x}_{y}.png' for x in range(5) for y in range(3))
+    assert os.listdir(tmp_path / 'tiles' / '3') == ['0_0.png']
+
+
+def test_level_zero_tiles_are_exact_crops(source, pyramid):
+    original = QImage(source)
+    tile = QImage(os.path.join(pyramid, '0', '4_2.png'))
+    # Крайний тайл обрезан по краю карты
+    assert (tile.width(), tile.height()) == (600 - 4 * 128, 300 - 2 * 128)
+    assert tile.pixelColor(10, 299 - 256) == original.pixelColor(4 * 128 + 10, 299)
+    assert QImage(os.path.join(pyramid, '0', '1_1.png')).pixelColor(0, 150 - 128) == original.pixelColor(128, 150)
+
+
+def test_jpeg_source_is_read_once_into_all_strips(source, tmp_path):
+    jpeg = str(tmp_path / 'map.jpg')
+    QImage(source).save(jpeg, quality=95)
+    manifest = build_pyramid(jpeg, str(tmp_path / 'jpeg_tiles'), tile_size=64)
+    assert manifest['levels'] == 5
+    for y in range(5):
+        assert not QImage(os.path.join(tmp_path, 'jpeg_tiles', '0', f'9_{y}.png')).isNull()
+
+
+def test_pyramid_current_follows_source(source, pyramid):
+    assert pyramid_current(source, pyramid, tile_size=128)
+    assert not pyramid_current(source, pyramid, tile_size=256)
+    os.utime(source, (0, 0))
+    assert not pyramid_current(source, pyramid, tile_size=128)
+
+
+def test_unreadable_source_raises(tmp_path):
+    path = tmp_path / 'broken.jpg'
+    path.write_bytes(b'not an image')
+    with pytest.raises(ValueError):
+        build_pyramid(str(path), str(tmp_path / 'tiles'))
+
+
+def test_tile_cache_evicts_least_recently_used(pyramid):
+    # Полный тайл 128x128 ARGB - 64 КБ: в кэш помещаются два
+    tiles = TilePyramid(pyramid, memory_limit=2 * 128 * 128 * 4)
+    first, second, third = (0, 0, 0), (0, 1, 0), (0, 2, 0)
+    tiles.tile(*first)
+    tiles.tile(*second)
+    tiles.tile(*first)
+    tiles.tile(*third)
+    assert (tiles.hits, tiles.misses, tiles.evictions) == (1, 3, 1)
+    assert list(tiles.tiles) == [first, third]
+    assert tiles.cached_bytes <= tiles.memory_limit
+    assert tiles.tile(9, 0, 0) is None
+
+
+def test_view_level_matches_scale(pyramid):
+    view = MapView(TilePyramid(pyramid))
+    for scale, level in ((4.0, 0), (1.0, 0), (0.6, 0), (0.5, 1), (0.3, 1), (0.25, 2), (0.01, 3)):
+        view.scale = scale
+        assert view.level() == level
+
+
+def test_view_zoom_keeps_station_and_clamps(pyramid):
+    view = MapView(TilePyramid(pyramid), station=(100, 50), max_scale=2.0)
+    view.fit(QSize(300, 150))
+    assert view.scale == 0.5 and view.min_scale == 0.125
+    view.pan(40, -20)
+    station_on_screen = (view.station - view.center) * view.scale
+    view.zoom(3)
+    assert view.scale == 1.5
+    assert (view.station - view.center) * view.scale == station_on_screen
+    view.zoom(10)
+    assert view.scale == 2.0
+    view.zoom(1e-3)
+    assert view.scale == 0.125
+    view.recenter()
+    assert view.center == QPointF(100, 50)
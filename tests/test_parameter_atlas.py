@@ -0,0 +1,88 @@
+import os
+
+import numpy as np
+import pytest
+
+import signal_engine
+from frame_bank import FrameBank
+from parameter_atlas import ParameterAtlas, compute_base, compute_block
+
+T = np.linspace(1, 3, 600, endpoint=False)
+GRID = dict(carriers=[10, 20], modulators=[5], harmonics=[1, 2], frames=4)
+
+
+def build(atlas):
+    atlas.store_base(*compute_base(atlas.header))
+    for block in atlas.blocks():
+        atlas.store_block(*compute_block(atlas.header, *block))
+    atlas.flush()
+
+
+def test_new_file_starts_empty(tmp_path):
+    atlas = ParameterAtlas(str(tmp_path / 'atlas.bin'), T, **GRID)
+    assert atlas.progress() == (0, 3 * 2 * 1 * 2)
+    assert len(atlas.blocks()) == 3 * 2
+    assert atlas.spectrum(signal_engine.AM, 10, 5, 1) is None
+
+
+def test_matching_header_reuses_built_file(tmp_path):
+    path = str(tmp_path / 'atlas.bin')
+    first = ParameterAtlas(path, T, **GRID)
+    build(first)
+    assert first.complete
+    expected = np.array(first.modulated_frames(signal_engine.FM, 20, 5, 2))
+    modified = os.path.getmtime(path)
+    del first
+
+    again = ParameterAtlas(path, T, **GRID)
+    assert again.complete and again.blocks() == []
+    np.testing.assert_array_equal(again.modulated_frames(signal_engine.FM, 20, 5, 2), expected)
+    assert os.path.getmtime(path) == modified
+
+
+@pytest.mark.parametrize('change', [dict(harmonics=[1, 2, 3]), dict(frames=5), dict(analytic=False)])
+def test_changed_grid_rebuilds_file(tmp_path, change):
+    path = str(tmp_path / 'atlas.bin')
+    build(ParameterAtlas(path, T, **GRID))
+    atlas = ParameterAtlas(path, T, **dict(GRID, **change))
+    assert atlas.progress()[0] == 0
+    assert atlas.header == atlas._read_header()
+
+
+def test_truncated_file_is_rebuilt(tmp_path):
+    path = str(tmp_path / 'atlas.bin')
+    build(ParameterAtlas(path, T, **GRID))
+    with open(path, 'r+b') as file:
+        file.truncate(os.path.getsize(path) // 2)
+    assert ParameterAtlas(path, T, **GRID).progress()[0] == 0
+
+
+def test_frames_match_frame_bank(tmp_path):
+    atlas = ParameterAtlas(str(tmp_path / 'atlas.bin'), T, **GRID)
+    build(atlas)
+    bank = FrameBank(T, frames=4, step=0.01)
+    bank.reset(lambda t: signal_engine.modulate(signal_engine.PM, t, 20, 5, 2))
+    frames = atlas.modulated_frames(signal_engine.PM, 20, 5, 2)
+    assert frames.shape == (4, T.size)
+    for k in range(4):
+        # float16 в файле: погрешность около 1e-3 амплитуды
+        np.testing.assert_allclose(frames[k], bank.frame(k), atol=2e-3)
+    assert atlas.index(freq_carrier=15) is None
+
+
+def test_step_must_be_a_multiple_of_grid_step(tmp_path):
+    with pytest.raises(ValueError):
+        ParameterAtlas(str(tmp_path / 'atlas.bin'), T, step=0.005, **dict(GRID, frames=2))
+
+
+def test_fft_atlas_matches_analytic_lines(tmp_path):
+    fft = ParameterAtlas(str(tmp_path / 'fft.bin'), T, analytic=False, **GRID)
+    lines = ParameterAtlas(str(tmp_path / 'lines.bin'), T, **GRID)
+    block = (signal_engine.AM, 20, 5)
+    fft.store_block(*compute_block(fft.header, *block))
+    lines.store_block(*compute_block(lines.header, *block))
+    for harm_count in GRID['harmonics']:
+        frequencies, amplitudes = fft.spectrum(signal_engine.AM, 20, 5, harm_count)
+        expected_frequencies, expected = lines.spectrum(signal_engine.AM, 20, 5, harm_count)
+        index = np.searchsorted(frequencies, expected_frequencies)
+        np.testing.assert_allclose(amplitudes[index], expected, rtol=1e-4)
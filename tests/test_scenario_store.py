@@ -0,0 +1,131 @@
+import sqlite3
+import time
+
+import numpy as np
+import pytest
+
+from emitter_registry import EmitterRegistry
+from scenario_store import LazyEmitters, ScenarioStore, StoreWriter, connect
+
+RECORDS = [
+    {"Частота": 540, "Модуляция": "ЧМ", "Текст": "Ель", "Пеленг": 120, "is_enemy": False},
+    {"Частота": 60, "Модуляция": "АМ", "Текст": "Ольха", "Пеленг": 90, "is_enemy": False},
+    {"Частота": 450, "Модуляция": "ЧМ", "Текст": "Roger", "Пеленг": 40, "is_enemy": True},
+    {"Частота": 450.5, "Модуляция": "ФМ", "Текст": "Enemy", "Пеленг": 40, "is_enemy": True, "Полоса": 2.0},
+]
+
+
+def count(path, table):
+    connection = sqlite3.connect(path)
+    try:
+        return connection.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+    finally:
+        connection.close()
+
+
+@pytest.fixture
+def table(tmp_path):
+    path = str(tmp_path / 'writer.db')
+    connection = connect(path)
+    connection.execute('CREATE TABLE items (value INTEGER)')
+    connection.close()
+    return path
+
+
+def test_writer_commits_in_batches(table):
+    writer = StoreWriter(table, batch=3, interval=10)
+    writer.start()
+    for value in range(7):
+        writer.put('INSERT INTO items (value) VALUES (?)', (value,))
+    writer.flush()
+    # Пакеты по batch операций; flush закрывает последний неполный
+    assert (writer.written, writer.batches) == (7, 3)
+    assert count(table, 'items') == 7
+    writer.stop()
+    assert not writer.is_alive()
+
+
+def test_writer_commits_after_interval_without_flush(table):
+    writer = StoreWriter(table, batch=1000, interval=0.05)
+    writer.start()
+    writer.put('INSERT INTO items (value) VALUES (?)', (1,))
+    deadline = time.monotonic() + 5
+    while count(table, 'items') == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert count(table, 'items') == 1 and writer.batches == 1
+    writer.stop()
+
+
+def test_writer_survives_failed_batch(table):
+    writer = StoreWriter(table, batch=10, interval=10)
+    writer.start()
+    writer.put('INSERT INTO missing (value) VALUES (?)', (1,))
+    writer.flush()
+    assert 'missing' in writer.error and writer.written == 0
+    writer.put('INSERT INTO items (value) VALUES (?)', (2,))
+    writer.flush()
+    assert writer.written == 1 and count(table, 'items') == 1
+    writer.stop()
+
+
+def test_reopened_store_keeps_scenario_and_results(tmp_path):
+    path = str(tmp_path / 'scenarios.db')
+    store = ScenarioStore(path)
+    scenario = store.create_scenario('Учебный', RECORDS)
+    (row,) = [row for row in store.load_band(scenario, 450, 451) if row[3] == 'ЧМ']
+    store.record_intercept(scenario, row[0], 450, 'ЧМ')
+    store.record_jamming(scenario, row[0], 450, 'ЧМ', 'R#g%r')
+    store.close()
+
+    store = ScenarioStore(path)
+    try:
+        assert store.scenario('Учебный') == scenario and store.scenario('Другой') is None
+        assert store.count(scenario) == 4 and store.max_bandwidth(scenario) == 2.0
+        texts = {emitter: text for emitter, *_, text in store.load_band(scenario, 0, 3000)}
+        assert texts[row[0]] == 'R#g%r'
+        assert count(path, 'intercepts') == 1 and count(path, 'jamming') == 1
+        # Выборка по диапазону: low <= частота < high, в порядке сценария
+        assert [r[1] for r in store.load_band(scenario, 60, 450.5)] == [60, 450]
+    finally:
+        store.close()
+
+
+@pytest.fixture
+def large_store(tmp_path):
+    rng = np.random.default_rng(0)
+    records = [{"Частота": float(f), "Модуляция": "АМ", "Текст": str(i), "Пеленг": 0.0, "Полоса": 0.1}
+               for i, f in enumerate(np.round(rng.uniform(20, 2000, 2000), 1))]
+    records.append({"Частота": 1005.0, "Модуляция": "ЧМ", "Текст": "wide", "Пеленг": 0.0, "Полоса": 30.0})
+    store = ScenarioStore(str(tmp_path / 'large.db'))
+    scenario = store.create_scenario('Большой', records)
+    yield store, scenario, records
+    store.close()
+
+
+def test_lazy_emitters_load_only_touched_chunks(large_store):
+    store, scenario, records = large_store
+    registry = EmitterRegistry()
+    loader = LazyEmitters(store, scenario, registry, chunk=10.0)
+    assert loader.total == len(records) and loader.margin == 15.0
+
+    loader.ensure(500, 501)
+    # Запас в половину наибольшей полосы: куски 480-520
+    assert loader.loaded == set(range(48, 52))
+    expected = [r for r in records if 480 <= r["Частота"] < 520]
+    assert sorted(registry.frequency[:len(registry)]) == sorted(r["Частота"] for r in expected)
+
+    size = len(registry)
+    loader.ensure(495, 504)
+    assert len(registry) == size
+
+
+def test_lazy_emitters_find_wide_band_from_neighbour_chunk(large_store):
+    store, scenario, _ = large_store
+    registry = EmitterRegistry()
+    loader = LazyEmitters(store, scenario, registry, chunk=10.0)
+    loader.ensure(1018, 1019)
+    rows = registry.bands().overlapping(1018, 1019)
+    assert 'wide' in [registry.texts[row] for row in rows]
+    # Идентификаторы строк - ключи базы, по ним пишутся перехваты
+    (wide,) = [row for row in rows if registry.texts[row] == 'wide']
+    assert store.load_band(scenario, 1005, 1005.01)[-1][0] == registry.ids[wide]
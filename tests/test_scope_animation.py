@@ -0,0 +1,60 @@
+import numpy as np
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+from matplotlib.figure import Figure
+
+from scope_animation import ScopeAnimator
+
+
+class Widget:
+    def __init__(self, visible=True):
+        self.visible = visible
+        self.updates = 0
+
+    def isVisible(self):
+        return self.visible
+
+    def update(self):
+        self.updates += 1
+
+
+def test_frame_counter_wraps_and_drives_all_scopes(app):
+    animator = ScopeAnimator(frames=3)
+    seen = []
+    widget = Widget()
+    animator.add_widget_scope(widget, seen.append)
+    for _ in range(5):
+        animator._tick()
+    assert seen == [0, 1, 2, 0, 1]
+    assert widget.updates == 5
+    assert animator.frame == 2
+
+
+def test_hidden_scopes_are_skipped(app):
+    animator = ScopeAnimator(frames=10)
+    shown, hidden = [], []
+    animator.add_widget_scope(Widget(), shown.append)
+    animator.add_widget_scope(Widget(visible=False), hidden.append)
+    animator._tick()
+    animator._tick()
+    assert shown == [0, 1] and hidden == []
+
+
+def test_matplotlib_scope_blits_line_over_cached_background(app):
+    canvas = FigureCanvasQTAgg(Figure(figsize=(3, 2)))
+    ax = canvas.figure.add_subplot()
+    x = np.linspace(0, 1, 50)
+    line, = ax.plot(x, np.zeros_like(x))
+    ax.set_ylim(-1, 1)
+    canvas.show()
+
+    animator = ScopeAnimator(frames=4)
+    animator.add_scope(canvas, ax, line, lambda frame: line.set_ydata(np.sin(x + frame)))
+    animator._tick()
+    scope = animator.scopes[0]
+    assert scope.background is not None
+    assert line.get_animated()
+    np.testing.assert_allclose(line.get_ydata(), np.sin(x))
+
+    animator.clear()
+    assert animator.scopes == [] and not line.get_animated()
+    canvas.close()
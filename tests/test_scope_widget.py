@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from scope_widget import PhosphorScopeWidget, ScopeWidget
+
+X = np.linspace(0, 1, 1000)
+
+
+@pytest.fixture
+def scope(app):
+    widget = PhosphorScopeWidget(decay=0.5, gain=0.25)
+    widget.resize(400, 300)
+    widget.set_y_range(-1, 1)
+    return widget
+
+
+def lit_rows(widget):
+    return np.flatnonzero(widget.intensity.any(axis=1))
+
+
+def test_single_trace_lights_one_row(scope):
+    scope.add_traces(X, np.zeros_like(X))
+    rect = scope.plot_rect()
+    assert scope.intensity.shape == (int(rect.height()), int(rect.width()))
+    (row,) = lit_rows(scope)
+    np.testing.assert_allclose(scope.intensity[row], 0.25)
+    assert scope.traces == 1
+    assert scope.pixels[row, 0] == int(0.25 * 255)
+
+
+def test_repeated_traces_accumulate_with_decay(scope):
+    for _ in range(3):
+        scope.add_traces(X, np.zeros_like(X))
+    row = lit_rows(scope)[0]
+    np.testing.assert_allclose(scope.intensity[row], 0.25 * (1 + 0.5 + 0.25))
+
+
+def test_batch_matches_sequential_traces(scope, app):
+    traces = np.stack([np.sin(2 * np.pi * X + phase) * 0.8 for phase in (0.0, 1.0, 2.0)])
+    sequential = PhosphorScopeWidget(decay=0.5, gain=0.25)
+    sequential.resize(400, 300)
+    sequential.set_y_range(-1, 1)
+    for trace in traces:
+        sequential.add_traces(X, trace)
+    scope.add_traces(X, traces)
+    np.testing.assert_allclose(scope.intensity, sequential.intensity, atol=1e-6)
+    assert scope.traces == sequential.traces == 3
+
+
+def test_brightness_saturates_and_old_traces_fade(scope):
+    # Установившаяся яркость gain / (1 - decay) выше единицы
+    scope.gain = 0.75
+    for _ in range(20):
+        scope.add_traces(X, np.full_like(X, 0.5))
+    bright = lit_rows(scope)[0]
+    assert scope.pixels[bright, 10] == 255
+    for _ in range(20):
+        scope.add_traces(X, np.full_like(X, -0.5))
+    assert scope.intensity[bright].max() < 1e-5
+
+
+def test_range_change_and_clear_reset_the_buffer(scope):
+    scope.add_traces(X, np.zeros_like(X))
+    scope.set_y_range(-2, 2)
+    scope.add_traces(X, np.zeros_like(X))
+    np.testing.assert_allclose(scope.intensity.max(), 0.25)
+    scope.clear()
+    assert not scope.intensity.any() and not scope.pixels.any() and scope.traces == 0
+
+
+def test_plain_scope_polygon_follows_data(app):
+    widget = ScopeWidget()
+    widget.resize(400, 300)
+    widget.set_data(X, np.sin(X))
+    widget.grab()
+    # Для отрисовки след прорежен до пары точек на столбец пикселей
+    width = int(widget.plot_rect().width())
+    assert widget._points.shape == (2 * width, 2)
@@ -0,0 +1,52 @@
+import warnings
+
+import numpy as np
+import pytest
+
+import signal_engine
+import spectrum
+from signal_engine import AliasingWarning, HarmonicSynthesizer
+
+
+def test_harmonic_frequencies_are_half_of_cosine_argument():
+    # cos(pi * 3**k * f * t) совершает 3**k * f / 2 периодов в секунду
+    synthesizer = HarmonicSynthesizer()
+    assert synthesizer.harmonic_frequencies(10, 4).tolist() == [5, 15, 45, 135]
+
+
+def test_nyquist_boundary():
+    synthesizer = HarmonicSynthesizer(fs=1000)
+    # 3**4 * 10 / 2 = 405 МГц - ниже 500, наложения нет
+    assert synthesizer.aliased_harmonics(10, 5) == []
+    # 3**4 * 12.5 / 2 = 506.25 МГц - выше 500
+    assert synthesizer.aliased_harmonics(12.5, 5) == [4]
+    # Ровно на частоте Найквиста - ещё не наложение
+    assert synthesizer.aliased_harmonics(1000 / 81, 5) == []
+
+
+def test_synthesize_warns_only_above_nyquist():
+    synthesizer = HarmonicSynthesizer(fs=1000)
+    t = np.linspace(1, 3, 2000, endpoint=False)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', AliasingWarning)
+        synthesizer.synthesize(t, 10, 5)
+    with pytest.warns(AliasingWarning):
+        synthesizer.synthesize(t, 12.5, 5)
+
+
+def test_app_grid_rate_matches_spectrum_folding():
+    # Сетка приложения: 3000 отсчётов на [1, 3) - 1500 отсчётов в секунду, Найквист 750 МГц
+    t = np.linspace(1, 3, 3000, endpoint=False)
+    synthesizer = HarmonicSynthesizer(fs=signal_engine.grid_rate(t))
+    assert synthesizer.fs == pytest.approx(1500)
+    # 3**4 * 15 / 2 = 607.5 МГц - ниже 750
+    assert synthesizer.aliased_harmonics(15, 5) == []
+
+    rate = spectrum.sample_rate(t)
+    for freq_modulator in range(1, 31):
+        for harm_count in range(1, 6):
+            exact, _ = spectrum.analytic_spectrum(signal_engine.AM, 1, freq_modulator, harm_count)
+            folded, _ = spectrum.analytic_spectrum(signal_engine.AM, 1, freq_modulator, harm_count, rate=rate)
+            # Предупреждение выдаётся ровно тогда, когда БПФ сетки t сложит боковые линии
+            folds = not np.array_equal(np.sort(exact), np.sort(folded))
+            assert bool(synthesizer.aliased_harmonics(freq_modulator, harm_count)) == folds
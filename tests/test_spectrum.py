@@ -0,0 +1,64 @@
+import numpy as np
+
+import signal_engine
+import spectrum
+
+
+def am_signal(n):
+    t = np.linspace(1, 3, n, endpoint=False)
+    return t, signal_engine.modulate(signal_engine.AM, t, 20, 25)
+
+
+def test_spectrum_keeps_native_grid_for_non_smooth_length():
+    # 3001 отсчёт: без дополнения нулями бины остаются на сетке rate / N, пик несущей - 0.5
+    t, x = am_signal(3001)
+    freqs, amps = spectrum.service.spectrum(x, t)
+    assert freqs.size == 3001
+    np.testing.assert_allclose(np.diff(freqs), spectrum.sample_rate(t) / 3001)
+    assert abs(freqs[np.argmax(amps)]) == 20
+    assert abs(amps.max() - 0.5) < 0.01
+
+
+def test_zoom_matches_analytic_lines():
+    # Несущая 20 (0.5) и боковые 45 и -5 (0.125), зеркально - на отрицательных частотах
+    t, x = am_signal(3000)
+    lines, expected = spectrum.analytic_spectrum(signal_engine.AM, 20, 25, rate=spectrum.sample_rate(t))
+    # czt - точное ДПФ, у decimate остаётся пульсация АЧХ КИХ-фильтра
+    for method, atol in (('czt', 1e-9), ('decimate', 5e-3)):
+        freqs, amps = spectrum.service.zoom(x, t, -100, 100, method=method)
+        np.testing.assert_allclose(freqs, np.arange(-100, 101))
+        peaks = np.sort(freqs[amps > 0.05])
+        np.testing.assert_allclose(peaks, np.sort(lines))
+        np.testing.assert_allclose(amps[np.searchsorted(freqs, lines)], expected, atol=atol)
+
+
+def test_line_spectrum_analytic_and_fft_paths_agree():
+    t, x = am_signal(3000)
+    component = (signal_engine.AM, 20, 25, 1)
+    lines, expected = spectrum.line_spectrum([component], t, window=(-50, 50))
+    assert np.all(np.abs(lines) <= 50)
+    freqs, amps = spectrum.line_spectrum([component], t, analytic=False, window=(-50, 50), signal=x)
+    np.testing.assert_allclose(amps[np.searchsorted(freqs, lines)], expected, atol=1e-9)
+
+
+def test_line_spectrum_composite_signal_uses_fft():
+    # Вопрос 10: сумма ЧМ и АМ - аналитической формулы нет, спектр суммы через БПФ
+    t = np.linspace(1, 3, 3000, endpoint=False)
+    components = [(signal_engine.FM, 20, 10, 1), (signal_engine.AM, 15, 4, 1)]
+    freqs, amps = spectrum.line_spectrum(components, t, window=(-50, 50))
+    x = signal_engine.modulate(signal_engine.FM, t, 20, 10, 1) + signal_engine.modulate(signal_engine.AM, t, 15, 4, 1)
+    _, direct = spectrum.service.zoom(x, t, -50, 50)
+    np.testing.assert_allclose(amps, direct)
+    # Несущая АМ на 15 видна в спектре суммы
+    assert amps[np.searchsorted(freqs, 15)] > 0.4
+
+
+def test_batch_matches_single_spectra():
+    t = np.linspace(1, 3, 3000, endpoint=False)
+    rows = signal_engine.modulate_batch(signal_engine.FM, t, [[20, 10, 1], [20, 10, 2], [5, 3, 3]])
+    freqs, amps = spectrum.service.batch(rows, t, (-50, 50))
+    assert amps.shape == (3, freqs.size)
+    for row, x in zip(amps, rows):
+        np.testing.assert_allclose(row, spectrum.service.zoom(x, t, -50, 50)[1], atol=1e-12)
+    axis, full = spectrum.service.batch(rows[0], t)
+    assert full.shape == (1, axis.size) and axis[0] == 0
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+import signal_engine
+from waveform_cache import CARRIER, MODULATING, WaveformCache
+
+T = np.linspace(1, 3, 3000, endpoint=False)
+
+
+def test_hit_and_miss_counts():
+    cache = WaveformCache()
+    first = cache.get(signal_engine.AM, T, 20, 10, 1)
+    again = cache.get(signal_engine.AM, T, 20, 10, 1)
+    other = cache.get(signal_engine.AM, T, 21, 10, 1)
+    assert again is first
+    assert other is not first
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (1, 2, 2)
+    np.testing.assert_array_equal(first, signal_engine.modulate(signal_engine.AM, T, 20, 10, 1))
+
+
+def test_cached_values_are_read_only():
+    value = WaveformCache().get(CARRIER, T, 20)
+    with pytest.raises(ValueError):
+        value[0] = 1
+
+
+def test_two_dimensional_grids_bypass_cache():
+    cache = WaveformCache()
+    cache.get(MODULATING, T[None, :] + np.zeros((3, 1)), 10, 1)
+    assert len(cache) == 0 and cache.stats()['misses'] == 0
+
+
+def test_memory_budget_evicts_least_recently_used():
+    # Бюджет на две осциллограммы: третья вытесняет ту, к которой дольше всего не обращались
+    cache = WaveformCache(max_bytes=2 * T.nbytes)
+    cache.get(CARRIER, T, 1)
+    cache.get(CARRIER, T, 2)
+    cache.get(CARRIER, T, 1)
+    cache.get(CARRIER, T, 3)
+    assert cache.nbytes <= cache.max_bytes
+    assert cache.stats()['evictions'] == 1
+    assert cache.key(CARRIER, T, 2) not in cache._entries
+    assert cache.key(CARRIER, T, 1) in cache._entries
+
+
+def test_value_larger_than_budget_is_not_stored():
+    cache = WaveformCache(max_bytes=T.nbytes - 1)
+    cache.get(CARRIER, T, 1)
+    assert len(cache) == 0 and cache.nbytes == 0
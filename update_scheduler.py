@@ -0,0 +1,47 @@
+"""Coalescing of rapid parameter changes into one recompute.
+
+Slider handlers call ``request`` with the names of the parameters they
+changed. The scheduler collects them and runs ``callback(changed)`` once,
+``interval`` ms after the first request of a burst, so a drag that emits
+dozens of valueChanged events triggers a single recompute with the latest
+values. ``generation`` grows on every flush and lets long-running work
+notice that it has been superseded.
+"""
+from PyQt5.QtCore import QObject, QTimer
+
+
+class UpdateScheduler(QObject):
+    def __init__(self, callback, interval=16, parent=None):
+        super().__init__(parent)
+        self.callback = callback
+        self.pending = set()
+        self.generation = 0
+        self.requests = 0
+        self.flushes = 0
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.flush)
+
+    def request(self, *changed):
+        self.requests += 1
+        self.pending.update(changed)
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def flush(self):
+        self.timer.stop()
+        if not self.pending:
+            return
+        changed, self.pending = self.pending, set()
+        self.generation += 1
+        self.flushes += 1
+        self.callback(changed)
+
+    def cancel(self):
+        self.timer.stop()
+        self.pending.clear()
+
+    @property
+    def coalesced(self):
+        return self.requests - self.flushes - (1 if self.pending else 0)
@@ -0,0 +1,95 @@
+"""Bounded LRU cache of computed waveforms.
+
+Keys are (signal kind, parameters, time grid). The time grid is identified by
+its first and last sample and its length, which is exact for the uniform
+``np.linspace`` grids used by the apps; 2-D grids bypass the cache. Cached
+arrays are read-only, so callers can plot them directly but must copy before
+mutating. The cache is shared with the background compute worker, so lookups
+and stores are guarded by a lock; values are computed outside of it.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+import signal_engine
+
+CARRIER, MODULATING = 'carrier', 'modulating'
+
+_COMPUTE = {
+    CARRIER: signal_engine.carrier_signal,
+    MODULATING: signal_engine.modulating_signal,
+    **signal_engine.MODULATIONS,
+}
+
+
+def grid_key(t):
+    t = np.asarray(t)
+    if t.size == 0:
+        return 0, 0.0, 0.0
+    return t.size, float(t[0]), float(t[-1])
+
+
+class WaveformCache:
+    def __init__(self, max_bytes=64 * 2 ** 20):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(kind, t, *params):
+        return (kind, tuple(float(p) for p in params), grid_key(t))
+
+    def get(self, kind, t, *params):
+        if np.ndim(t) != 1:
+            return _COMPUTE[kind](t, *params)  # 2-D сетки (банк кадров) не кэшируем
+        key = self.key(kind, t, *params)
+        return self.get_or_compute(key, lambda: _COMPUTE[kind](t, *params))
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        value = np.asarray(compute())
+        value.flags.writeable = False
+        with self._lock:
+            self._store(key, value)
+        return value
+
+    def _store(self, key, value):
+        if value.nbytes > self.max_bytes or key in self._entries:
+            return  # Больше всего бюджета или уже сохранено другим потоком
+        self._entries[key] = value
+        self.nbytes += value.nbytes
+        while self.nbytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'nbytes': self.nbytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / total if total else 0.0,
+        }